@@ -2,24 +2,31 @@ import tkinter as tk
 from tkinter import messagebox, Canvas, Scrollbar
 from theme import Theme
 import json
-import requests
 
 
 class AIAssistantPage:
     def __init__(self, parent):
-        with open("livestock_data.json", 'r') as file:
-            data = json.load(file)
-            self.user_name = data["profile"]["name"]
+        self.user_name = self.load_user_name()
         self.parent = parent
         self.build_ui()
 
+    def load_user_name(self):
+        with open("livestock_data.json", 'r') as file:
+            data = json.load(file)
+            return data["profile"]["name"]
+
+    def on_data_changed(self):
+        """Pick up a renamed profile without discarding the conversation"""
+        self.user_name = self.load_user_name()
+        self.header.config(text=f"How can I help, {self.user_name}?")
+
     def build_ui(self):
         self.clear_content()
 
         self.container = tk.Frame(self.parent, bg=Theme.BG_WHITE)
         self.container.pack(fill=tk.BOTH, expand=True)
 
-        header = tk.Label(
+        self.header = header = tk.Label(
             self.container,
             text=f"How can I help, {self.user_name}?",
             font=Theme.get_font(Theme.FONT_SIZE_TITLE + 6, "bold"),
@@ -202,6 +209,7 @@ class AIAssistantPage:
                 {"role": "user", "content": prompt}
             ]
         }
+        import requests  # only needed once a question is sent
         response = requests.post(API_URL, headers=headers, json=payload)
 
         if response.status_code == 200:
@@ -0,0 +1,79 @@
+"""
+Background task module for the Dashboard App
+Contains the BackgroundTask helper for running work off the Tk thread
+"""
+
+import queue
+import threading
+import tkinter as tk
+
+
+class BackgroundTask:
+    """Run a function on a worker thread and deliver its results on the Tk thread.
+
+    Tk widgets must only be touched from the main thread, so the worker never
+    calls back directly: it puts messages on a queue that is drained with
+    ``after()`` polling.
+    """
+
+    POLL_INTERVAL = 50  # milliseconds
+
+    def __init__(self, widget, work, on_done=None, on_progress=None, on_error=None):
+        self.widget = widget
+        self.work = work
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.on_error = on_error
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.thread = None
+
+    def start(self, *args):
+        """Start the worker; ``work`` is called as ``work(task, *args)``"""
+        self.thread = threading.Thread(target=self._run, args=args, daemon=True)
+        self.thread.start()
+        self.widget.after(self.POLL_INTERVAL, self._poll)
+        return self
+
+    def report(self, value):
+        """Send a progress value to the Tk thread (call from the worker)"""
+        self.messages.put(("progress", value))
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def _run(self, *args):
+        try:
+            result = self.work(self, *args)
+            self.messages.put(("done", result))
+        except Exception as e:
+            self.messages.put(("error", e))
+
+    def _poll(self):
+        while True:
+            try:
+                kind, value = self.messages.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "progress":
+                if self.on_progress:
+                    self.on_progress(value)
+            elif kind == "done":
+                if self.on_done:
+                    self.on_done(value)
+                return
+            else:
+                if self.on_error:
+                    self.on_error(value)
+                return
+
+        try:
+            self.widget.after(self.POLL_INTERVAL, self._poll)
+        except tk.TclError:
+            # The widget was destroyed; nobody is left to deliver results to
+            self.cancel()
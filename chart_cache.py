@@ -0,0 +1,91 @@
+"""
+Chart cache module for the Dashboard App
+Contains the ChartCache of rendered chart images
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+CHART_CACHE_SIZE = 16  # images kept in memory
+DISK_CACHE_FILES = 64  # images kept on disk
+
+
+class ChartCache:
+    """Rendered charts as (width, height, RGBA bytes), least recently used dropped first.
+
+    A key must name everything that changes the picture: the chart, the data
+    version, the theme, the DPI and the pixel size. With a ``directory`` the
+    images are also saved as PNG files under a hash of a ``stable_key`` (one
+    that survives restarts), so the first dashboard of a session can skip
+    rendering too. Used from both the Tk thread and render workers.
+    """
+
+    def __init__(self, directory=None, size=CHART_CACHE_SIZE):
+        self.directory = directory
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, stable_key=None):
+        with self.lock:
+            raster = self.entries.get(key)
+            if raster is not None:
+                self.entries.move_to_end(key)
+                return raster
+        if stable_key is None or not self.directory:
+            return None
+        raster = self.read(self.path(stable_key))
+        if raster is not None:
+            self.remember(key, raster)
+        return raster
+
+    def put(self, key, raster, stable_key=None):
+        self.remember(key, raster)
+        if stable_key is not None and self.directory:
+            self.write(self.path(stable_key), raster)
+
+    def remember(self, key, raster):
+        with self.lock:
+            self.entries[key] = raster
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def path(self, stable_key):
+        digest = hashlib.sha1(repr(stable_key).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + ".png")
+
+    @staticmethod
+    def read(path):
+        from PIL import Image
+        try:
+            with Image.open(path) as image:
+                image = image.convert("RGBA")
+                return image.width, image.height, image.tobytes()
+        except (OSError, ValueError):
+            return None
+
+    def write(self, path, raster):
+        from PIL import Image
+        width, height, rgba = raster
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            Image.frombuffer("RGBA", (width, height), rgba, "raw", "RGBA", 0, 1).save(temp_path, "PNG")
+            os.replace(temp_path, path)
+            self.prune()
+        except OSError:
+            # A cache that cannot be written is only a slower cache
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def prune(self):
+        """Delete the oldest images once the directory holds more than DISK_CACHE_FILES"""
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                 if name.endswith(".png")]
+        if len(paths) > DISK_CACHE_FILES:
+            paths.sort(key=os.path.getmtime)
+            for path in paths[:len(paths) - DISK_CACHE_FILES]:
+                os.remove(path)
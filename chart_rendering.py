@@ -0,0 +1,240 @@
+"""
+Chart rendering module for the Dashboard App
+Contains off-screen builders that draw the dashboard charts into RGBA buffers
+"""
+
+import matplotlib.style
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.ticker import FuncFormatter
+from matplotlib.colors import LinearSegmentedColormap
+
+DPI = 100
+DEFAULT_SIZE = (600, 400)  # pixels
+MAX_TICKS = 12  # x axis labels drawn per chart; longer series label every few points
+BAR_COLORS = ("PRIMARY_GREEN", "LIGHT_GREEN", "DARK_GREEN", "#F39C12", "#9B59B6", "#1ABC9C")
+
+# Nothing in here touches Tk, so every function can run on a worker thread.
+# Colours come in as a plain dict (Theme._colors) instead of being read from
+# Theme, so the caller decides which palette a render uses.
+
+
+def chart_style(colors):
+    """matplotlib rcParams that match the app theme"""
+    return {
+        'font.family': 'sans-serif',
+        'font.sans-serif': ['Segoe UI', 'Arial', 'DejaVu Sans'],
+        'font.size': 9,
+        'axes.labelcolor': colors["TEXT_DARK"],
+        'axes.edgecolor': colors["BG_GRAY"],
+        'axes.linewidth': 0.5,
+        'axes.grid': True,
+        'axes.grid.axis': 'y',
+        'grid.color': colors["BG_GRAY"],
+        'grid.linewidth': 0.5,
+        'grid.alpha': 0.7,
+        'xtick.color': colors["TEXT_GRAY"],
+        'ytick.color': colors["TEXT_GRAY"],
+        'figure.facecolor': colors["BG_WHITE"],
+        'axes.facecolor': colors["BG_WHITE"]
+    }
+
+
+def apply_style(colors):
+    """Make the theme style the default for figures created after this call"""
+    matplotlib.style.use('default')
+    matplotlib.rcParams.update(chart_style(colors))
+
+
+def format_naira(x, pos=None):
+    return f'₦{x / 1000000:.1f}M' if x >= 1000000 else f'₦{x / 1000:.0f}K'
+
+
+class ChartFigure:
+    """An off-screen figure that is built once and then refreshed in place.
+
+    Subclasses create their artists in ``__init__`` and change only their data
+    in ``update``. ``tight_layout`` is redone only when the size or the tick
+    labels change, which is what makes a refresh cheap.
+    """
+
+    def __init__(self, colors, size, title, xlabel, ylabel, dpi=DPI):
+        self.colors = colors
+        self.dpi = dpi
+        self.size = None
+        self.layout_stale = True
+        self.tick_labels = None
+        self.fig = Figure(dpi=dpi, facecolor=colors["BG_WHITE"])
+        FigureCanvasAgg(self.fig)
+        self.resize(size)
+
+        ax = self.ax = self.fig.add_subplot(111)
+        ax.set_title(title, fontsize=12, fontweight='bold', color=colors["TEXT_DARK"], pad=20)
+        ax.set_xlabel(xlabel, fontsize=10, color=colors["TEXT_GRAY"])
+        ax.set_ylabel(ylabel, fontsize=10, color=colors["TEXT_GRAY"])
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.spines['left'].set_color(colors["BG_GRAY"])
+        ax.spines['bottom'].set_color(colors["BG_GRAY"])
+
+    def resize(self, size):
+        if size != self.size:
+            self.size = size
+            self.fig.set_size_inches(size[0] / self.dpi, size[1] / self.dpi)
+            self.layout_stale = True
+
+    def set_tick_labels(self, labels):
+        labels = list(labels)
+        if labels != self.tick_labels:
+            self.tick_labels = labels
+            step = -(-len(labels) // MAX_TICKS) or 1
+            self.ax.set_xticks(range(0, len(labels), step))
+            self.ax.set_xticklabels(labels[::step])
+            self.layout_stale = True
+
+    def rasterize(self):
+        if self.layout_stale:
+            self.fig.tight_layout(pad=2.0)
+            self.layout_stale = False
+        return rasterize(self.fig)
+
+
+class SalesTrendFigure(ChartFigure):
+    """Sales per period, continued with a dashed line when there is a forecast"""
+
+    def __init__(self, colors, size=DEFAULT_SIZE, dpi=DPI):
+        super().__init__(colors, size, 'Sales Performance', 'Period', 'Sales (₦)', dpi)
+        # Plot against positions so forecast months can be appended after the data
+        self.line, = self.ax.plot([], [],
+                                  color=colors["PRIMARY_GREEN"],
+                                  linewidth=2.5,
+                                  marker='o',
+                                  markersize=6,
+                                  markerfacecolor=colors["PRIMARY_GREEN"],
+                                  markeredgecolor=colors["BG_WHITE"],
+                                  markeredgewidth=2)
+        self.forecast_line, = self.ax.plot([], [], color=colors["PRIMARY_GREEN"],
+                                           linewidth=2, linestyle='--', alpha=0.7)
+        self.ax.yaxis.set_major_formatter(FuncFormatter(format_naira))
+
+    def update(self, periods, sales_data, forecast=None):
+        """``periods`` are the axis labels; ``forecast`` is (labels, values) for the periods after them"""
+        self.line.set_data(range(len(periods)), sales_data)
+        labels = list(periods)
+        if forecast is not None and sales_data:
+            forecast_labels, values = forecast
+            last = len(periods) - 1
+            self.forecast_line.set_data(range(last, last + len(values) + 1), [sales_data[-1]] + list(values))
+            labels += list(forecast_labels)
+        else:
+            self.forecast_line.set_data([], [])
+        self.set_tick_labels(labels)
+        self.ax.relim()
+        self.ax.autoscale_view()
+
+
+class HerdTrendFigure(ChartFigure):
+    """Head count per snapshot day, with the herd health score on a second axis"""
+
+    def __init__(self, colors, size=DEFAULT_SIZE, dpi=DPI):
+        super().__init__(colors, size, 'Herd Size and Health', 'Day', 'Head count', dpi)
+        self.count_line, = self.ax.plot([], [], color=colors["PRIMARY_GREEN"], linewidth=2.5,
+                                        marker='o', markersize=3, label='Head count')
+        self.health_ax = self.ax.twinx()
+        self.health_line, = self.health_ax.plot([], [], color=colors["ORANGE"], linewidth=2,
+                                                marker='o', markersize=3, label='Health (%)')
+        self.health_ax.set_ylim(0, 105)
+        self.health_ax.set_ylabel('Health (%)', fontsize=10, color=colors["TEXT_GRAY"])
+        self.health_ax.grid(False)
+        for side in ('top', 'left'):
+            self.health_ax.spines[side].set_visible(False)
+        self.health_ax.spines['right'].set_color(colors["BG_GRAY"])
+        self.ax.legend(handles=[self.count_line, self.health_line], loc='lower left', frameon=False, fontsize=8)
+
+    def update(self, days, head_counts, health):
+        positions = range(len(days))
+        self.count_line.set_data(positions, head_counts)
+        self.health_line.set_data(positions, health)
+        self.set_tick_labels(days)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.ax.set_ylim(bottom=0)
+        # autoscale_view gives a single point a zero-width axis
+        self.ax.set_xlim(-0.5, max(len(days) - 0.5, 0.5))
+
+
+class DistributionFigure(ChartFigure):
+    """Bar chart of head count per livestock category"""
+
+    def __init__(self, colors, size=DEFAULT_SIZE, dpi=DPI):
+        super().__init__(colors, size, 'Livestock by Category', 'Category', 'Count', dpi)
+        self.categories = None
+        self.bars = []
+        self.labels = []
+
+    def update(self, categories, values):
+        categories = list(categories)
+        top = max(values) if values else 0
+        if categories != self.categories:
+            # A new or dropped category changes the bar layout, so only then are bars recreated
+            for artist in self.bars + self.labels:
+                artist.remove()
+            palette = [self.colors.get(name, name) for name in BAR_COLORS]
+            # Cycle through colors if we have more categories than colors
+            bar_colors = [palette[i % len(palette)] for i in range(len(categories))]
+            self.bars = list(self.ax.bar(range(len(categories)), values, color=bar_colors, alpha=0.8,
+                                         edgecolor=self.colors["BG_WHITE"], linewidth=1))
+            self.labels = [self.ax.text(bar.get_x() + bar.get_width() / 2., 0, '', ha='center', va='bottom',
+                                        fontsize=10, fontweight='bold', color=self.colors["TEXT_DARK"])
+                           for bar in self.bars]
+            self.categories = categories
+            self.set_tick_labels(categories)
+            self.ax.relim()
+            self.ax.autoscale_view(scaley=False)
+
+        for bar, label, value in zip(self.bars, self.labels, values):
+            bar.set_height(value)
+            label.set_y(value + top * 0.02)
+            label.set_text(f'{value}')
+        self.ax.set_ylim(0, top * 1.2 if values else 1)
+
+
+class VaccinationHeatmapFigure(ChartFigure):
+    """Vaccinations due per week (columns) for each species or location (rows)"""
+
+    def __init__(self, colors, size=DEFAULT_SIZE, dpi=DPI):
+        super().__init__(colors, size, 'Vaccinations Due per Week', 'Week starting', '', dpi)
+        self.groups = None
+        self.ax.grid(False)
+        self.ax.tick_params(length=0)
+        # From the card background for no work up to the theme green for the busiest week
+        cmap = LinearSegmentedColormap.from_list('workload', [colors["BG_WHITE"], colors["PRIMARY_GREEN"],
+                                                              colors["DARK_GREEN"]])
+        self.image = self.ax.imshow([[0]], cmap=cmap, aspect='auto', interpolation='nearest', vmin=0, vmax=1)
+        self.colorbar = self.fig.colorbar(self.image, ax=self.ax, pad=0.02, fraction=0.04)
+        self.colorbar.outline.set_visible(False)
+        self.colorbar.ax.tick_params(length=0)
+
+    def update(self, weeks, groups, counts, overdue):
+        rows = counts or [[0] * len(weeks)]
+        self.image.set_data(rows)
+        self.image.set_extent((-0.5, len(weeks) - 0.5, len(rows) - 0.5, -0.5))
+        self.image.set_clim(0, max(max(max(row) for row in rows), 1))
+        self.ax.set_xlim(-0.5, len(weeks) - 0.5)
+        self.ax.set_ylim(len(rows) - 0.5, -0.5)
+        self.set_tick_labels(weeks)
+        groups = list(groups)
+        if groups != self.groups:
+            self.groups = groups
+            self.ax.set_yticks(range(len(groups)))
+            self.ax.set_yticklabels(groups)
+            self.layout_stale = True
+        self.ax.set_xlabel(f'Week starting ({overdue} overdue now)' if overdue else 'Week starting')
+
+
+def rasterize(fig):
+    """Draw a figure with Agg and return (width, height, RGBA bytes)"""
+    canvas = fig.canvas
+    canvas.draw()
+    width, height = canvas.get_width_height()
+    return width, height, bytes(canvas.buffer_rgba())
@@ -5,43 +5,46 @@ Contains matplotlib charts embedded in Tkinter
 
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
 from theme import Theme
-from utils import DataGenerator
+from background import BackgroundTask
+from chart_cache import ChartCache
+import render_service
 
+DEFAULT_SIZE = (600, 400)  # pixels, until the chart areas have been laid out
+DPI = render_service.DPI
+CHARTS = [("sales_trend", "Sales Trend"), ("distribution", "Livestock Distribution"),
+          ("herd_trend", "Herd Trend"), ("vaccinations", "Vaccination Workload")]
+COLUMNS = 2
+WORKLOAD_GROUPS = {"By species": "type", "By location": "location"}
 
-class Charts:
-    """Charts component for displaying data visualizations"""
 
-    def __init__(self, parent):
+class Charts:
+    """Charts component for displaying data visualizations.
+
+    The chart cards appear straight away with a loading placeholder. A worker
+    thread gathers each chart's data and hands it to the render_service
+    process pool, which lays out and rasterizes the figures with Agg in
+    parallel; the finished images are passed back to the Tk thread by
+    ``BackgroundTask``. Rendered images go into a ChartCache so unchanged
+    charts are not redrawn. PIL is imported by the first image shown, and
+    matplotlib by the pool processes; only if the pool cannot be used does
+    render_service fall back to rendering on the worker thread, which then
+    imports matplotlib into this process.
+    """
+
+    def __init__(self, parent, view=None, cache=None):
         self.parent = parent
-        self.data_generator = DataGenerator()  # Create instance to use non-static methods
-        self.setup_matplotlib_style()
+        self.cache = cache or ChartCache()
+        self.view = None
+        self.task = None
+        self.chart_areas = {}
+        self.chart_labels = {}  # chart name -> label showing the placeholder, then the image
+        self.images = {}  # chart name -> PhotoImage; Tk drops images nobody references
+        self.workload_var = tk.StringVar(value=next(iter(WORKLOAD_GROUPS)))
         self.create_charts_container()
         self.create_charts()
-
-    def setup_matplotlib_style(self):
-        """Configure matplotlib styling to match app theme"""
-        plt.style.use('default')
-        plt.rcParams.update({
-            'font.family': 'sans-serif',
-            'font.sans-serif': ['Segoe UI', 'Arial', 'sans-serif'],
-            'font.size': 9,
-            'axes.labelcolor': Theme.TEXT_DARK,
-            'axes.edgecolor': Theme.BG_GRAY,
-            'axes.linewidth': 0.5,
-            'axes.grid': True,
-            'axes.grid.axis': 'y',
-            'grid.color': Theme.BG_GRAY,
-            'grid.linewidth': 0.5,
-            'grid.alpha': 0.7,
-            'xtick.color': Theme.TEXT_GRAY,
-            'ytick.color': Theme.TEXT_GRAY,
-            'figure.facecolor': Theme.BG_WHITE,
-            'axes.facecolor': Theme.BG_WHITE
-        })
+        if view is not None:
+            self.load(view)
 
     def create_charts_container(self):
         """Create the main container for charts"""
@@ -50,84 +53,133 @@ class Charts:
                                padx=Theme.PADDING_LARGE, pady=Theme.PADDING_MEDIUM)
 
     def create_charts(self):
-        """Create both charts side by side"""
-        left_frame = tk.Frame(self.charts_frame, bg=Theme.BG_WHITE)
-        left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, Theme.PADDING_MEDIUM))
-
-        right_frame = tk.Frame(self.charts_frame, bg=Theme.BG_WHITE)
-        right_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(Theme.PADDING_MEDIUM, 0))
-
-        self.create_sales_trend_chart(left_frame)
-        self.create_livestock_distribution_chart(right_frame)
-
-    def create_sales_trend_chart(self, parent):
-        chart_container = self.create_chart_container(parent, "Sales Trend")
-        months, sales_data = self.data_generator.generate_sales_trend_data(6)
-
-        fig = Figure(figsize=(6, 4), dpi=100, facecolor=Theme.BG_WHITE)
-        ax = fig.add_subplot(111)
-
-        ax.plot(months, sales_data,
-                color=Theme.PRIMARY_GREEN,
-                linewidth=2.5,
-                marker='o',
-                markersize=6,
-                markerfacecolor=Theme.PRIMARY_GREEN,
-                markeredgecolor=Theme.BG_WHITE,
-                markeredgewidth=2)
-
-        ax.set_title('Monthly Sales Performance', fontsize=12, fontweight='bold', color=Theme.TEXT_DARK, pad=20)
-        ax.set_xlabel('Month', fontsize=10, color=Theme.TEXT_GRAY)
-        ax.set_ylabel('Sales (₦)', fontsize=10, color=Theme.TEXT_GRAY)
-        ax.yaxis.set_major_formatter(
-            plt.FuncFormatter(lambda x, p: f'₦{x / 1000000:.1f}M' if x >= 1000000 else f'₦{x / 1000:.0f}K'))
-
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.spines['left'].set_color(Theme.BG_GRAY)
-        ax.spines['bottom'].set_color(Theme.BG_GRAY)
-
-        fig.tight_layout(pad=2.0)
-
-        canvas = FigureCanvasTkAgg(fig, chart_container)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-    def create_livestock_distribution_chart(self, parent):
-        chart_container = self.create_chart_container(parent, "Livestock Distribution")
-        categories, values = self.data_generator.generate_livestock_distribution()
-
-        fig = Figure(figsize=(6, 4), dpi=100, facecolor=Theme.BG_WHITE)
-        ax = fig.add_subplot(111)
-
-        # Use more colors to handle dynamic categories
-        colors = [Theme.PRIMARY_GREEN, Theme.LIGHT_GREEN, Theme.DARK_GREEN, '#F39C12', '#9B59B6', '#1ABC9C']
-        # Cycle through colors if we have more categories than colors
-        chart_colors = [colors[i % len(colors)] for i in range(len(categories))]
-
-        bars = ax.bar(categories, values, color=chart_colors, alpha=0.8, edgecolor=Theme.BG_WHITE, linewidth=1)
-
-        for bar, value in zip(bars, values):
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width() / 2., height + max(values) * 0.02,
-                    f'{value}', ha='center', va='bottom',
-                    fontsize=10, fontweight='bold', color=Theme.TEXT_DARK)
-
-        ax.set_title('Livestock by Category', fontsize=12, fontweight='bold', color=Theme.TEXT_DARK, pad=20)
-        ax.set_xlabel('Category', fontsize=10, color=Theme.TEXT_GRAY)
-        ax.set_ylabel('Count', fontsize=10, color=Theme.TEXT_GRAY)
-
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.spines['left'].set_color(Theme.BG_GRAY)
-        ax.spines['bottom'].set_color(Theme.BG_GRAY)
-
-        ax.set_ylim(0, max(values) * 1.2 if values else 1)
-        fig.tight_layout(pad=2.0)
-
-        canvas = FigureCanvasTkAgg(fig, chart_container)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        """Create the chart cards two to a row, each showing a placeholder"""
+        for column in range(COLUMNS):
+            self.charts_frame.columnconfigure(column, weight=1, uniform="charts")
+        for i, (name, title) in enumerate(CHARTS):
+            row, column = divmod(i, COLUMNS)
+            self.charts_frame.rowconfigure(row, weight=1)
+            cell = tk.Frame(self.charts_frame, bg=Theme.BG_WHITE)
+            # A chart left alone on the last row takes the full width
+            span = COLUMNS if i == len(CHARTS) - 1 and column == 0 else 1
+            padx = (0, Theme.PADDING_MEDIUM) if column == 0 and span == 1 else (
+                (Theme.PADDING_MEDIUM, 0) if column else 0)
+            cell.grid(row=row, column=column, columnspan=span, sticky="nsew", padx=padx)
+            title_frame, self.chart_areas[name] = self.create_chart_container(cell, title)
+            self.chart_labels[name] = self.create_placeholder(self.chart_areas[name])
+            if name == "vaccinations":
+                self.create_workload_selector(title_frame)
+
+    def create_workload_selector(self, title_frame):
+        """Combobox choosing whether the vaccination workload is split by species or location"""
+        selector = ttk.Combobox(title_frame, textvariable=self.workload_var, width=12,
+                                values=list(WORKLOAD_GROUPS), state="readonly")
+        selector.pack(side=tk.RIGHT)
+        selector.bind("<<ComboboxSelected>>", lambda e: self.refresh_charts())
+
+    def load(self, view):
+        """Show the charts for a DashboardView, rendering on a worker thread those not cached"""
+        self.view = view
+        if self.task:
+            self.task.cancel()
+            self.task = None
+        colors = dict(Theme._colors)
+        workload_by = WORKLOAD_GROUPS[self.workload_var.get()]
+        sizes = {}
+        keys = {}
+        for name, area in self.chart_areas.items():
+            size = self.chart_size(area)
+            key, stable_key = self.cache_keys(name, view, size, workload_by if name == "vaccinations" else None)
+            raster = self.cache.get(key, stable_key)
+            if raster is not None:
+                self.show_image((name, raster))
+            else:
+                sizes[name] = size
+                keys[name] = (key, stable_key)
+        if not keys:
+            return
+
+        def deliver(result):
+            # A render that was overtaken by a newer one must not paint over it
+            if not task.cancelled:
+                self.show_image(result)
+
+        task = BackgroundTask(self.charts_frame, self.render, on_progress=deliver, on_error=self.show_error)
+        self.task = task.start(view, colors, sizes, keys, workload_by)
+
+    @staticmethod
+    def cache_keys(name, view, size, variant=None):
+        """Cache key for a chart, and the key for its disk copy (None if a file is missing)"""
+        key = (name, view.version, variant, Theme.mode(), DPI, size)
+        stable_key = None
+        if view.signature is not None:
+            stable_key = (name, view.signature, variant, Theme.mode(), DPI, size)
+        return key, stable_key
+
+    @staticmethod
+    def chart_size(area):
+        """Pixel size to render a chart at, the area's own size once it has been laid out"""
+        width, height = area.winfo_width(), area.winfo_height()
+        if width > 1 and height > 1:
+            return width, height
+        return DEFAULT_SIZE
+
+    def render(self, task, view, colors, sizes, keys, workload_by):
+        """Render and cache each chart in ``keys`` with the process pool; runs on the worker thread"""
+        jobs = [(name, self.chart_data(name, view, workload_by), sizes[name]) for name in keys]
+        for name, raster in render_service.render_charts(jobs, colors, DPI):
+            key, stable_key = keys[name]
+            self.cache.put(key, raster, stable_key)
+            if task.cancelled:
+                return
+            task.report((name, raster))
+
+    @staticmethod
+    def chart_data(name, view, workload_by="type"):
+        """Arguments for a chart figure's ``update``, from a DashboardView"""
+        if name == "distribution":
+            return view.livestock_distribution()
+        if name == "herd_trend":
+            return view.herd_trend
+        if name == "vaccinations":
+            return view.vaccination_workload(workload_by)
+        periods, sales_data = view.sales_trend
+        forecast = None
+        if sales_data and view.show_forecast:
+            from forecasting import SalesForecaster
+            from downsampling import MONTH, format_bucket
+            forecaster = SalesForecaster(view.rollup, horizon=3)
+            forecaster.fit_now()
+            forecast = forecaster.forecast()
+            # Only a forecast that starts right after the last bucket continues the line
+            if forecast is not None and forecast[0][0] == view.last_bucket.astype("datetime64[M]") + 1:
+                months, values = forecast
+                forecast = ([format_bucket(month.astype("datetime64[D]"), MONTH) for month in months], values)
+            else:
+                forecast = None
+        return periods, sales_data, forecast
+
+    def show_image(self, result):
+        """Put a rendered chart in its card; runs on the Tk thread"""
+        from PIL import Image, ImageTk
+        name, (width, height, rgba) = result
+        area = self.chart_areas[name]
+        if not area.winfo_exists():
+            return
+        image = Image.frombuffer("RGBA", (width, height), rgba, "raw", "RGBA", 0, 1)
+        photo = self.images.get(name)
+        if photo is not None and (photo.width(), photo.height()) == (width, height):
+            # Same size: overwrite the pixels of the image the label already shows
+            photo.paste(image)
+            return
+        self.images[name] = ImageTk.PhotoImage(image, master=area)
+        self.chart_labels[name].config(image=self.images[name], text="")
+
+    def show_error(self, error):
+        self.images = {}
+        for label in self.chart_labels.values():
+            if label.winfo_exists():
+                label.config(image="", text=f"Could not draw chart: {error}")
 
     def create_chart_container(self, parent, title):
         container = tk.Frame(parent, **Theme.get_card_style())
@@ -147,12 +199,24 @@ class Charts:
         chart_area = tk.Frame(container, bg=Theme.CARD_BG)
         chart_area.pack(fill=tk.BOTH, expand=True, padx=Theme.PADDING_LARGE, pady=(0, Theme.PADDING_LARGE))
 
-        return chart_area
+        return title_frame, chart_area
+
+    def create_placeholder(self, chart_area):
+        label = tk.Label(
+            chart_area,
+            text="Loading chart…",
+            bg=Theme.CARD_BG,
+            fg=Theme.TEXT_GRAY,
+            font=Theme.get_font(Theme.FONT_SIZE_MEDIUM),
+            bd=0,
+            padx=0,
+            pady=0
+        )
+        label.pack(fill=tk.BOTH, expand=True)
+        return label
 
-    def refresh_charts(self):
-        for widget in self.charts_frame.winfo_children():
-            widget.destroy()
-        self.create_charts()
+    def refresh_charts(self, view=None):
+        self.load(view or self.view)
 
     def get_frame(self):
         return self.charts_frame
\ No newline at end of file
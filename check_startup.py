@@ -0,0 +1,62 @@
+"""
+Startup check for the Dashboard App
+Contains a script that fails when importing the app gets slower than its budget
+
+Run it with ``python check_startup.py`` before a release. It imports main
+with ``-X importtime`` in a fresh interpreter and exits with status 1 if the
+import takes longer than BUDGET_MS or pulls in a module that must only be
+imported on first use.
+"""
+
+import os
+import subprocess
+import sys
+
+BUDGET_MS = 200  # the import takes about 20-60 ms; a stray top-level import of matplotlib costs ~500
+RUNS = 3  # the best of a few runs, so one slow start on a busy machine does not fail the check
+DEFERRED_MODULES = ("matplotlib", "numpy", "PIL", "requests")
+
+
+def import_times(module="main"):
+    """Return {module name: cumulative import time in ms} for one fresh import of ``module``"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+
+    times = {}
+    for line in result.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) != 3 or not line.startswith("import time:"):
+            continue
+        try:
+            cumulative = int(parts[1])
+        except ValueError:
+            continue  # the header line
+        times[parts[2].strip()] = cumulative / 1000
+    return times
+
+
+def main():
+    runs = [import_times() for _ in range(RUNS)]
+    best = min(times["main"] for times in runs)
+    deferred = sorted({name.split(".")[0] for name in runs[0]} & set(DEFERRED_MODULES))
+
+    print(f"import main: {best:.1f} ms (budget {BUDGET_MS} ms)")
+    failed = False
+    if best > BUDGET_MS:
+        print("FAIL: startup import is over budget; run python -X importtime -c \"import main\" to find the cause")
+        failed = True
+    if deferred:
+        print(f"FAIL: imported at startup but meant to load on first use: {', '.join(deferred)}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
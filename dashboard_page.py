@@ -0,0 +1,71 @@
+"""
+Dashboard page module for the Dashboard App
+Contains the DashboardPage that fills the summary cards and charts for the selected period
+"""
+
+from summary_cards import SummaryCards
+from charts import Charts
+from range_selector import RangeSelector
+from background import BackgroundTask
+
+
+class DashboardPage:
+    """The range selector, summary cards and charts of the dashboard.
+
+    The widgets are built once, as skeletons; ``load_data`` computes the
+    metrics for the selected period on a worker thread and fills them in.
+    When the data files change while the page is hidden, the page manager
+    calls ``on_data_changed``, which reloads the data into the same widgets
+    so the live KPIs are kept and unchanged charts come from the cache.
+    """
+
+    herd_captured = False  # today's herd snapshot is taken by the first load of the session
+
+    def __init__(self, parent, chart_cache, on_error):
+        self.on_error = on_error
+        self.generation = 0  # bumped per load so a slower, older load is ignored
+        self.range_selector = RangeSelector(parent, lambda start, end, label: self.load_data())
+        # Cards and charts start as skeletons and fill in as the data arrives
+        self.summary_cards = SummaryCards(parent)
+        self.charts = Charts(parent, cache=chart_cache)
+        self.load_data()
+
+    def load_data(self):
+        """Compute the dashboard metrics for the selected period on a worker thread, then fill in the cards and charts"""
+        start, end, label = self.range_selector.selection()
+        self.generation += 1
+        generation = self.generation
+        capture = not DashboardPage.herd_captured
+        DashboardPage.herd_captured = True
+
+        def work(task):
+            # Imported here so numpy loads on the worker, not before the window opens
+            from metrics import DashboardMetrics
+            if capture:
+                # Before the metrics load, so their history already has today in it
+                DashboardMetrics.capture_herd()
+            # One snapshot feeds every card and chart
+            metrics = DashboardMetrics.current()
+            return metrics, metrics.view(start, end)
+
+        def loaded(result):
+            # A newer period was picked while this one was loading
+            if generation != self.generation:
+                return
+            from metrics import KPIEngine
+            metrics, view = result
+            if start is None and end is None:
+                # The whole history is what the live KPIs track, so the cards can follow them
+                self.summary_cards.show(KPIEngine.instance(metrics), label)
+            else:
+                self.summary_cards.show(view, label)
+            self.charts.load(view)
+
+        def failed(error):
+            self.on_error(f"Could not load dashboard data: {error}")
+
+        BackgroundTask(self.charts.get_frame(), work, on_done=loaded, on_error=failed).start()
+
+    def on_data_changed(self):
+        """Called by the page manager when the livestock or sales data changed while this page was hidden"""
+        self.load_data()
@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import json
 import os
+import storage
 
 
 class DataManager:
@@ -59,8 +60,10 @@ class DataManager:
     def save_data(self):
         """Save data to file"""
         try:
-            with open(self.data_file, 'w') as f:
-                json.dump(self.data, f, indent=2)
+            writer = storage.writer(self.data_file)
+            writer.write(writer.ticket(), storage.write_json, self.data_file, self.data)
+            import herd_history  # numpy; kept off the startup path
+            herd_history.capture(self.data.get("livestock", []))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save data: {e}")
 
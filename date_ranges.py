@@ -0,0 +1,40 @@
+"""
+Date ranges module for the Dashboard App
+Contains the date input check and the named date range presets shared by the
+sales page and the dashboard
+"""
+
+from datetime import date, datetime, timedelta
+
+RANGE_PRESETS = ["All time", "This month", "Last quarter", "Year to date", "Last 12 months"]
+DASHBOARD_RANGES = ["All time", "Last 30 days", "Last 90 days", "Year to date", "Last 12 months"]
+CUSTOM_RANGE = "Custom"
+
+
+def iso_date(text):
+    """Return an entered YYYY-MM-DD date in ISO form, zero padded; raises ValueError if it is not a date.
+
+    strptime also accepts "2025-6-1", which numpy and the string comparisons
+    used on stored dates do not, so every date a user types goes through here.
+    """
+    return datetime.strptime(text.strip(), "%Y-%m-%d").date().isoformat()
+
+
+def preset_range(name, today=None):
+    """Return the (start, end) ISO dates of a range preset; None means unbounded"""
+    today = today or date.today()
+    if name == "This month":
+        return today.replace(day=1).isoformat(), today.isoformat()
+    if name == "Last 30 days":
+        return (today - timedelta(days=29)).isoformat(), today.isoformat()
+    if name == "Last 90 days":
+        return (today - timedelta(days=89)).isoformat(), today.isoformat()
+    if name == "Last quarter":
+        this_quarter = date(today.year, (today.month - 1) // 3 * 3 + 1, 1)
+        end = this_quarter - timedelta(days=1)
+        return date(end.year, (end.month - 1) // 3 * 3 + 1, 1).isoformat(), end.isoformat()
+    if name == "Year to date":
+        return date(today.year, 1, 1).isoformat(), today.isoformat()
+    if name == "Last 12 months":
+        return (today - timedelta(days=365)).isoformat(), today.isoformat()
+    return None, None
@@ -0,0 +1,106 @@
+"""
+Downsampling module for the Dashboard App
+Contains helpers that reduce long time series to what a chart can actually show
+"""
+
+import numpy as np
+
+DAY, WEEK, MONTH = "day", "week", "month"
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+               "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def choose_resolution(first_date, last_date, width):
+    """Pick the finest of day, week or month that gives at most one bucket per pixel"""
+    span = (np.datetime64(last_date, "D") - np.datetime64(first_date, "D")).astype(int) + 1
+    if span <= width:
+        return DAY
+    if span / 7 <= width:
+        return WEEK
+    return MONTH
+
+
+def bucket_starts(days, resolution):
+    """Start date of the day, week (Monday) or month bucket each ``datetime64[D]`` falls in"""
+    if resolution == WEEK:
+        # 1970-01-01 was a Thursday, so shift by three days to start weeks on Monday
+        return days - ((days.astype(np.int64) + 3) % 7)
+    if resolution == MONTH:
+        return days.astype("datetime64[M]").astype("datetime64[D]")
+    return days
+
+
+def bucket_grid(first_date, last_date, resolution):
+    """Every bucket start from the bucket holding ``first_date`` to the one holding ``last_date``"""
+    first = bucket_starts(np.datetime64(first_date, "D"), resolution)
+    last = np.datetime64(last_date, "D")
+    if resolution == MONTH:
+        months = np.arange(first.astype("datetime64[M]"), last.astype("datetime64[M]") + 1)
+        return months.astype("datetime64[D]")
+    step = 7 if resolution == WEEK else 1
+    return np.arange(first, last + 1, step)
+
+
+def resample(dates, values, resolution):
+    """Sum a daily series into weeks (starting Monday) or months.
+
+    ``dates`` are ISO date strings, oldest first. Returns the bucket start
+    dates as ``datetime64[D]`` and the summed values as floats.
+    """
+    days = np.array(dates, dtype="datetime64[D]")
+    values = np.asarray(values, dtype=float)
+    if resolution == DAY:
+        return days, values
+
+    keys, inverse = np.unique(bucket_starts(days, resolution), return_inverse=True)
+    return keys, np.bincount(inverse, weights=values, minlength=len(keys))
+
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets downsampling; returns the indices of the points to keep.
+
+    The first and last points are always kept. From each of the
+    ``threshold - 2`` buckets in between it keeps the point that forms the
+    largest triangle with the previously kept point and the average of the
+    next bucket, which preserves peaks and dips that plain striding loses.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) -
+                      (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def thin_labels(positions, min_gap):
+    """Return the indices of the labels to draw so that no two are closer than ``min_gap`` pixels"""
+    keep = []
+    last = None
+    for i, position in enumerate(positions):
+        if last is None or position - last >= min_gap:
+            keep.append(i)
+            last = position
+    return keep
+
+
+def format_bucket(date, resolution):
+    """Axis label for a bucket start date"""
+    text = str(date)
+    if resolution == MONTH:
+        return f"{MONTH_NAMES[int(text[5:7]) - 1]} {text[2:4]}"
+    return text[5:]  # MM-DD
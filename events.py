@@ -0,0 +1,23 @@
+"""
+Events module for the Dashboard App
+Contains a minimal publish/subscribe bus that lets pages announce data changes
+"""
+
+_subscribers = {}  # topic -> callbacks
+
+
+def subscribe(topic, callback):
+    """Call ``callback(**payload)`` for every event published on ``topic``"""
+    _subscribers.setdefault(topic, []).append(callback)
+
+
+def unsubscribe(topic, callback):
+    callbacks = _subscribers.get(topic, [])
+    if callback in callbacks:
+        callbacks.remove(callback)
+
+
+def publish(topic, **payload):
+    """Deliver an event synchronously; publish from the Tk thread only"""
+    for callback in list(_subscribers.get(topic, [])):
+        callback(**payload)
@@ -0,0 +1,245 @@
+"""
+Forecasting module for the Dashboard App
+Contains exponential smoothing models and the SalesForecaster that keeps them current
+"""
+
+import itertools
+import numpy as np
+from background import BackgroundTask
+
+SEASON_LENGTH = 12  # months
+SMOOTHING_GRID = (0.1, 0.3, 0.5, 0.7, 0.9)
+FIT_CACHE_SIZE = 64
+_fit_cache = {}  # (values, season) -> fitted parameters, shared by every forecaster
+
+
+def month_number(iso_date):
+    """Months since 1970-01 for an ISO date or "YYYY-MM" string"""
+    return (int(iso_date[:4]) - 1970) * 12 + int(iso_date[5:7]) - 1
+
+
+class ExponentialSmoothing:
+    """Additive Holt-Winters, falling back to Holt (trend only) or simple smoothing.
+
+    ``beta`` of None drops the trend and ``season`` of None drops the seasonal
+    terms. The state is updated one observation at a time with ``step``, so a
+    fitted model can follow new data without being refit.
+    """
+
+    def __init__(self, alpha, beta=None, gamma=None, season=None):
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.season = season
+        self.level = None
+        self.trend = 0.0
+        self.seasonals = None
+        self.t = 0
+        self.sse = 0.0
+
+    @classmethod
+    def for_length(cls, length, alpha, beta, gamma, season=SEASON_LENGTH):
+        """Use the richest model the history supports"""
+        if length >= 2 * season:
+            return cls(alpha, beta, gamma, season)
+        if length >= 3:
+            return cls(alpha, beta)
+        return cls(alpha)
+
+    def initialize(self, values):
+        """Set the starting state from the head of the series (no values are consumed)"""
+        values = np.asarray(values, dtype=float)
+        if self.season:
+            first = values[:self.season].mean()
+            second = values[self.season:2 * self.season].mean()
+            self.level = first
+            self.trend = (second - first) / self.season
+            self.seasonals = list(values[:self.season] - first)
+        else:
+            self.level = values[0]
+            if self.beta is not None and len(values) > 1:
+                self.trend = values[1] - values[0]
+
+    def predict(self, steps=1):
+        value = self.level + self.trend * steps
+        if self.seasonals:
+            value += self.seasonals[(self.t + steps - 1) % self.season]
+        return value
+
+    def step(self, value):
+        """Consume the next observation"""
+        error = value - self.predict()
+        self.sse += error * error
+        last_level = self.level
+        seasonal = self.seasonals[self.t % self.season] if self.seasonals else 0.0
+        self.level = self.alpha * (value - seasonal) + (1 - self.alpha) * (last_level + self.trend)
+        if self.beta is not None:
+            self.trend = self.beta * (self.level - last_level) + (1 - self.beta) * self.trend
+        if self.seasonals:
+            self.seasonals[self.t % self.season] = self.gamma * (value - self.level) + (1 - self.gamma) * seasonal
+        self.t += 1
+
+    def run(self, values):
+        self.initialize(values)
+        for value in values:
+            self.step(value)
+        return self
+
+    def forecast(self, steps):
+        return np.array([max(0.0, self.predict(h)) for h in range(1, steps + 1)])
+
+    def copy(self):
+        model = ExponentialSmoothing(self.alpha, self.beta, self.gamma, self.season)
+        model.level, model.trend, model.t, model.sse = self.level, self.trend, self.t, self.sse
+        model.seasonals = list(self.seasonals) if self.seasonals else None
+        return model
+
+
+def fit_parameters(values, season=SEASON_LENGTH):
+    """Grid-search the smoothing constants with the lowest one-step-ahead squared error"""
+    key = (tuple(values), season)
+    if key not in _fit_cache:
+        best = None
+        for alpha, beta, gamma in itertools.product(SMOOTHING_GRID, repeat=3):
+            model = ExponentialSmoothing.for_length(len(values), alpha, beta, gamma, season).run(values)
+            if best is None or model.sse < best[0]:
+                best = (model.sse, (alpha, beta, gamma))
+        if len(_fit_cache) >= FIT_CACHE_SIZE:
+            _fit_cache.clear()
+        _fit_cache[key] = best[1]
+    return _fit_cache[key]
+
+
+class SalesForecaster:
+    """Monthly revenue forecasts for all sales and for each species.
+
+    For every series it keeps a model that has consumed all months except the
+    latest one. A sale in the latest month only changes that last value and a
+    sale in a new month closes the previous one with a single ``step``, so
+    adding sales never refits. Edits, deletes and backdated sales drop the
+    affected models, which are refit on a worker thread by ``refresh``.
+    """
+
+    def __init__(self, rollup, horizon=6, season=SEASON_LENGTH):
+        self.rollup = rollup
+        self.horizon = horizon
+        self.season = season
+        self.models = {}  # species (None for all sales) -> series state
+        self.generation = 0
+        self.task = None
+
+    def monthly_totals(self, key):
+        """Revenue per month for a series, as {month number: total}"""
+        totals = {}
+        if key is None:
+            for month, bucket in self.rollup.monthly.items():
+                totals[month_number(month)] = bucket[0]
+        else:
+            for day, bucket in self.rollup.daily_species.get(key, {}).items():
+                month = month_number(day)
+                totals[month] = totals.get(month, 0) + bucket[0]
+        return totals
+
+    def series(self, key):
+        """Continuous monthly values (empty months are zero) and the number of the first month"""
+        totals = self.monthly_totals(key)
+        if not totals:
+            return None, []
+        first = min(totals)
+        return first, [totals.get(month, 0) for month in range(first, max(totals) + 1)]
+
+    def fit(self, first, values):
+        """Fit one series; runs on the worker thread"""
+        alpha, beta, gamma = fit_parameters(values, self.season)
+        model = ExponentialSmoothing.for_length(len(values), alpha, beta, gamma, self.season)
+        model.initialize(values)
+        # The latest month may still be filling up, so it is stepped in per forecast
+        for value in values[:-1]:
+            model.step(value)
+        return {"model": model, "first": first, "values": list(values)}
+
+    def refresh(self, widget, keys, on_done=None):
+        """Fit every series in ``keys`` that has no model, on a worker thread"""
+        missing = {}
+        for key in keys:
+            if key not in self.models:
+                first, values = self.series(key)
+                if values:
+                    missing[key] = (first, values)
+        if not missing:
+            return
+
+        if self.task:
+            self.task.cancel()
+        self.generation += 1
+        generation = self.generation
+
+        def work(task, snapshot):
+            fitted = {}
+            for key, (first, values) in snapshot.items():
+                if task.cancelled:
+                    return None
+                fitted[key] = self.fit(first, values)
+            return fitted
+
+        def finished(fitted):
+            # Results from a fit that was overtaken by a newer one are stale
+            if fitted is None or generation != self.generation:
+                return
+            self.models.update(fitted)
+            if on_done:
+                on_done()
+
+        self.task = BackgroundTask(widget, work, on_done=finished).start(missing)
+
+    def fit_now(self, key=None):
+        """Fit one series on the calling thread, for code that is already on a worker"""
+        first, values = self.series(key)
+        if values:
+            self.models[key] = self.fit(first, values)
+
+    def reset(self, rollup=None):
+        if rollup is not None:
+            self.rollup = rollup
+        self.models = {}
+        self.generation += 1
+
+    def invalidate(self, *keys):
+        for key in keys:
+            self.models.pop(key, None)
+        self.generation += 1
+
+    def add(self, sale):
+        """Fold a new sale into the models it belongs to"""
+        # A fit already running was snapshotted without this sale
+        self.generation += 1
+        month = month_number(sale["date"])
+        for key in (None, sale["animal"]):
+            state = self.models.get(key)
+            if state is None:
+                continue
+            values = state["values"]
+            last = state["first"] + len(values) - 1
+            if month == last:
+                values[-1] += sale["total"]
+            elif month > last:
+                # Close the latest month and any empty months before the new one
+                model = state["model"]
+                model.step(values[-1])
+                for _ in range(month - last - 1):
+                    values.append(0)
+                    model.step(0)
+                values.append(sale["total"])
+            else:
+                self.invalidate(key)
+
+    def forecast(self, key=None):
+        """Return (month start dates, forecast totals) for the months after the latest, or None"""
+        state = self.models.get(key)
+        if state is None:
+            return None
+        model = state["model"].copy()
+        model.step(state["values"][-1])
+        start = state["first"] + len(state["values"])
+        months = np.arange(start, start + self.horizon).astype("datetime64[M]")
+        return months, model.forecast(self.horizon)
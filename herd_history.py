@@ -0,0 +1,171 @@
+"""
+Herd history module for the Dashboard App
+Contains the HerdHistory store of daily herd snapshots
+"""
+
+import os
+import threading
+from datetime import date
+
+import numpy as np
+
+import storage
+
+HERD_FILE = "herd_history.npz"
+_capture_lock = threading.Lock()
+
+
+def capture(livestock, path=HERD_FILE):
+    """Record today's snapshot of a livestock list, saving only if it changed.
+
+    Called by the dashboard's first load of a session and whenever the herd
+    is written, possibly from a worker thread.
+    """
+    with _capture_lock:
+        history = HerdHistory(path)
+        if history.record(livestock):
+            history.save()
+        return history
+
+
+def weight_of(animal):
+    try:
+        return float(animal.get("weight"))
+    except (TypeError, ValueError):
+        return None
+
+
+class HerdHistory:
+    """Daily herd summaries kept column-wise.
+
+    Each row is one (day, species, health, location) group of a snapshot:
+    its head count, the sum of the weights recorded for it and how many of
+    its animals had a weight. Rows are sorted by day and the codes index the
+    ``species``, ``healths`` and ``locations`` name lists. One snapshot per
+    day is kept: recording again on the same day replaces it. Questions
+    about how the herd looked or evolved read only this table.
+    """
+
+    COLUMNS = ("days", "species_codes", "health_codes", "location_codes", "counts", "weight_sums", "weighed")
+    DTYPES = (np.int32, np.int16, np.int16, np.int16, np.int32, np.float64, np.int32)
+
+    def __init__(self, path=HERD_FILE):
+        self.path = path
+        self.species = []
+        self.healths = []
+        self.locations = []
+        for name, dtype in zip(self.COLUMNS, self.DTYPES):
+            setattr(self, name, np.empty(0, dtype=dtype))
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                self.species = [str(name) for name in data["species"]]
+                self.healths = [str(name) for name in data["healths"]]
+                self.locations = [str(name) for name in data["locations"]]
+                for name, dtype in zip(self.COLUMNS, self.DTYPES):
+                    setattr(self, name, data[name].astype(dtype))
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Error loading herd history: {e}")
+
+    def save(self):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") as f:
+            np.savez(
+                f,
+                species=np.array(self.species, dtype=str),
+                healths=np.array(self.healths, dtype=str),
+                locations=np.array(self.locations, dtype=str),
+                **{name: getattr(self, name) for name in self.COLUMNS}
+            )
+        os.replace(temp_path, self.path)
+        storage.mark_changed(self.path)
+
+    def __len__(self):
+        return len(np.unique(self.days))
+
+    @staticmethod
+    def code(names, name):
+        if name not in names:
+            names.append(name)
+        return names.index(name)
+
+    def record(self, livestock, on_date=None):
+        """Store today's (or ``on_date``'s) snapshot of the herd; returns False if it was unchanged"""
+        day = (on_date or date.today()).toordinal()
+        groups = {}  # (species, health, location) codes -> [count, weight sum, weighed]
+        for animal in livestock:
+            key = (self.code(self.species, animal.get("type", "Unknown")),
+                   self.code(self.healths, animal.get("health", "Unknown")),
+                   self.code(self.locations, animal.get("location", "Unknown")))
+            group = groups.setdefault(key, [0, 0.0, 0])
+            group[0] += 1
+            weight = weight_of(animal)
+            if weight is not None:
+                group[1] += weight
+                group[2] += 1
+        keys = sorted(groups)
+        rows = (
+            [day] * len(keys),
+            [key[0] for key in keys],
+            [key[1] for key in keys],
+            [key[2] for key in keys],
+            [groups[key][0] for key in keys],
+            [groups[key][1] for key in keys],
+            [groups[key][2] for key in keys],
+        )
+
+        lo, hi = np.searchsorted(self.days, [day, day + 1])
+        if hi - lo == len(keys) and all(getattr(self, name)[lo:hi].tolist() == values
+                                        for name, values in zip(self.COLUMNS, rows)):
+            return False
+
+        for name, dtype, values in zip(self.COLUMNS, self.DTYPES, rows):
+            column = getattr(self, name)
+            setattr(self, name, np.concatenate([column[:lo], np.array(values, dtype=dtype), column[hi:]]))
+        return True
+
+    def at(self, on_date):
+        """Return counts by species and by health from the latest snapshot on or before an ISO date.
+
+        Returns None when there is no snapshot that old.
+        """
+        day = date.fromisoformat(on_date).toordinal()
+        hi = int(np.searchsorted(self.days, day, side="right"))
+        if hi == 0:
+            return None
+        lo = int(np.searchsorted(self.days, self.days[hi - 1], side="left"))
+        counts = self.counts[lo:hi]
+        by_species = np.bincount(self.species_codes[lo:hi], weights=counts, minlength=len(self.species))
+        by_health = np.bincount(self.health_codes[lo:hi], weights=counts, minlength=len(self.healths))
+        return ({name: int(n) for name, n in zip(self.species, by_species) if n},
+                {name: int(n) for name, n in zip(self.healths, by_health) if n})
+
+    def trend(self, start=None, end=None):
+        """Per-snapshot series between two ISO dates (inclusive).
+
+        Returns (days as datetime64[D], head counts, counts by health as a
+        days x ``healths`` matrix, mean weights with NaN where nothing was
+        weighed), all computed with one bincount per column.
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.days, date.fromisoformat(start).toordinal()))
+        hi = len(self.days) if end is None else int(
+            np.searchsorted(self.days, date.fromisoformat(end).toordinal(), side="right"))
+        snapshot_days, index = np.unique(self.days[lo:hi], return_inverse=True)
+        n = len(snapshot_days)
+        counts = self.counts[lo:hi]
+        head_counts = np.bincount(index, weights=counts, minlength=n)
+        healths = len(self.healths)
+        by_health = np.bincount(index * healths + self.health_codes[lo:hi], weights=counts,
+                                minlength=n * healths).reshape(n, healths)
+        weighed = np.bincount(index, weights=self.weighed[lo:hi], minlength=n)
+        weight_sums = np.bincount(index, weights=self.weight_sums[lo:hi], minlength=n)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_weights = np.where(weighed > 0, weight_sums / weighed, np.nan)
+        # Day ordinals count from 0001-01-01 and datetime64 days from 1970-01-01
+        epoch = date(1970, 1, 1).toordinal()
+        days = (snapshot_days.astype(np.int64) - epoch).astype("datetime64[D]")
+        return days, head_counts, by_health, mean_weights
@@ -2,42 +2,108 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import json
 import os
-from datetime import datetime
+import random
+from datetime import date, datetime
 from theme import Theme
+import events
+import storage
+from background import BackgroundTask
+from vaccination import VaccinationTracker, VaccinationSchedule, OVERDUE, DUE_SOON, is_overdue
+from weight_history import WeightHistory
+import herd_history
+from sales_ledger import SalesLedger, SALES_FILE
+from date_ranges import iso_date
 
 DATA_FILE = "livestock_data.json"
+ALERT_GROUPS = 6  # species and location chips per alerts row
+MAX_BATCH_SIZE = 50000
+INSERT_CHUNK_SIZE = 500
 
 # Set the theme mode here (dark or light)
 Theme.use_dark_mode()  # Or Theme.use_light_mode()
 
 
 class LivestockInventoryApp:
+    # Overdue tag IDs already announced this session, shared by every page instance
+    alerted_overdue = frozenset()
+
     def __init__(self, root):
         self.root = root
         self.data = self.load_data()
         self.filter_option = tk.StringVar(value="All")
+        self.vaccination_filter = None  # (status, "species" | "location" | None, name)
+        self.vaccinations = VaccinationTracker()
+        self.vaccinations.rebuild((self.row_id(animal), animal) for animal in self.data)
+        self.weight_history = WeightHistory()
         self.setup_ui()
 
     def load_data(self):
+        self.schedule = VaccinationSchedule()
         if os.path.exists(DATA_FILE):
             with open(DATA_FILE, "r") as f:
                 json_data = json.load(f)
+                self.schedule = VaccinationSchedule(json_data.get("vaccination_protocols"))
                 return json_data.get("livestock", [])
         return []
 
     def save_data(self):
-        json_data = {}
-        if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, "r") as f:
-                json_data = json.load(f)
+        self.write_data(self.data)
 
-        json_data["livestock"] = self.data
+    def save_weight_history(self):
+        """Write the weight history on a worker thread from a snapshot taken here"""
+        history = self.weight_history
+        BackgroundTask(self.root, lambda task, ticket, columns: history.write(ticket, columns),
+                       on_error=lambda error: messagebox.showerror(
+                           "Error", f"Weight history could not be saved: {error}")).start(*history.snapshot())
 
-        with open(DATA_FILE, "w") as f:
-            json.dump(json_data, f, indent=2)
+    def snapshot(self):
+        """A write ticket and a copy of the herd, for saving on a worker thread.
 
-    def get_next_tag_id(self, animal_type, count=1):
-        """Generate next available tag ID(s) for given animal type"""
+        The records are flat dicts of strings and numbers, so copying each one
+        is a full copy: the Tk thread can go on editing the originals.
+        """
+        return storage.writer(DATA_FILE).ticket(), [dict(animal) for animal in self.data]
+
+    @staticmethod
+    def read_data_file():
+        if os.path.exists(DATA_FILE):
+            with open(DATA_FILE, "r") as f:
+                return json.load(f)
+        return {}
+
+    @staticmethod
+    def write_data(livestock, protocols=None, ticket=None):
+        """Write the livestock list back into the data file.
+
+        A worker thread must pass a snapshot() and its ticket; without a ticket
+        the write counts as the newest, which only holds on the Tk thread.
+        """
+        writer = storage.writer(DATA_FILE)
+        writer.write(writer.ticket() if ticket is None else ticket,
+                     LivestockInventoryApp.replace_livestock, livestock, protocols)
+
+    @staticmethod
+    def replace_livestock(livestock, protocols):
+        json_data = LivestockInventoryApp.read_data_file()
+        json_data["livestock"] = livestock
+        if protocols is not None:
+            json_data["vaccination_protocols"] = protocols
+
+        storage.write_json(DATA_FILE, json_data)
+        herd_history.capture(livestock)
+
+    def on_data_changed(self):
+        """Reload records written elsewhere while this page was hidden"""
+        self.data = self.load_data()
+        events.publish("livestock", reloaded=self.data)
+        self.vaccinations.rebuild((self.row_id(animal), animal) for animal in self.data)
+        self.weight_history = WeightHistory()
+        self.filter_dropdown['values'] = ["All"] + self.get_species()
+        self.refresh_table()
+        self.refresh_alerts()
+
+    def get_tag_range(self, animal_type):
+        """Return the tag prefix and first free number for given animal type"""
         existing_ids = {animal.get("id", "") for animal in self.data}
 
         # Get the prefix based on animal type
@@ -64,10 +130,14 @@ class LivestockInventoryApp:
                 except ValueError:
                     continue
 
+        return prefix, max_num + 1
+
+    def get_next_tag_id(self, animal_type, count=1):
+        """Generate next available tag ID(s) for given animal type"""
+        prefix, start = self.get_tag_range(animal_type)
+
         # Generate the required number of new IDs
-        new_ids = []
-        for i in range(count):
-            new_ids.append(f"{prefix}{max_num + 1 + i:03d}")
+        new_ids = [f"{prefix}{num:03d}" for num in range(start, start + count)]
 
         return new_ids if count > 1 else new_ids[0]
 
@@ -139,6 +209,10 @@ class LivestockInventoryApp:
         )
         subtitle.pack(anchor="w", padx=22, pady=(0, 10))
 
+        self.alerts_frame = tk.Frame(container, bg=Theme.BG_LIGHT_GRAY)
+        self.alerts_frame.pack(fill=tk.X, padx=20)
+        self.create_alerts_panel()
+
         table_frame = tk.Frame(container, bg=Theme.BG_LIGHT_GRAY)
         table_frame.pack(padx=20, pady=10, fill=tk.BOTH, expand=True)
 
@@ -153,6 +227,7 @@ class LivestockInventoryApp:
             columns=columns,
             show="headings",
             height=10,
+            selectmode="extended",
             xscrollcommand=x_scroll.set,
             yscrollcommand=y_scroll.set
         )
@@ -186,6 +261,7 @@ class LivestockInventoryApp:
         self.tree.tag_configure("due", background="#ffcccc")
 
         self.refresh_table()
+        self.refresh_alerts()
 
         button_frame = tk.Frame(container, bg=Theme.BG_LIGHT_GRAY)
         button_frame.pack(pady=10)
@@ -195,6 +271,26 @@ class LivestockInventoryApp:
                              command=self.edit_selected)
         edit_btn.pack(side=tk.LEFT, padx=10)
 
+        bulk_btn = tk.Button(button_frame, text="Bulk Edit Selected", bg=Theme.PRIMARY_GREEN, fg=Theme.TEXT_WHITE,
+                             font=Theme.get_font(weight="bold"),
+                             command=self.bulk_edit_selected)
+        bulk_btn.pack(side=tk.LEFT, padx=10)
+
+        schedule_btn = tk.Button(button_frame, text="Vaccination Schedule", bg=Theme.SECONDARY_BLUE,
+                                 fg=Theme.TEXT_WHITE, font=Theme.get_font(weight="bold"),
+                                 command=self.open_schedule_window)
+        schedule_btn.pack(side=tk.LEFT, padx=10)
+
+        growth_btn = tk.Button(button_frame, text="Growth Analytics", bg=Theme.SECONDARY_BLUE,
+                               fg=Theme.TEXT_WHITE, font=Theme.get_font(weight="bold"),
+                               command=self.open_growth_window)
+        growth_btn.pack(side=tk.LEFT, padx=10)
+
+        sell_btn = tk.Button(button_frame, text="Sell Selected", bg=Theme.PRIMARY_GREEN, fg=Theme.TEXT_WHITE,
+                             font=Theme.get_font(weight="bold"),
+                             command=self.sell_selected)
+        sell_btn.pack(side=tk.LEFT, padx=10)
+
         delete_btn = tk.Button(button_frame, text="Delete Selected", bg="#dc3545", fg=Theme.TEXT_WHITE,
                                font=Theme.get_font(weight="bold"),
                                command=self.delete_selected)
@@ -204,47 +300,205 @@ class LivestockInventoryApp:
         species = {animal.get("type") for animal in self.data if animal.get("type")}
         return sorted(species)
 
+    def matches_filter(self, animal):
+        filter_val = self.filter_option.get()
+        if filter_val != "All" and animal.get("type") != filter_val:
+            return False
+
+        if self.vaccination_filter:
+            status, field, name = self.vaccination_filter
+            key = self.row_id(animal)
+            if self.vaccinations.status(key) != status:
+                return False
+            entry = self.vaccinations.entries[key]
+            if field == "species" and entry[1] != name:
+                return False
+            if field == "location" and entry[2] != name:
+                return False
+        return True
+
+    def is_vaccination_due(self, animal, today):
+        next_vac = self.vaccinations.parse_date(animal.get("next_vaccination", ""))
+        return next_vac is not None and is_overdue(next_vac, today.toordinal())
+
+    def animal_row(self, animal):
+        return (
+            animal.get("id", ""),
+            animal.get("type", ""),
+            animal.get("breed", ""),
+            animal.get("age", ""),
+            animal.get("weight", ""),
+            animal.get("health", ""),
+            animal.get("location", ""),
+            animal.get("last_vaccination", ""),
+            animal.get("next_vaccination", "")
+        )
+
+    def row_tag(self, animal, index, today):
+        if self.is_vaccination_due(animal, today):
+            return "due"
+        return "evenrow" if index % 2 == 0 else "oddrow"
+
+    def row_id(self, animal):
+        """Treeview item id for a record (stable for the lifetime of the record dict)"""
+        return str(id(animal))
+
     def refresh_table(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.tree.delete(*self.tree.get_children())
+        self.rows = {}
 
         today = datetime.today().date()
-        due_found = False
-
-        filter_val = self.filter_option.get()
-        filtered_data = self.data if filter_val == "All" else [
-            a for a in self.data if a.get("type") == filter_val
-        ]
+        filtered_data = [a for a in self.data if self.matches_filter(a)]
 
         for index, animal in enumerate(filtered_data):
-            next_vac_str = animal.get("next_vaccination", "")
-            is_due = False
-            try:
-                if next_vac_str:
-                    next_vac_date = datetime.strptime(next_vac_str, "%Y-%m-%d").date()
-                    is_due = next_vac_date <= today
-            except:
-                pass
-
-            if is_due:
-                due_found = True
-
-            row = (
-                animal.get("id", ""),
-                animal.get("type", ""),
-                animal.get("breed", ""),
-                animal.get("age", ""),
-                animal.get("weight", ""),
-                animal.get("health", ""),
-                animal.get("location", ""),
-                animal.get("last_vaccination", ""),
-                animal.get("next_vaccination", "")
-            )
-            tag = "due" if is_due else ("evenrow" if index % 2 == 0 else "oddrow")
-            self.tree.insert("", tk.END, values=row, tags=(tag,))
-
-        if due_found:
-            messagebox.showwarning("Vaccination Alert", "Some animals are due for vaccination today or earlier.")
+            iid = self.row_id(animal)
+            self.rows[iid] = animal
+            self.tree.insert("", tk.END, iid=iid, values=self.animal_row(animal),
+                             tags=(self.row_tag(animal, index, today),))
+
+    def update_vaccinations(self, changed=(), removed=()):
+        """Update the due counts for changed records only, then redraw the alerts panel"""
+        for animal in removed:
+            self.vaccinations.remove(self.row_id(animal))
+        for animal in changed:
+            self.vaccinations.update(self.row_id(animal), animal)
+        self.refresh_alerts()
+
+    def create_alerts_panel(self):
+        """Build the alert rows once; refresh_alerts only reconfigures their chips"""
+        self.alert_rows = []
+        for status, label, color in (
+            (OVERDUE, "⚠️ Overdue", "#dc3545"),
+            (DUE_SOON, f"💉 Due in {VaccinationTracker.DUE_SOON_DAYS} days", Theme.ORANGE),
+        ):
+            row = tk.Frame(self.alerts_frame, bg=Theme.BG_LIGHT_GRAY)
+            row.pack(fill=tk.X, pady=2)
+            total_chip = self.create_alert_chip(row, bold=True)
+            group_chips = [self.create_alert_chip(row) for _ in range(2 * ALERT_GROUPS)]
+            self.alert_rows.append((status, label, color, total_chip, group_chips))
+
+        self.filter_row = tk.Frame(self.alerts_frame, bg=Theme.BG_LIGHT_GRAY)
+        self.filter_label = tk.Label(self.filter_row, bg=Theme.BG_LIGHT_GRAY, fg=Theme.TEXT_GRAY,
+                                     font=Theme.get_font())
+        self.filter_label.pack(side=tk.LEFT)
+        tk.Button(self.filter_row, text="Clear", bg=Theme.BG_GRAY, fg=Theme.TEXT_DARK, relief="flat",
+                  font=Theme.get_font(Theme.FONT_SIZE_SMALL), cursor="hand2",
+                  command=lambda: self.set_vaccination_filter(None)).pack(side=tk.LEFT, padx=5)
+
+    def refresh_alerts(self):
+        summary = self.vaccinations.summary()
+        for status, label, color, total_chip, group_chips in self.alert_rows:
+            info = summary[status]
+            self.show_alert_chip(total_chip, f"{label}: {info['total']}", color, (status, None, None),
+                                 enabled=info["total"] > 0)
+
+            # Largest groups first; the long tail is still reachable through the status chip
+            groups = [(field, name, count) for field in ("species", "location")
+                      for name, count in sorted(info[field].items(), key=lambda item: -item[1])[:ALERT_GROUPS]]
+            for chip, (field, name, count) in zip(group_chips, groups):
+                self.show_alert_chip(chip, f"{name} ({count})", color, (status, field, name))
+            # Unused chips are always the trailing ones, so shown chips keep their order
+            for chip in group_chips[len(groups):]:
+                chip.pack_forget()
+
+        if self.vaccination_filter:
+            status, field, name = self.vaccination_filter
+            text = "Showing overdue animals" if status == OVERDUE else "Showing animals due soon"
+            if name:
+                text += f" ({field}: {name})"
+            self.filter_label.config(text=text)
+            self.filter_row.pack(fill=tk.X, pady=2)
+        else:
+            self.filter_row.pack_forget()
+
+        self.show_vaccination_alert()
+
+    def create_alert_chip(self, parent, bold=False):
+        return tk.Button(
+            parent,
+            font=Theme.get_font(Theme.FONT_SIZE_SMALL, "bold" if bold else "normal"),
+            relief="flat",
+            padx=8
+        )
+
+    def show_alert_chip(self, chip, text, color, vaccination_filter, enabled=True):
+        chip.config(
+            text=text,
+            bg=Theme.BG_WHITE if vaccination_filter != self.vaccination_filter else Theme.LIGHT_GREEN,
+            fg=color if enabled else Theme.TEXT_GRAY,
+            cursor="hand2" if enabled else "",
+            state=tk.NORMAL if enabled else tk.DISABLED,
+            command=lambda: self.set_vaccination_filter(vaccination_filter)
+        )
+        if not chip.winfo_manager():
+            chip.pack(side=tk.LEFT, padx=(0, 5))
+
+    def set_vaccination_filter(self, vaccination_filter):
+        self.vaccination_filter = vaccination_filter
+        if vaccination_filter:
+            self.filter_option.set("All")
+        self.refresh_table()
+        self.refresh_alerts()
+
+    def show_vaccination_alert(self):
+        """Warn once per session, and again only when new animals become overdue"""
+        overdue = self.vaccinations.overdue_ids()
+        newly_overdue = overdue - LivestockInventoryApp.alerted_overdue
+        LivestockInventoryApp.alerted_overdue = frozenset(overdue)
+        if newly_overdue:
+            self.root.after_idle(lambda: messagebox.showwarning(
+                "Vaccination Alert",
+                f"{len(newly_overdue)} animal(s) are due for vaccination today or earlier.\n"
+                "Use the vaccination panel above the table to view them."
+            ))
+
+    def insert_rows(self, animals):
+        """Append rows for new records without rebuilding the table"""
+        today = datetime.today().date()
+        index = len(self.tree.get_children())
+        for animal in animals:
+            if not self.matches_filter(animal):
+                continue
+            iid = self.row_id(animal)
+            self.rows[iid] = animal
+            self.tree.insert("", tk.END, iid=iid, values=self.animal_row(animal), tags=(self.row_tag(animal, index, today),))
+            index += 1
+
+    def update_rows(self, animals):
+        """Re-render only the rows of the given records"""
+        today = datetime.today().date()
+        positions = {iid: i for i, iid in enumerate(self.tree.get_children())}
+        hidden = []
+        for animal in animals:
+            iid = self.row_id(animal)
+            if iid not in positions:
+                continue
+            if not self.matches_filter(animal):
+                hidden.append(iid)
+                continue
+            self.tree.item(iid, values=self.animal_row(animal), tags=(self.row_tag(animal, positions[iid], today),))
+        if hidden:
+            self.remove_rows(hidden)
+
+    def remove_rows(self, iids):
+        """Delete rows and restripe only the rows that moved up"""
+        children = self.tree.get_children()
+        positions = {iid: i for i, iid in enumerate(children)}
+        iids = [iid for iid in iids if iid in positions]
+        if not iids:
+            return
+
+        first = min(positions[iid] for iid in iids)
+        self.tree.delete(*iids)
+        for iid in iids:
+            self.rows.pop(iid, None)
+
+        today = datetime.today().date()
+        for index, iid in enumerate(self.tree.get_children()[first:], start=first):
+            self.tree.item(iid, tags=(self.row_tag(self.rows[iid], index, today),))
+
+    def get_selected_records(self):
+        return [self.rows[iid] for iid in self.tree.selection() if iid in self.rows]
 
     def open_add_window(self):
         self.open_entry_window("Add Animal", "Save", self.add_entry)
@@ -398,24 +652,29 @@ class LivestockInventoryApp:
         preview_scroll.pack(side=tk.RIGHT, fill=tk.Y)
 
         def update_preview():
+            preview_text.delete(1.0, tk.END)
             try:
                 count = int(count_entry.get())
                 species = species_combo.get()
 
-                if count > 50:
-                    preview_text.delete(1.0, tk.END)
-                    preview_text.insert(tk.END, "Maximum 50 animals per batch allowed.")
+                if count <= 0 or count > MAX_BATCH_SIZE:
+                    preview_text.insert(tk.END, f"Please enter a number between 1 and {MAX_BATCH_SIZE:,}.")
+                    return
+                if not species:
+                    preview_text.insert(tk.END, "Please select a species.")
                     return
 
-                tag_ids = self.get_next_tag_id(species, count)
-                preview_text.delete(1.0, tk.END)
-                preview_text.insert(tk.END, f"Will create {count} {species} animals:\n\n")
-
-                for i, tag_id in enumerate(tag_ids):
-                    preview_text.insert(tk.END, f"{i + 1}. Tag ID: {tag_id}\n")
+                # Summarise the ID range instead of listing every tag
+                prefix, start = self.get_tag_range(species)
+                first_id = f"{prefix}{start:03d}"
+                last_id = f"{prefix}{start + count - 1:03d}"
+                preview_text.insert(tk.END, f"Will create {count:,} {species} animals.\n\n")
+                if count == 1:
+                    preview_text.insert(tk.END, f"Tag ID: {first_id}\n")
+                else:
+                    preview_text.insert(tk.END, f"Tag IDs: {first_id} to {last_id}\n")
 
             except ValueError:
-                preview_text.delete(1.0, tk.END)
                 preview_text.insert(tk.END, "Please enter a valid number of animals.")
 
         # Update preview when count or species changes
@@ -431,73 +690,234 @@ class LivestockInventoryApp:
         # Initial preview
         update_preview()
 
-        def add_multiple_animals():
-            try:
-                count = int(count_entry.get())
-                if count <= 0 or count > 50:
-                    messagebox.showerror("Error", "Please enter a number between 1 and 50.")
-                    return
-
-                species = species_combo.get()
-                if not species:
-                    messagebox.showerror("Error", "Please select a species.")
-                    return
+        # Progress section, shown while a batch is being created
+        progress_frame = tk.Frame(main_frame, bg=Theme.BG_LIGHT_GRAY)
+        progress_frame.pack(fill=tk.X, pady=5)
+        progress_label = tk.Label(progress_frame, text="", font=Theme.get_font(),
+                                  bg=Theme.BG_LIGHT_GRAY, fg=Theme.TEXT_GRAY, anchor="w")
+        progress_label.pack(fill=tk.X)
+        progress_bar = ttk.Progressbar(progress_frame, orient=tk.HORIZONTAL, mode="determinate")
+        progress_bar.pack(fill=tk.X, pady=(5, 0))
+
+        # Mutable state shared by the batch callbacks below
+        job = {"task": None, "running": False, "saving": False, "animals": [], "inserted": 0}
+
+        # The save is polled from the main window, so its callbacks can run
+        # after this window is gone; they check winfo_exists() before touching it
+
+        def set_progress(text, value, maximum):
+            if not window.winfo_exists():
+                return
+            progress_label.config(text=text)
+            progress_bar.config(maximum=max(maximum, 1), value=value)
+
+        def read_batch_options():
+            """Collect raw form values on the Tk thread; validation happens in the worker"""
+            return {
+                "count": count_entry.get(),
+                "species": species_combo.get(),
+                "breed": breed_entry.get(),
+                "age_min": age_min_entry.get(),
+                "age_max": age_max_entry.get(),
+                "weight_min": weight_min_entry.get(),
+                "weight_max": weight_max_entry.get(),
+                "health": health_combo.get(),
+                "location": location_entry.get(),
+                "last_vac": last_vac_entry.get(),
+                "next_vac": next_vac_entry.get(),
+                "batch_number": batch_entry.get() if batch_var.get() else "",
+                "tag_range": None,
+            }
 
-                breed = breed_entry.get()
-                age_min = float(age_min_entry.get()) if age_min_entry.get() else 12
-                age_max = float(age_max_entry.get()) if age_max_entry.get() else age_min
-                weight_min = float(weight_min_entry.get()) if weight_min_entry.get() else 50
-                weight_max = float(weight_max_entry.get()) if weight_max_entry.get() else weight_min
-                health = health_combo.get()
-                location = location_entry.get()
-                last_vac = last_vac_entry.get()
-                next_vac = next_vac_entry.get()
-
-                batch_number = batch_entry.get() if batch_var.get() else ""
-
-                # Generate tag IDs
-                tag_ids = self.get_next_tag_id(species, count)
-
-                # Create animals with varied attributes
-                import random
-                new_animals = []
-
-                for i, tag_id in enumerate(tag_ids):
-                    # Vary age and weight within range
-                    age = round(random.uniform(age_min, age_max), 1)
-                    weight = round(random.uniform(weight_min, weight_max), 1)
-
-                    animal = {
-                        "id": tag_id,
-                        "type": species,
-                        "breed": breed,
-                        "age": age,
-                        "weight": weight,
-                        "health": health,
-                        "location": location,
-                        "last_vaccination": last_vac,
-                        "next_vaccination": next_vac
-                    }
-
-                    if batch_number:
-                        animal["batch"] = batch_number
-
-                    new_animals.append(animal)
-
-                # Add to data and save to JSON file
-                self.data.extend(new_animals)
-                self.save_data()  # This saves to livestock_data.json
-                self.filter_dropdown['values'] = ["All"] + self.get_species()
-                self.refresh_table()
+        def generate_animals(task, options):
+            """Validate the form and build the new records (runs on a worker thread)"""
+            try:
+                count = int(options["count"])
+            except ValueError:
+                raise ValueError("Please enter a valid number of animals.")
+            if count <= 0 or count > MAX_BATCH_SIZE:
+                raise ValueError(f"Please enter a number between 1 and {MAX_BATCH_SIZE:,}.")
+
+            species = options["species"]
+            if not species:
+                raise ValueError("Please select a species.")
+
+            age_min = float(options["age_min"]) if options["age_min"] else 12
+            age_max = float(options["age_max"]) if options["age_max"] else age_min
+            weight_min = float(options["weight_min"]) if options["weight_min"] else 50
+            weight_max = float(options["weight_max"]) if options["weight_max"] else weight_min
+            if age_max < age_min or weight_max < weight_min:
+                raise ValueError("The upper end of a range must not be below the lower end.")
+
+            for field in ("last_vac", "next_vac"):
+                if options[field]:
+                    options[field] = iso_date(options[field])
+
+            prefix, start = options["tag_range"]
+            new_animals = []
+
+            for i in range(count):
+                if task.cancelled:
+                    return None
+
+                # Vary age and weight within range
+                animal = {
+                    "id": f"{prefix}{start + i:03d}",
+                    "type": species,
+                    "breed": options["breed"],
+                    "age": round(random.uniform(age_min, age_max), 1),
+                    "weight": round(random.uniform(weight_min, weight_max), 1),
+                    "health": options["health"],
+                    "location": options["location"],
+                    "last_vaccination": options["last_vac"],
+                    "next_vaccination": options["next_vac"]
+                }
+
+                if options["batch_number"]:
+                    animal["batch"] = options["batch_number"]
+
+                new_animals.append(animal)
+
+                if (i + 1) % INSERT_CHUNK_SIZE == 0:
+                    task.report(i + 1)
+
+            return new_animals
+
+        def finish_job():
+            job["running"] = False
+            job["saving"] = False
+            job["task"] = None
+            if window.winfo_exists():
+                save_btn.config(state=tk.NORMAL)
+
+        def rollback_inserted_rows():
+            inserted = job["animals"][:job["inserted"]]
+            if self.tree.winfo_exists():
+                self.remove_rows([self.row_id(animal) for animal in inserted])
+            job["animals"] = []
+            job["inserted"] = 0
+
+        def on_generated(new_animals):
+            if new_animals is None:
+                finish_job()
+                set_progress("Cancelled.", 0, 1)
+                return
+            job["animals"] = new_animals
+            job["inserted"] = 0
+            insert_next_chunk()
+
+        def insert_next_chunk():
+            """Insert one chunk of rows, then yield back to the event loop"""
+            if not job["running"]:
+                return
+            animals = job["animals"]
+            start = job["inserted"]
+            chunk = animals[start:start + INSERT_CHUNK_SIZE]
+            self.insert_rows(chunk)
+            job["inserted"] = start + len(chunk)
+            set_progress(f"Adding to table... {job['inserted']:,} of {len(animals):,}", job["inserted"], len(animals))
+
+            if job["inserted"] < len(animals):
+                window.after(1, insert_next_chunk)
+            else:
+                commit_animals()
 
+        def commit_animals():
+            """Add the batch to the inventory and persist it on a worker thread"""
+            new_animals = job["animals"]
+            self.data.extend(new_animals)
+            events.publish("livestock", added=new_animals)
+            self.filter_dropdown['values'] = ["All"] + self.get_species()
+            self.update_vaccinations(changed=new_animals)
+            job["saving"] = True
+            cancel_btn.config(state=tk.DISABLED)
+            set_progress("Saving...", len(new_animals), len(new_animals))
+
+            def on_saved(_):
+                finish_job()
+                tag_ids = [animal["id"] for animal in new_animals]
                 messagebox.showinfo("Success",
-                                    f"Successfully added {count} {species} animals to the database!\nTag IDs: {', '.join(tag_ids[:5])}{'...' if len(tag_ids) > 5 else ''}")
-                window.destroy()
+                                    f"Successfully added {len(new_animals):,} {new_animals[0]['type']} animals to the database!\nTag IDs: {', '.join(tag_ids[:5])}{'...' if len(tag_ids) > 5 else ''}")
+                if window.winfo_exists():
+                    window.destroy()
+
+            def on_save_error(error):
+                finish_job()
+                message = f"Animals were added but could not be saved: {error}"
+                if window.winfo_exists():
+                    cancel_btn.config(state=tk.NORMAL)
+                    messagebox.showerror("Error", message, parent=window)
+                else:
+                    messagebox.showerror("Error", message)
+
+            history = self.weight_history
+            history.add_samples(new_animals)
+
+            def persist(task, ticket, livestock, weights):
+                self.write_data(livestock, ticket=ticket)
+                history.write(*weights)
+
+            # Both snapshots are taken here on the Tk thread; the worker only writes them.
+            # Poll from the main window so the save still completes if the dialog goes away
+            BackgroundTask(self.root, persist, on_done=on_saved, on_error=on_save_error).start(
+                *self.snapshot(), history.snapshot())
+
+        def on_generate_error(error):
+            finish_job()
+            if not window.winfo_exists():
+                return
+            set_progress("", 0, 1)
+            if isinstance(error, ValueError):
+                messagebox.showerror("Input Error", f"Invalid input: {error}", parent=window)
+            else:
+                messagebox.showerror("Error", f"An error occurred: {error}", parent=window)
 
-            except ValueError as e:
-                messagebox.showerror("Input Error", f"Invalid input: {e}")
-            except Exception as e:
-                messagebox.showerror("Error", f"An error occurred: {e}")
+        def add_multiple_animals():
+            if job["running"]:
+                return
+            options = read_batch_options()
+            if options["species"]:
+                options["tag_range"] = self.get_tag_range(options["species"])
+
+            job["running"] = True
+            save_btn.config(state=tk.DISABLED)
+            try:
+                total = int(options["count"])
+            except ValueError:
+                total = 1
+            set_progress("Generating animals...", 0, total)
+
+            job["task"] = BackgroundTask(
+                window,
+                generate_animals,
+                on_done=on_generated,
+                on_progress=lambda done: set_progress(f"Generating animals... {done:,} of {total:,}", done, total),
+                on_error=on_generate_error
+            ).start(options)
+
+        def cancel_or_close():
+            if not job["running"]:
+                window.destroy()
+                return
+            if job["task"] is not None and job["task"].thread.is_alive():
+                job["task"].cancel()
+                return
+            if job["saving"]:
+                # Already saving; let the save finish
+                return
+            job["running"] = False
+            rollback_inserted_rows()
+            finish_job()
+            set_progress("Cancelled. No animals were added.", 0, 1)
+
+        def on_window_destroyed(event):
+            """If the window goes (say, with its parent) while rows are being inserted, take them out again"""
+            if event.widget is not window or not job["running"] or job["saving"]:
+                return
+            job["running"] = False
+            if job["task"] is not None:
+                job["task"].cancel()
+            rollback_inserted_rows()
 
         # Buttons frame - ensure it's always visible
         button_frame = tk.Frame(main_frame, bg=Theme.BG_LIGHT_GRAY)
@@ -514,12 +934,14 @@ class LivestockInventoryApp:
                              relief="flat", cursor="hand2")
         save_btn.pack(side=tk.LEFT, padx=10)
 
-        # Cancel button
-        cancel_btn = tk.Button(button_container, text="Cancel", command=window.destroy,
+        # Cancel button (stops a running batch, otherwise closes the window)
+        cancel_btn = tk.Button(button_container, text="Cancel", command=cancel_or_close,
                                bg="#dc3545", fg=Theme.TEXT_WHITE,
                                font=Theme.get_font(weight="bold"), padx=30, pady=10,
                                relief="flat", cursor="hand2")
         cancel_btn.pack(side=tk.LEFT, padx=10)
+        window.protocol("WM_DELETE_WINDOW", cancel_or_close)
+        window.bind("<Destroy>", on_window_destroyed, add="+")
 
         # Bind mousewheel to canvas for scrolling
         def _on_mousewheel(event):
@@ -527,10 +949,10 @@ class LivestockInventoryApp:
 
         window.bind_all("<MouseWheel>", _on_mousewheel)
 
-    def open_entry_window(self, title, button_text, command, initial_values=None):
+    def open_entry_window(self, title, button_text, command, initial_values=None, weight_series=None):
         window = tk.Toplevel(self.root)
         window.title(title)
-        window.geometry("400x500")
+        window.geometry("400x620" if weight_series is not None else "400x500")
         window.configure(bg=Theme.BG_LIGHT_GRAY)
         window.grab_set()
 
@@ -574,6 +996,94 @@ class LivestockInventoryApp:
         tk.Button(window, text=button_text, command=wrapped_command, bg=Theme.PRIMARY_GREEN, fg=Theme.TEXT_WHITE,
                   font=Theme.get_font(weight="bold"), padx=10, pady=5).grid(row=len(labels), columnspan=2, pady=20)
 
+        if weight_series is not None:
+            self.create_weight_sparkline(window, weight_series).grid(row=len(labels) + 1, columnspan=2, padx=10)
+
+    def create_weight_sparkline(self, parent, weight_series, width=360, height=70):
+        """Small line chart of an animal's weighings with its average daily gain"""
+        dates, weights = weight_series
+        frame = tk.Frame(parent, bg=Theme.BG_LIGHT_GRAY)
+
+        if len(weights) < 2:
+            summary = "Weight history: not enough weighings yet"
+        else:
+            span = int(dates[-1] - dates[0])
+            gain = (float(weights[-1]) - float(weights[0])) / span if span else 0
+            summary = (f"Weight history: {len(weights)} weighings, "
+                       f"{float(weights[0]):g} to {float(weights[-1]):g} kg, ADG {gain:.2f} kg/day")
+        tk.Label(frame, text=summary, bg=Theme.BG_LIGHT_GRAY, fg=Theme.TEXT_GRAY,
+                 font=Theme.get_font(Theme.FONT_SIZE_SMALL)).pack(anchor="w")
+
+        canvas = tk.Canvas(frame, width=width, height=height, bg=Theme.BG_WHITE, highlightthickness=0)
+        canvas.pack()
+        if len(weights) >= 2:
+            pad = 6
+            x0, x1 = float(dates[0]), float(dates[-1])
+            y0, y1 = float(weights.min()), float(weights.max())
+            x_span = (x1 - x0) or 1
+            y_span = (y1 - y0) or 1
+            points = []
+            for d, w in zip(dates, weights):
+                points.append(pad + (float(d) - x0) / x_span * (width - 2 * pad))
+                points.append(height - pad - (float(w) - y0) / y_span * (height - 2 * pad))
+            canvas.create_line(points, fill=Theme.PRIMARY_GREEN, width=2)
+            canvas.create_oval(points[-2] - 3, points[-1] - 3, points[-2] + 3, points[-1] + 3,
+                               fill=Theme.PRIMARY_GREEN, outline="")
+        return frame
+
+    def open_growth_window(self):
+        window = tk.Toplevel(self.root)
+        window.title("Growth Analytics")
+        window.geometry("560x560")
+        window.configure(bg=Theme.BG_LIGHT_GRAY)
+
+        tk.Label(window, text="Growth Analytics", font=Theme.get_font(Theme.FONT_SIZE_LARGE, "bold"),
+                 bg=Theme.BG_LIGHT_GRAY, fg=Theme.TEXT_DARK).pack(anchor="w", padx=10, pady=(10, 5))
+
+        text = tk.Text(window, font=Theme.get_font(), bg=Theme.BG_WHITE, fg=Theme.TEXT_DARK)
+        text.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+        history = self.weight_history
+        gains = history.average_daily_gain()
+        species_by_id = {str(animal.get("id")): animal.get("type", "Unknown") for animal in self.data}
+
+        text.insert(tk.END, f"{len(history):,} weighings recorded for {len(history.animal_ids):,} animals.\n\n")
+
+        # Average daily gain per species, current animals only
+        by_species = {}
+        for tag_id, gain in gains.items():
+            if tag_id in species_by_id:
+                by_species.setdefault(species_by_id[tag_id], []).append(gain)
+        text.insert(tk.END, "Average daily gain by species\n")
+        for species in sorted(by_species):
+            values = by_species[species]
+            text.insert(tk.END, f"  {species}: {sum(values) / len(values):.2f} kg/day ({len(values)} animals)\n")
+
+        ranked = sorted(((g, t) for t, g in gains.items() if t in species_by_id), reverse=True)
+        text.insert(tk.END, "\nFastest growing\n")
+        for gain, tag_id in ranked[:5]:
+            text.insert(tk.END, f"  {tag_id}: {gain:.2f} kg/day\n")
+        text.insert(tk.END, "\nSlowest growing\n")
+        for gain, tag_id in ranked[-5:][::-1]:
+            text.insert(tk.END, f"  {tag_id}: {gain:.2f} kg/day\n")
+
+        outliers = history.outliers()
+        text.insert(tk.END, f"\nOutlier weighings ({len(outliers)})\n")
+        for tag_id, ordinal, kg in outliers[:20]:
+            text.insert(tk.END, f"  {tag_id} on {date.fromordinal(ordinal).isoformat()}: {kg:g} kg\n")
+
+        starts, means = history.growth_curve(bucket_days=7)
+        text.insert(tk.END, "\nHerd mean weight, last 8 weeks\n")
+        for start, mean in list(zip(starts, means))[-8:]:
+            text.insert(tk.END, f"  Week of {date.fromordinal(int(start)).isoformat()}: {mean:.1f} kg\n")
+
+        text.config(state=tk.DISABLED)
+
+    @staticmethod
+    def entered_date(text):
+        """A vaccination date typed into a form in ISO form, "" if left blank; raises ValueError if invalid"""
+        return iso_date(text) if text.strip() else ""
+
     def add_entry(self, entries, window):
         try:
             tag_id = entries["Tag ID"].get()
@@ -591,45 +1101,330 @@ class LivestockInventoryApp:
                 "weight": float(entries["Weight"].get()),
                 "health": entries["Health"].get(),
                 "location": entries["Location"].get(),
-                "last_vaccination": entries["Last Vaccination (YYYY-MM-DD)"].get(),
-                "next_vaccination": entries["Next Vaccination (YYYY-MM-DD)"].get()
+                "last_vaccination": self.entered_date(entries["Last Vaccination (YYYY-MM-DD)"].get()),
+                "next_vaccination": self.entered_date(entries["Next Vaccination (YYYY-MM-DD)"].get())
             }
+            if not new_record["next_vaccination"]:
+                self.schedule.apply([new_record])
             self.data.append(new_record)
+            events.publish("livestock", added=[new_record])
             self.save_data()
+            self.weight_history.add_sample(new_record["id"], new_record["weight"])
+            self.save_weight_history()
             self.filter_dropdown['values'] = ["All"] + self.get_species()
-            self.refresh_table()
+            self.update_vaccinations(changed=[new_record])
+            self.insert_rows([new_record])
             window.destroy()
         except Exception as e:
             messagebox.showerror("Input Error", f"Invalid input: {e}")
 
     def delete_selected(self):
-        selected_item = self.tree.selection()
-        if not selected_item:
+        records = self.get_selected_records()
+        if not records:
             messagebox.showwarning("No Selection", "Please select an entry to delete.")
             return
 
-        confirm = messagebox.askyesno("Delete Confirmation", "Are you sure you want to delete the selected entry?")
+        if len(records) == 1:
+            message = "Are you sure you want to delete the selected entry?"
+        else:
+            message = f"Are you sure you want to delete the {len(records)} selected entries?"
+
+        confirm = messagebox.askyesno("Delete Confirmation", message)
         if confirm:
-            values = self.tree.item(selected_item)["values"]
-            tag_id = values[0]
-            self.data = [animal for animal in self.data if animal.get("id") != tag_id]
+            removed = {id(animal) for animal in records}
+            self.data = [animal for animal in self.data if id(animal) not in removed]
+            events.publish("livestock", removed=records)
             self.save_data()
             self.filter_dropdown['values'] = ["All"] + self.get_species()
-            self.refresh_table()
+            self.remove_rows([self.row_id(animal) for animal in records])
+            self.update_vaccinations(removed=records)
+
+    def sell_selected(self):
+        records = self.get_selected_records()
+        if not records:
+            messagebox.showwarning("No Selection", "Please select one or more animals to sell.")
+            return
+        # Sales are priced per kg of live weight, so an animal without a weight cannot be priced
+        unweighed = [animal.get("id") or "?" for animal in records if not (herd_history.weight_of(animal) or 0) > 0]
+        if unweighed:
+            shown = ", ".join(unweighed[:10]) + (f" and {len(unweighed) - 10} more" if len(unweighed) > 10 else "")
+            messagebox.showwarning("Missing Weight", f"Record a weight before selling these animals: {shown}.")
+            return
+        self.open_sell_window(records)
+
+    def open_sell_window(self, records):
+        window = tk.Toplevel(self.root)
+        window.title("Sell Animals")
+        window.geometry("420x300")
+        window.configure(bg=Theme.BG_LIGHT_GRAY)
+        window.grab_set()
+
+        live_weight = sum(herd_history.weight_of(animal) for animal in records)
+        tk.Label(window, text=f"Selling {len(records)} animals, {live_weight:,.1f} kg live weight in total.",
+                 font=Theme.get_font(), bg=Theme.BG_LIGHT_GRAY, fg=Theme.TEXT_GRAY, wraplength=380,
+                 justify="left").grid(row=0, columnspan=2, sticky="w", padx=10, pady=(10, 5))
+
+        price_entry = tk.Entry(window, font=Theme.get_font())
+        date_entry = tk.Entry(window, font=Theme.get_font())
+        date_entry.insert(0, date.today().isoformat())
+        for i, (label, entry) in enumerate([("Price per kg (₦)", price_entry), ("Sale Date (YYYY-MM-DD)", date_entry)],
+                                           start=1):
+            tk.Label(window, text=label + ":", font=Theme.get_font(), bg=Theme.BG_LIGHT_GRAY, fg=Theme.TEXT_DARK).grid(
+                row=i, column=0, sticky="e", padx=10, pady=5)
+            entry.grid(row=i, column=1, padx=10, pady=5)
+
+        archive = tk.BooleanVar(value=True)
+        tk.Checkbutton(window, text="Keep sold animals in the archive", variable=archive, font=Theme.get_font(),
+                       bg=Theme.BG_LIGHT_GRAY, fg=Theme.TEXT_DARK).grid(row=3, columnspan=2, pady=5)
+
+        total_label = tk.Label(window, text="Sale total: -", font=Theme.get_font(weight="bold"),
+                               bg=Theme.BG_LIGHT_GRAY, fg=Theme.TEXT_DARK)
+        total_label.grid(row=4, columnspan=2, pady=5)
+
+        def show_total(event=None):
+            try:
+                total_label.config(text=f"Sale total: ₦{round(float(price_entry.get()) * live_weight):,}")
+            except ValueError:
+                total_label.config(text="Sale total: -")
+
+        price_entry.bind("<KeyRelease>", show_total)
+
+        def record_sale():
+            try:
+                price_per_kg = float(price_entry.get())
+                if price_per_kg <= 0:
+                    raise ValueError("price per kg must be greater than 0")
+                sale_date = iso_date(date_entry.get())
+            except ValueError as e:
+                messagebox.showerror("Input Error", f"Invalid input: {e}", parent=window)
+                return
+            try:
+                sales = self.sell_animals(records, price_per_kg, sale_date, archive.get())
+            except (OSError, ValueError, KeyError) as e:
+                # Nothing changed: the ledger re-reads itself and the inventory is only updated after the commit
+                messagebox.showerror("Save Error", f"The sale was not recorded: {e}", parent=window)
+                return
+            window.destroy()
+            total = sum(sale["total"] for sale in sales)
+            messagebox.showinfo("Sale Recorded", f"Sold {len(records)} animals for ₦{total:,}.")
+
+        tk.Button(window, text=f"Sell {len(records)} Animals", command=record_sale, bg=Theme.PRIMARY_GREEN,
+                  fg=Theme.TEXT_WHITE, font=Theme.get_font(weight="bold"), padx=10, pady=5).grid(
+            row=5, columnspan=2, pady=15)
+
+    def sell_animals(self, records, price_per_kg, sale_date, archive=True):
+        """Record the sale and remove the animals from the inventory in one commit.
+
+        One sale is written per species, priced from the live weights and
+        carrying the sold animals' tag IDs and weights. Either both the sales
+        ledger and the livestock file change or neither does.
+        """
+        ledger = SalesLedger(SALES_FILE, create_sample=False)
+        by_species = {}
+        for animal in records:
+            by_species.setdefault(animal.get("type", "Unknown"), []).append(animal)
+
+        sales = []
+        sale_ids = {}
+        for species, animals in sorted(by_species.items()):
+            weights = [herd_history.weight_of(animal) or 0 for animal in animals]
+            total = round(price_per_kg * sum(weights))
+            sale = ledger.new_sale(species, round(total / len(animals)), len(animals), sale_date, total=total,
+                                   animal_ids=[animal.get("id") for animal in animals], weights=weights,
+                                   price_per_kg=price_per_kg)
+            sales.append(sale)
+            for animal in animals:
+                sale_ids[id(animal)] = sale["id"]
+
+        remaining = [animal for animal in self.data if id(animal) not in sale_ids]
+
+        def commit():
+            json_data = self.read_data_file()
+            json_data["livestock"] = remaining
+            if archive:
+                json_data.setdefault("archived", []).extend(
+                    dict(animal, sold_on=sale_date, sale_id=sale_ids[id(animal)]) for animal in records)
+            ledger.commit_sales(sales, {DATA_FILE: json_data})
+            try:
+                herd_history.capture(remaining)
+            except (OSError, ValueError) as e:
+                # The sale is committed; only today's herd snapshot is out of date
+                print(f"Error saving herd history: {e}")
+
+        # Through the file's writer, so a save still running on a worker cannot bring the sold animals back
+        writer = storage.writer(DATA_FILE)
+        writer.write(writer.ticket(), commit)
+
+        self.data = remaining
+        events.publish("livestock", removed=records)
+        self.filter_dropdown['values'] = ["All"] + self.get_species()
+        self.remove_rows([self.row_id(animal) for animal in records])
+        self.update_vaccinations(removed=records)
+        return sales
+
+    def bulk_edit_selected(self):
+        records = self.get_selected_records()
+        if not records:
+            messagebox.showwarning("No Selection", "Please select one or more entries to edit.")
+            return
+        self.open_bulk_edit_window(records)
+
+    def open_bulk_edit_window(self, records):
+        window = tk.Toplevel(self.root)
+        window.title("Bulk Edit Animals")
+        window.geometry("420x320")
+        window.configure(bg=Theme.BG_LIGHT_GRAY)
+        window.grab_set()
+
+        tk.Label(window, text=f"Editing {len(records)} animals. Leave a field blank to keep its current value.",
+                 font=Theme.get_font(), bg=Theme.BG_LIGHT_GRAY, fg=Theme.TEXT_GRAY, wraplength=380,
+                 justify="left").grid(row=0, columnspan=2, sticky="w", padx=10, pady=(10, 5))
+
+        # Label, record key and input widget for each bulk-editable field
+        fields = [
+            ("Location", "location", tk.Entry(window, font=Theme.get_font())),
+            ("Health", "health", ttk.Combobox(
+                window,
+                values=["", "Excellent", "Good", "Fair", "Under Observation", "Poor"],
+                state="readonly",
+                font=Theme.get_font()
+            )),
+            ("Next Vaccination (YYYY-MM-DD)", "next_vaccination", tk.Entry(window, font=Theme.get_font())),
+            ("Batch", "batch", tk.Entry(window, font=Theme.get_font())),
+        ]
+
+        for i, (label, _, entry) in enumerate(fields, start=1):
+            tk.Label(window, text=label + ":", font=Theme.get_font(), bg=Theme.BG_LIGHT_GRAY, fg=Theme.TEXT_DARK).grid(
+                row=i, column=0, sticky="e", padx=10, pady=5)
+            entry.grid(row=i, column=1, padx=10, pady=5)
+
+        def apply_changes():
+            changes = {key: entry.get().strip() for _, key, entry in fields if entry.get().strip()}
+            if not changes:
+                messagebox.showwarning("No Changes", "Please fill in at least one field to apply.", parent=window)
+                return
+            try:
+                self.apply_bulk_update(records, changes)
+                window.destroy()
+            except ValueError as e:
+                messagebox.showerror("Input Error", f"Invalid input: {e}", parent=window)
+
+        tk.Button(window, text=f"Apply to {len(records)} Animals", command=apply_changes, bg=Theme.PRIMARY_GREEN,
+                  fg=Theme.TEXT_WHITE, font=Theme.get_font(weight="bold"), padx=10, pady=5).grid(
+            row=len(fields) + 1, columnspan=2, pady=20)
+
+    def apply_bulk_update(self, records, changes):
+        """Apply the same field changes to many records with one save and one table update"""
+        if "next_vaccination" in changes:
+            changes["next_vaccination"] = iso_date(changes["next_vaccination"])
+
+        before = [dict(animal) for animal in records]
+        for animal in records:
+            animal.update(changes)
+        events.publish("livestock", removed=before, added=records)
+
+        self.save_data()
+        self.update_vaccinations(changed=records)
+        self.update_rows(records)
+
+    def open_schedule_window(self):
+        window = tk.Toplevel(self.root)
+        window.title("Vaccination Schedule")
+        window.geometry("520x640")
+        window.configure(bg=Theme.BG_LIGHT_GRAY)
+        window.grab_set()
+
+        tk.Label(window, text="Vaccination Protocols", font=Theme.get_font(Theme.FONT_SIZE_LARGE, "bold"),
+                 bg=Theme.BG_LIGHT_GRAY, fg=Theme.TEXT_DARK).pack(anchor="w", padx=10, pady=(10, 0))
+        tk.Label(window, text="One per line, e.g. \"Cattle: every 180 days\" or \"Cattle 0-1: every 90 days\" "
+                              "(age band uses the Age column; first match wins).",
+                 font=Theme.get_font(Theme.FONT_SIZE_SMALL), bg=Theme.BG_LIGHT_GRAY, fg=Theme.TEXT_GRAY,
+                 wraplength=490, justify="left").pack(anchor="w", padx=10)
+
+        protocols_text = tk.Text(window, height=9, font=Theme.get_font(), bg=Theme.BG_WHITE, fg=Theme.TEXT_DARK)
+        protocols_text.pack(fill=tk.X, padx=10, pady=5)
+        protocols_text.insert(tk.END, self.schedule.format_protocols())
+
+        tk.Label(window, text="Upcoming Workload", font=Theme.get_font(Theme.FONT_SIZE_LARGE, "bold"),
+                 bg=Theme.BG_LIGHT_GRAY, fg=Theme.TEXT_DARK).pack(anchor="w", padx=10, pady=(10, 0))
+        workload_text = tk.Text(window, height=12, font=Theme.get_font(), bg=Theme.BG_WHITE, fg=Theme.TEXT_DARK)
+        workload_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        def show_workload():
+            week_starts, counts, overdue = VaccinationSchedule.weekly_workload(self.data, weeks=12)
+            workload_text.config(state=tk.NORMAL)
+            workload_text.delete(1.0, tk.END)
+            workload_text.insert(tk.END, f"Overdue now: {overdue}\n\n")
+            for week_start, count in zip(week_starts, counts):
+                workload_text.insert(tk.END, f"Week of {week_start.isoformat()}: {count} animals\n")
+            workload_text.config(state=tk.DISABLED)
+
+        def read_protocols():
+            try:
+                return VaccinationSchedule(VaccinationSchedule.parse_protocols(protocols_text.get(1.0, tk.END)))
+            except ValueError as e:
+                messagebox.showerror("Protocol Error", str(e), parent=window)
+                return None
+
+        def save_protocols():
+            schedule = read_protocols()
+            if schedule:
+                self.schedule = schedule
+                self.write_data(self.data, self.schedule.protocols)
+                messagebox.showinfo("Saved", "Vaccination protocols saved.", parent=window)
+
+        def apply_to_herd():
+            schedule = read_protocols()
+            if not schedule:
+                return
+            self.schedule = schedule
+            changed = self.schedule.apply(self.data)
+            self.write_data(self.data, self.schedule.protocols)
+            self.update_vaccinations(changed=changed)
+            self.update_rows(changed)
+            show_workload()
+            messagebox.showinfo("Schedule Applied", f"Updated next vaccination for {len(changed)} animals.",
+                                parent=window)
+
+        def mark_selected_vaccinated():
+            records = self.get_selected_records()
+            if not records:
+                messagebox.showwarning("No Selection", "Select the vaccinated animals in the table first.",
+                                       parent=window)
+                return
+            self.mark_vaccinated(records)
+            show_workload()
+            messagebox.showinfo("Vaccinations Recorded", f"Marked {len(records)} animals as vaccinated today.",
+                                parent=window)
+
+        button_row = tk.Frame(window, bg=Theme.BG_LIGHT_GRAY)
+        button_row.pack(pady=10)
+        for text, command in (("Save Protocols", save_protocols),
+                              ("Apply to Herd", apply_to_herd),
+                              ("Mark Selected Vaccinated", mark_selected_vaccinated)):
+            tk.Button(button_row, text=text, command=command, bg=Theme.PRIMARY_GREEN, fg=Theme.TEXT_WHITE,
+                      font=Theme.get_font(weight="bold"), padx=10, pady=5).pack(side=tk.LEFT, padx=5)
+
+        show_workload()
+
+    def mark_vaccinated(self, records):
+        """Record today's vaccination for a group with one save and one table update"""
+        self.schedule.mark_vaccinated(records)
+        self.save_data()
+        self.update_vaccinations(changed=records)
+        self.update_rows(records)
 
     def edit_selected(self):
-        selected_item = self.tree.selection()
-        if not selected_item:
+        records = self.get_selected_records()
+        if not records:
             messagebox.showwarning("No Selection", "Please select an entry to edit.")
             return
-
-        values = self.tree.item(selected_item)["values"]
-        tag_id = values[0]
-        record = next((a for a in self.data if a.get("id") == tag_id), None)
-        if not record:
-            messagebox.showerror("Error", "Selected record not found.")
+        if len(records) > 1:
+            self.open_bulk_edit_window(records)
             return
 
+        record = records[0]
+
         label_map = {
             "Tag ID": "id",
             "Species": "type",
@@ -642,9 +1437,12 @@ class LivestockInventoryApp:
             "Next Vaccination (YYYY-MM-DD)": "next_vaccination"
         }
         initial_values = {k: str(record.get(v, "")) for k, v in label_map.items()}
+        old_id = record.get("id", "")
+        old_weight = record.get("weight")
 
         def save_edit(entries, window):
             try:
+                before = dict(record)
                 record.update({
                     "id": entries["Tag ID"].get(),
                     "type": entries["Species"].get(),
@@ -653,17 +1451,26 @@ class LivestockInventoryApp:
                     "weight": float(entries["Weight"].get()),
                     "health": entries["Health"].get(),
                     "location": entries["Location"].get(),
-                    "last_vaccination": entries["Last Vaccination (YYYY-MM-DD)"].get(),
-                    "next_vaccination": entries["Next Vaccination (YYYY-MM-DD)"].get()
+                    "last_vaccination": self.entered_date(entries["Last Vaccination (YYYY-MM-DD)"].get()),
+                    "next_vaccination": self.entered_date(entries["Next Vaccination (YYYY-MM-DD)"].get())
                 })
+                if not record["next_vaccination"]:
+                    self.schedule.apply([record])
+                events.publish("livestock", removed=[before], added=[record])
                 self.save_data()
+                self.weight_history.rename(old_id, record["id"])
+                if record["weight"] != old_weight:
+                    self.weight_history.add_sample(record["id"], record["weight"])
+                self.save_weight_history()
                 self.filter_dropdown['values'] = ["All"] + self.get_species()
-                self.refresh_table()
+                self.update_vaccinations(changed=[record])
+                self.update_rows([record])
                 window.destroy()
             except Exception as e:
                 messagebox.showerror("Input Error", f"Invalid input: {e}")
 
-        self.open_entry_window("Edit Animal", "Save Changes", save_edit, initial_values)
+        self.open_entry_window("Edit Animal", "Save Changes", save_edit, initial_values,
+                               weight_series=self.weight_history.series(old_id))
 
 
 if __name__ == "__main__":
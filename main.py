@@ -1,23 +1,26 @@
 import tkinter as tk
 from tkinter import messagebox
+import multiprocessing
 import webbrowser
 import json
 import os
 from theme import Theme
 from sidebar import Sidebar
-from summary_cards import SummaryCards
-from charts import Charts
+from dashboard_page import DashboardPage
 from datamanager import DataManager
-from profile import ProfilePage
-from livestock_inventory import LivestockInventoryApp
-from calculator_page import CalculatorPage
-from ai_assistant_page import AIAssistantPage  # ✅ AI Assistant Page Import
-from sales_page import SalesPage
-import json
+from page_manager import PageManager
+from chart_cache import ChartCache
+import render_service
+import storage
 CONFIG_FILE = "config.json"
 data = "livestock_data.json"
+SALES_FILE = "sales_data.json"
+WEIGHT_FILE = "weight_history.npz"
+DEFAULT_PAGE_CACHE_SIZE = 4
 class DashboardApp:
     def __init__(self):
+        # Finish any multi-file save that was cut short before reading data
+        storage.recover()
         self.root = tk.Tk()
         self.config = self.load_config()
         self.dark_mode = self.config.get("dark_mode", False)
@@ -29,9 +32,11 @@ class DashboardApp:
 
         self.setup_window()
         self.current_page = "Dashboard"
+        self.data_manager = DataManager()
+        # Rendered charts outlive the dashboard page, which is rebuilt on theme changes
+        self.chart_cache = ChartCache(self.config.get("chart_cache_dir"))
         self.create_main_layout()
         self.create_menu_bar()
-        self.data_manager = DataManager()
 
 
     def load_config(self):
@@ -41,8 +46,8 @@ class DashboardApp:
         return {}
 
     def save_config(self):
-        with open(CONFIG_FILE, "w") as f:
-            json.dump({"dark_mode": self.dark_mode}, f)
+        self.config["dark_mode"] = self.dark_mode
+        storage.write_json(CONFIG_FILE, self.config, indent=None)
 
     def setup_window(self):
         self.root.title("Farm Dashboard - Livestock Management System")
@@ -65,7 +70,44 @@ class DashboardApp:
         self.sidebar = Sidebar(self.main_container, self.on_menu_click)
         self.content_frame = tk.Frame(self.main_container, bg=Theme.BG_WHITE)
         self.content_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
-        self.load_dashboard_content()
+        self.create_page_manager()
+        self.on_menu_click("Dashboard")
+
+    def create_page_manager(self):
+        """Register every page; each is built on first visit and then kept alive"""
+        self.pages = PageManager(self.content_frame,
+                                 self.config.get("page_cache_size", DEFAULT_PAGE_CACHE_SIZE))
+        self.pages.register("Dashboard", self.load_dashboard_content, [data, SALES_FILE])
+        self.pages.register("My Profile", self.create_profile_page, [data])
+        self.pages.register("Sales", self.create_sales_page, [SALES_FILE])
+        self.pages.register("Livestock", self.create_livestock_page, [data, WEIGHT_FILE])
+        self.pages.register("Calculator", self.create_calculator_page)
+        self.pages.register("AI Assistant", self.create_assistant_page, [data])
+
+    # Page modules pull in PIL, numpy, matplotlib and requests, so each one is
+    # imported on the first visit to its page rather than before the window opens
+
+    def create_profile_page(self, frame):
+        from profile import ProfilePage
+        page = ProfilePage(frame, self.data_manager)
+        page.show()
+        return page
+
+    def create_sales_page(self, frame):
+        from sales_page import SalesPage
+        return SalesPage(frame, self.data_manager)
+
+    def create_livestock_page(self, frame):
+        from livestock_inventory import LivestockInventoryApp
+        return LivestockInventoryApp(frame)
+
+    def create_calculator_page(self, frame):
+        from calculator_page import CalculatorPage
+        return CalculatorPage(frame)
+
+    def create_assistant_page(self, frame):
+        from ai_assistant_page import AIAssistantPage
+        return AIAssistantPage(frame)
 
     def get_data(self, data):
         if os.path.exists(data):
@@ -110,23 +152,20 @@ class DashboardApp:
         Theme.use_dark_mode() if self.dark_mode else Theme.use_light_mode()
         self.save_config()
         self.root.configure(bg=Theme.BG_WHITE)
-        self.clear_content_frame()
+        # Cached pages were drawn with the old colours, so start from scratch
+        self.pages.clear()
         self.main_container.destroy()
         self.create_main_layout()
 
-    def clear_content_frame(self):
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+    def load_dashboard_content(self, parent):
+        self.create_page_header(parent, "Dashboard", "🏠", "Welcome to your farm management dashboard")
+        page = DashboardPage(parent, self.chart_cache,
+                             lambda message: self.show_status_message(message, "error"))
+        self.create_refresh_section(parent)
+        return page
 
-    def load_dashboard_content(self):
-        self.clear_content_frame()
-        self.create_page_header("Dashboard", "🏠", "Welcome to your farm management dashboard")
-        self.summary_cards = SummaryCards(self.content_frame)
-        self.charts = Charts(self.content_frame)
-        self.create_refresh_section()
-
-    def create_refresh_section(self):
-        refresh_frame = tk.Frame(self.content_frame, bg=Theme.BG_WHITE)
+    def create_refresh_section(self, parent):
+        refresh_frame = tk.Frame(parent, bg=Theme.BG_WHITE)
         refresh_frame.pack(fill=tk.X, padx=Theme.PADDING_LARGE, pady=Theme.PADDING_MEDIUM)
 
         refresh_button = tk.Button(
@@ -146,8 +185,8 @@ class DashboardApp:
         refresh_button.bind("<Enter>", lambda e: refresh_button.config(bg=Theme.DARK_GREEN))
         refresh_button.bind("<Leave>", lambda e: refresh_button.config(bg=Theme.PRIMARY_GREEN))
 
-    def create_page_header(self, title, icon, description):
-        header_frame = tk.Frame(self.content_frame, bg=Theme.BG_WHITE)
+    def create_page_header(self, parent, title, icon, description):
+        header_frame = tk.Frame(parent, bg=Theme.BG_WHITE)
         header_frame.pack(fill=tk.X, padx=Theme.PADDING_LARGE, pady=Theme.PADDING_LARGE)
 
         title_frame = tk.Frame(header_frame, bg=Theme.BG_WHITE)
@@ -164,33 +203,18 @@ class DashboardApp:
 
     def on_menu_click(self, menu_item):
         self.current_page = menu_item
-        self.clear_content_frame()
-
-        if menu_item == "Dashboard":
-            self.load_dashboard_content()
-        elif menu_item == "My Profile":
-            ProfilePage(self.content_frame, self.data_manager).show()
-        elif menu_item == "Sales":
-            SalesPage(self.content_frame, self.data_manager)
-        elif menu_item == "Livestock":
-            LivestockInventoryApp(self.content_frame)
-        elif menu_item == "Calculator":
-            CalculatorPage(self.content_frame)
-        elif menu_item == "AI Assistant":
-            AIAssistantPage(self.content_frame)  # ✅ Fix: store reference
-        else:
-            self.load_placeholder_content(menu_item)
+        if menu_item not in self.pages.factories:
+            self.pages.register(menu_item, lambda frame: self.load_placeholder_content(frame, menu_item))
+        self.pages.show(menu_item)
 
-    def load_placeholder_content(self, title):
-        self.clear_content_frame()
-        self.create_page_header(title, "ℹ️", f"This is the {title.lower()} page")
+    def load_placeholder_content(self, parent, title):
+        self.create_page_header(parent, title, "ℹ️", f"This is the {title.lower()} page")
 
     def refresh_all_data(self):
         if self.current_page == "Dashboard":
-            if hasattr(self, 'summary_cards'):
-                self.summary_cards.refresh_data()
-            if hasattr(self, 'charts'):
-                self.charts.refresh_charts()
+            page = self.pages.get("Dashboard")
+            if page is not None:
+                page.load_data()
             self.show_status_message("Data refreshed successfully!", "success")
         else:
             self.show_status_message("Switch to Dashboard to refresh data", "info")
@@ -214,6 +238,7 @@ class DashboardApp:
 
     def on_closing(self):
         if messagebox.askokcancel("Quit", "Do you want to quit?"):
+            render_service.shutdown()
             self.root.destroy()
 
     def run(self):
@@ -231,4 +256,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Lets frozen builds start the chart render processes instead of another window
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,228 @@
+"""
+Metrics module for the Dashboard App
+Contains the DashboardMetrics snapshot shared by the dashboard cards and charts
+"""
+
+import json
+import os
+from datetime import date
+import events
+import storage
+import numpy as np
+from downsampling import DAY, WEEK, MONTH, format_bucket
+import herd_history
+from sales_rollup import SalesRollup
+from vaccination import parse_date_ordinals, group_codes, weekly_counts, week_starts
+
+LIVESTOCK_FILE = "livestock_data.json"
+SALES_FILE = "sales_data.json"
+
+# Weighted health score: Excellent=100%, Good=80%, Fair=60%, Under Observation=40%, Poor=20%
+HEALTH_WEIGHTS = {"Excellent": 100, "Good": 80, "Fair": 60, "Under Observation": 40, "Poor": 20}
+# Animals in these conditions count as standing stock, i.e. fit to sell
+STANDING_HEALTH = ("Excellent", "Good", "Fair")
+WORKLOAD_WEEKS = 26  # how far ahead the vaccination workload looks
+MAX_WORKLOAD_GROUPS = 10  # workload rows; the quietest groups beyond this are merged into "Other"
+
+
+def health_percentage(health_counts, count):
+    scored = sum(n * HEALTH_WEIGHTS.get(status, 0) for status, n in health_counts.items())
+    return round(scored / count) if count else 0
+
+
+class DashboardMetrics:
+    """Every number the dashboard shows, computed in one pass over the data files.
+
+    Use ``DashboardMetrics.current()``: it returns the cached snapshot while
+    the livestock and sales files are unchanged, so opening or refreshing the
+    dashboard parses nothing unless something was written.
+    """
+
+    _cached = None
+
+    def __init__(self, livestock, rollup, version=None, signature=None, history=None):
+        self.version = version
+        self.signature = signature  # file signatures; unlike version, valid across restarts
+        self.rollup = rollup
+        self.history = history or herd_history.HerdHistory()
+
+        type_counts = {}
+        health_counts = {}
+        for animal in livestock:
+            animal_type = animal.get("type", "Unknown")
+            type_counts[animal_type] = type_counts.get(animal_type, 0) + 1
+            health = animal.get("health", "Unknown")
+            health_counts[health] = health_counts.get(health, 0) + 1
+
+        self.livestock_count = len(livestock)
+        self.type_counts = type_counts
+        self.health_counts = health_counts
+        self.health_percentage = health_percentage(health_counts, len(livestock))
+        self.standing_stock = sum(health_counts.get(status, 0) for status in STANDING_HEALTH)
+
+        self.revenue = rollup.totals[0]
+
+        # Parsed once per data version; the weekly binning against today is done per view
+        self.vaccination_due = parse_date_ordinals([a.get("next_vaccination", "") for a in livestock])
+        self.vaccination_groups = {
+            "type": group_codes([a.get("type", "") or "Unknown" for a in livestock]),
+            "location": group_codes([a.get("location", "") or "Unassigned" for a in livestock]),
+        }
+
+    @classmethod
+    def current(cls):
+        """Return the snapshot for the data on disk, recomputing it only if a file changed"""
+        version = storage.data_version(LIVESTOCK_FILE, SALES_FILE)
+        if cls._cached is None or cls._cached.version != version:
+            signature = (storage.file_signature(LIVESTOCK_FILE), storage.file_signature(SALES_FILE))
+            cls._cached = cls(cls.read_livestock(), SalesRollup.load(SALES_FILE), version,
+                              None if None in signature else signature)
+        return cls._cached
+
+    @classmethod
+    def capture_herd(cls):
+        """Record today's herd snapshot from the file on disk (a write; run it off the Tk thread)"""
+        herd_history.capture(cls.read_livestock())
+
+    @staticmethod
+    def read_livestock():
+        if os.path.exists(LIVESTOCK_FILE):
+            with open(LIVESTOCK_FILE, "r") as f:
+                return json.load(f).get("livestock", [])
+        return []
+
+    def livestock_distribution(self):
+        """Return (categories, counts) for the distribution chart"""
+        return list(self.type_counts), list(self.type_counts.values())
+
+    def view(self, start=None, end=None):
+        """The dashboard numbers for sales between two ISO dates and the herd as of the end date"""
+        return DashboardView(self, start, end)
+
+
+class DashboardView:
+    """DashboardMetrics scoped to a date range.
+
+    Sales figures come from the rollup's day-by-species prefix sums and the
+    herd from the HerdHistory snapshot at the end of the range (the live
+    herd when the range runs to today), so no raw record is rescanned. The
+    herd values are None when the range ends before the first snapshot.
+    """
+
+    def __init__(self, metrics, start=None, end=None):
+        self.start, self.end = start, end
+        self.metrics = metrics
+        self.rollup = metrics.rollup
+        # The day is part of the version: what counts as current and as due moves with it
+        self.today = date.today()
+        self.version = (metrics.version, start, end, self.today)
+        self.signature = None if metrics.signature is None else (metrics.signature, start, end, self.today)
+
+        type_counts, health_counts = metrics.type_counts, metrics.health_counts
+        self.is_current = end is None or end >= self.today.isoformat()
+        if not self.is_current:
+            snapshot = metrics.history.at(end)
+            type_counts, health_counts = snapshot or (None, None)
+
+        if type_counts is None:
+            self.type_counts = {}
+            self.livestock_count = self.health_percentage = self.standing_stock = None
+        else:
+            self.type_counts = type_counts
+            self.livestock_count = sum(type_counts.values())
+            self.health_percentage = health_percentage(health_counts, self.livestock_count)
+            self.standing_stock = sum(health_counts.get(status, 0) for status in STANDING_HEALTH)
+
+        self.revenue = metrics.rollup.window_summary(start, end)[0]
+        resolution, buckets, totals = metrics.rollup.window_buckets(start, end)
+        self.sales_trend = ([format_bucket(bucket, resolution) for bucket in buckets], totals.tolist())
+        self.last_bucket = buckets[-1] if len(buckets) else None
+        # A forecast continues monthly buckets that run up to the present
+        self.show_forecast = resolution == MONTH and self.is_current
+
+        days, head_counts, by_health, _ = metrics.history.trend(start, end)
+        weights = np.array([HEALTH_WEIGHTS.get(status, 0) for status in metrics.history.healths], dtype=float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            health = np.where(head_counts > 0, by_health @ weights / head_counts, 0)
+        self.herd_trend = ([format_bucket(day, DAY) for day in days], head_counts.tolist(), health.round(1).tolist())
+
+    def livestock_distribution(self):
+        return list(self.type_counts), list(self.type_counts.values())
+
+    def vaccination_workload(self, by="type"):
+        """Vaccinations due per week from today, one row per species ("type") or "location".
+
+        Returns (week labels, group names, rows of counts, overdue). Groups
+        with nothing due are left out. The workload always looks ahead from
+        today, whatever range the view covers.
+        """
+        groups, codes = self.metrics.vaccination_groups[by]
+        counts, overdue = weekly_counts(self.metrics.vaccination_due, codes, len(groups), WORKLOAD_WEEKS, self.today)
+        totals = counts.sum(axis=1)
+        order = [i for i in np.argsort(-totals, kind="stable") if totals[i]]
+        rows = [counts[i].tolist() for i in order[:MAX_WORKLOAD_GROUPS]]
+        names = [groups[i] for i in order[:MAX_WORKLOAD_GROUPS]]
+        if len(order) > MAX_WORKLOAD_GROUPS:
+            rows.append(counts[order[MAX_WORKLOAD_GROUPS:]].sum(axis=0).tolist())
+            names.append("Other")
+        labels = [format_bucket(day, WEEK) for day in week_starts(WORKLOAD_WEEKS, self.today)]
+        return labels, names, rows, overdue
+
+
+class KPIEngine:
+    """Running dashboard KPIs kept current from data change events.
+
+    Counters start from the cached DashboardMetrics snapshot and are then
+    adjusted by "livestock" events (``added``, ``removed`` or ``reloaded``
+    record lists; an edit is the old copy removed and the record added) and
+    "sales" events (the new ``revenue``). After each change a "kpi" event is
+    published, so reading a KPI is always O(1).
+    """
+
+    _instance = None
+
+    @classmethod
+    def instance(cls, metrics=None):
+        """Return the shared engine, seeding it from ``metrics`` (or the current snapshot) on first use"""
+        if cls._instance is None:
+            cls._instance = cls(metrics or DashboardMetrics.current())
+        return cls._instance
+
+    def __init__(self, metrics):
+        self.livestock_count = metrics.livestock_count
+        self.type_counts = dict(metrics.type_counts)
+        self.health_counts = dict(metrics.health_counts)
+        self.standing_stock = metrics.standing_stock
+        self.revenue = metrics.revenue
+        events.subscribe("livestock", self.on_livestock)
+        events.subscribe("sales", self.on_sales)
+
+    @property
+    def health_percentage(self):
+        return health_percentage(self.health_counts, self.livestock_count)
+
+    def count(self, animal, sign):
+        animal_type = animal.get("type", "Unknown")
+        health = animal.get("health", "Unknown")
+        self.livestock_count += sign
+        self.type_counts[animal_type] = self.type_counts.get(animal_type, 0) + sign
+        if not self.type_counts[animal_type]:
+            del self.type_counts[animal_type]
+        self.health_counts[health] = self.health_counts.get(health, 0) + sign
+        if health in STANDING_HEALTH:
+            self.standing_stock += sign
+
+    def on_livestock(self, added=(), removed=(), reloaded=None):
+        if reloaded is not None:
+            self.livestock_count = self.standing_stock = 0
+            self.type_counts, self.health_counts = {}, {}
+            added = reloaded
+        for animal in removed:
+            self.count(animal, -1)
+        for animal in added:
+            self.count(animal, 1)
+        events.publish("kpi", engine=self)
+
+    def on_sales(self, revenue):
+        self.revenue = revenue
+        events.publish("kpi", engine=self)
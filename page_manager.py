@@ -0,0 +1,96 @@
+"""
+Page manager module for the Dashboard App
+Contains the PageManager that keeps built pages alive between navigations
+"""
+
+import tkinter as tk
+from collections import OrderedDict
+from storage import data_version
+
+
+class PageManager:
+    """Builds each page once and shows or hides its frame on navigation.
+
+    Pages are kept in least-recently-used order and the oldest hidden page is
+    destroyed once more than ``max_pages`` are alive. A page whose data files
+    changed while it was hidden is refreshed when it is shown again: through
+    its ``on_data_changed()`` method if it has one, otherwise by rebuilding it.
+    """
+
+    def __init__(self, parent, max_pages=4):
+        self.parent = parent
+        self.max_pages = max(1, max_pages)
+        self.factories = {}       # name -> (factory, data files)
+        self.pages = OrderedDict()  # name -> {"frame", "page", "version"}
+        self.current = None
+
+    def register(self, name, factory, data_files=()):
+        """Register a page; ``factory(frame)`` builds it into its own frame"""
+        self.factories[name] = (factory, tuple(data_files))
+
+    def show(self, name):
+        if name not in self.factories:
+            raise KeyError(name)
+
+        if self.current and self.current in self.pages:
+            current = self.pages[self.current]
+            current["frame"].pack_forget()
+            # A visible page already reflects its own writes, so only changes
+            # made after this point should trigger a refresh
+            current["version"] = self.version(self.current)
+
+        entry = self.pages.get(name)
+        if entry is None:
+            entry = self.build(name)
+        elif entry["version"] != self.version(name):
+            entry = self.refresh(name)
+
+        self.current = name
+        self.pages.move_to_end(name)
+        entry["frame"].pack(fill=tk.BOTH, expand=True)
+        self.evict()
+        return entry["page"]
+
+    def version(self, name):
+        return data_version(*self.factories[name][1])
+
+    def build(self, name):
+        factory, _ = self.factories[name]
+        frame = tk.Frame(self.parent, bg=self.parent.cget("bg"))
+        entry = {"frame": frame, "page": None, "version": self.version(name)}
+        self.pages[name] = entry
+        entry["page"] = factory(frame)
+        return entry
+
+    def refresh(self, name):
+        entry = self.pages[name]
+        on_data_changed = getattr(entry["page"], "on_data_changed", None)
+        if on_data_changed is None:
+            self.discard(name)
+            return self.build(name)
+        entry["version"] = self.version(name)
+        on_data_changed()
+        return entry
+
+    def discard(self, name):
+        entry = self.pages.pop(name, None)
+        if entry:
+            entry["frame"].destroy()
+        if self.current == name:
+            self.current = None
+
+    def evict(self):
+        """Destroy least recently used hidden pages beyond the limit"""
+        for name in list(self.pages):
+            if len(self.pages) <= self.max_pages:
+                break
+            if name != self.current:
+                self.discard(name)
+
+    def get(self, name):
+        entry = self.pages.get(name)
+        return entry["page"] if entry else None
+
+    def clear(self):
+        for name in list(self.pages):
+            self.discard(name)
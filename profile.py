@@ -136,6 +136,13 @@ class ProfilePage:
             fg=Theme.TEXT_GRAY
         ).pack()
 
+    def on_data_changed(self):
+        """Reload the profile when the data file changed while this page was hidden"""
+        self.data_manager.load_data()
+        self.profile_entries = {}
+        self.profile_image_path = self.data_manager.get_profile().get("image", "default_profile.png")
+        self.show()
+
     def display_profile_image(self):
         try:
             image = Image.open(self.profile_image_path).convert("RGBA")
@@ -0,0 +1,78 @@
+"""
+Range selector module for the Dashboard App
+Contains the RangeSelector bar that picks the period the dashboard covers
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+from theme import Theme
+from date_ranges import DASHBOARD_RANGES, CUSTOM_RANGE, preset_range, iso_date
+
+
+class RangeSelector:
+    """A preset combobox plus From/To boxes for a custom range.
+
+    ``on_change(start, end, label)`` is called with ISO dates (None for an
+    open end) whenever a preset is picked or a custom range is entered.
+    Text typed in the boxes takes effect only once Enter has checked it.
+    """
+
+    def __init__(self, parent, on_change, preset=DASHBOARD_RANGES[0]):
+        self.on_change = on_change
+        self.range = preset_range(preset)
+        self.label = preset
+        self.create_bar(parent, preset)
+
+    def create_bar(self, parent, preset):
+        self.frame = tk.Frame(parent, bg=Theme.BG_WHITE)
+        self.frame.pack(fill=tk.X, padx=Theme.PADDING_LARGE)
+
+        label_style = {"bg": Theme.BG_WHITE, "fg": Theme.TEXT_DARK, "font": Theme.get_font(Theme.FONT_SIZE_MEDIUM)}
+
+        tk.Label(self.frame, text="Period:", **label_style).pack(side=tk.LEFT)
+        self.range_var = tk.StringVar(value=preset)
+        range_combo = ttk.Combobox(self.frame, textvariable=self.range_var, width=14,
+                                   values=DASHBOARD_RANGES + [CUSTOM_RANGE], state="readonly")
+        range_combo.pack(side=tk.LEFT, padx=(Theme.PADDING_SMALL, Theme.PADDING_MEDIUM))
+        range_combo.bind("<<ComboboxSelected>>", lambda e: self.apply_preset())
+
+        # Custom range; Enter in either box applies it
+        start, end = self.range
+        tk.Label(self.frame, text="From:", **label_style).pack(side=tk.LEFT)
+        self.from_var = tk.StringVar(value=start or "")
+        from_entry = tk.Entry(self.frame, textvariable=self.from_var, width=11)
+        from_entry.pack(side=tk.LEFT, padx=(Theme.PADDING_SMALL, Theme.PADDING_MEDIUM))
+
+        tk.Label(self.frame, text="To:", **label_style).pack(side=tk.LEFT)
+        self.to_var = tk.StringVar(value=end or "")
+        to_entry = tk.Entry(self.frame, textvariable=self.to_var, width=11)
+        to_entry.pack(side=tk.LEFT, padx=(Theme.PADDING_SMALL, 0))
+
+        for entry in (from_entry, to_entry):
+            entry.bind("<Return>", lambda e: self.apply_custom_range())
+
+    def selection(self):
+        """The last applied (start, end, label)"""
+        return (*self.range, self.label)
+
+    def apply_preset(self):
+        if self.range_var.get() == CUSTOM_RANGE:
+            return
+        self.set_range(preset_range(self.range_var.get()), self.range_var.get())
+
+    def apply_custom_range(self):
+        try:
+            start, end = (iso_date(value) if value.strip() else None
+                          for value in (self.from_var.get(), self.to_var.get()))
+        except ValueError:
+            messagebox.showerror("Error", "Please enter dates in YYYY-MM-DD format.")
+            return
+        self.range_var.set(CUSTOM_RANGE)
+        self.set_range((start, end), f"{start or '…'} to {end or '…'}")
+
+    def set_range(self, date_range, label):
+        self.range = date_range
+        self.label = label
+        self.from_var.set(date_range[0] or "")
+        self.to_var.set(date_range[1] or "")
+        self.on_change(*self.selection())
@@ -0,0 +1,78 @@
+"""
+Render service module for the Dashboard App
+Contains the process pool that rasterizes dashboard charts outside the Tk process
+"""
+
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+DPI = 100
+MAX_WORKERS = 4
+FIGURES = {"sales_trend": "SalesTrendFigure", "distribution": "DistributionFigure",
+           "herd_trend": "HerdTrendFigure", "vaccinations": "VaccinationHeatmapFigure"}
+
+_pool = None
+_figures = {}  # chart name -> ChartFigure, kept by each process that renders
+_inline_lock = threading.Lock()
+
+
+def pool():
+    """The shared render pool, started on first use"""
+    global _pool
+    if _pool is None:
+        # spawn rather than fork: a forked copy of a process running Tk is not safe to use
+        _pool = ProcessPoolExecutor(max_workers=min(MAX_WORKERS, os.cpu_count() or 1),
+                                    mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def shutdown():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def render_chart(name, data, colors, size, dpi=DPI):
+    """Update one chart's figure with ``data`` and return (width, height, RGBA bytes).
+
+    Runs in a pool process, where matplotlib draws with Agg and never sees Tk.
+    Each process keeps the figures it has built, so later renders only update
+    their artists.
+    """
+    import chart_rendering
+    fig = _figures.get(name)
+    if fig is None or fig.colors != colors or fig.dpi != dpi:
+        chart_rendering.apply_style(colors)
+        fig = _figures[name] = getattr(chart_rendering, FIGURES[name])(colors, size, dpi)
+    fig.resize(size)
+    fig.update(*data)
+    return fig.rasterize()
+
+
+def render_charts(jobs, colors, dpi=DPI):
+    """Render (name, data, size) jobs in parallel, yielding (name, raster) as each finishes.
+
+    If the pool cannot be used the remaining charts are rendered in this
+    process instead, one at a time.
+    """
+    jobs = list(jobs)
+    done = set()
+    try:
+        executor = pool()
+        futures = {executor.submit(render_chart, name, data, colors, size, dpi): name
+                   for name, data, size in jobs}
+        for future in as_completed(futures):
+            name = futures[future]
+            done.add(name)
+            yield name, future.result()
+    except (BrokenProcessPool, OSError):
+        shutdown()
+        for name, data, size in jobs:
+            if name not in done:
+                with _inline_lock:
+                    raster = render_chart(name, data, colors, size, dpi)
+                yield name, raster
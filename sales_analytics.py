@@ -0,0 +1,155 @@
+"""
+Sales analytics module for the Dashboard App
+Contains the SalesAnalytics engine that computes vectorized reports over the sales ledger
+"""
+
+from collections import OrderedDict
+import numpy as np
+from date_ranges import iso_date
+
+PERCENTILES = (10, 50, 90)
+MOVING_AVERAGE_DAYS = (7, 30)
+
+
+def day_numbers(dates):
+    """Days since 1970-01-01 for a list of ISO date strings"""
+    try:
+        return np.array(dates, dtype="datetime64[D]").astype(np.int64)
+    except ValueError:
+        # An unpadded date saved before entered dates were stored in ISO form
+        return np.array([iso_date(value) for value in dates], dtype="datetime64[D]").astype(np.int64)
+
+
+def moving_average(values, window):
+    """Trailing moving average; the first days average over what is available"""
+    sums = np.cumsum(np.concatenate(([0.0], values)))
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - window, 0)
+    return (sums[ends] - sums[starts]) / (ends - starts)
+
+
+class SalesAnalytics:
+    """Revenue and volume by species per month, price per head and moving averages.
+
+    The ledger is held as NumPy columns (day number, species code, price,
+    quantity, total), so every report is a handful of bincounts and sorts
+    rather than a loop over sales. New sales are appended to the columns;
+    edits and deletes rebuild them. Reports are cached per window until the
+    ledger changes.
+    """
+
+    CACHE_SIZE = 8
+
+    def __init__(self, ledger):
+        self.ledger = ledger
+        self.species = {}  # name -> code
+        self.columns = None
+        self.pending = []
+        self.cache = OrderedDict()
+        ledger.subscribe(self.on_ledger_changed)
+
+    def on_ledger_changed(self, event, sale):
+        if event == "add" and self.columns is not None:
+            self.pending.append(sale)
+        elif event == "add_batch" and self.columns is not None:
+            self.pending.extend(sale)
+        else:
+            self.columns = None
+            self.pending = []
+        self.cache.clear()
+
+    def encode(self, sales):
+        codes = self.species
+        return {
+            "day": day_numbers([sale["date"] for sale in sales]),
+            "species": np.fromiter((codes.setdefault(sale["animal"], len(codes)) for sale in sales),
+                                   dtype=np.int64, count=len(sales)),
+            "price": np.fromiter((sale["price"] for sale in sales), dtype=float, count=len(sales)),
+            "quantity": np.fromiter((sale["quantity"] for sale in sales), dtype=float, count=len(sales)),
+            "total": np.fromiter((sale["total"] for sale in sales), dtype=float, count=len(sales)),
+        }
+
+    def get_columns(self):
+        if self.columns is None:
+            self.species = {}
+            self.columns = self.encode(self.ledger.sales)
+        elif self.pending:
+            added = self.encode(self.pending)
+            self.columns = {key: np.concatenate((self.columns[key], added[key])) for key in self.columns}
+        self.pending = []
+        return self.columns
+
+    def report(self, start=None, end=None, animal=None):
+        """Return the report for sales between two ISO dates (inclusive), optionally of one species"""
+        key = (start, end, animal)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        result = self.compute(self.get_columns(), start, end, animal)
+        self.cache[key] = result
+        while len(self.cache) > self.CACHE_SIZE:
+            self.cache.popitem(last=False)
+        return result
+
+    def compute(self, columns, start, end, animal):
+        names = sorted(self.species, key=self.species.get)
+        mask = np.ones(len(columns["day"]), dtype=bool)
+        if start is not None:
+            mask &= columns["day"] >= np.datetime64(start, "D").astype(np.int64)
+        if end is not None:
+            mask &= columns["day"] <= np.datetime64(end, "D").astype(np.int64)
+        if animal is not None:
+            mask &= columns["species"] == self.species.get(animal, -1)
+
+        day = columns["day"][mask]
+        species = columns["species"][mask]
+        price = columns["price"][mask]
+        quantity = columns["quantity"][mask]
+        total = columns["total"][mask]
+        if len(day) == 0:
+            return None
+
+        # Revenue and volume by species per month, as (months x species) grids
+        month = day.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        first_month = month.min()
+        month_count = int(month.max() - first_month) + 1
+        cells = (month - first_month) * len(names) + species
+        size = month_count * len(names)
+        revenue = np.bincount(cells, weights=total, minlength=size).reshape(month_count, len(names))
+        volume = np.bincount(cells, weights=quantity, minlength=size).reshape(month_count, len(names))
+
+        # Price per head: revenue over head sold, and percentile bands of the unit price
+        species_revenue = revenue.sum(axis=0)
+        species_volume = volume.sum(axis=0)
+        sales_count = np.bincount(species, minlength=len(names))
+        rows = []
+        for code, name in enumerate(names):
+            if not sales_count[code]:
+                continue
+            # percentile partitions rather than sorts, which beats one lexsort for a few species
+            bands = np.percentile(price[species == code], PERCENTILES)
+            rows.append({
+                "species": name,
+                "sales": int(sales_count[code]),
+                "revenue": species_revenue[code],
+                "head": int(species_volume[code]),
+                "price_per_head": species_revenue[code] / species_volume[code],
+                "percentiles": dict(zip(PERCENTILES, bands)),
+            })
+
+        # Daily revenue over every calendar day in the window, with moving averages
+        first_day = day.min()
+        daily = np.bincount(day - first_day, weights=total)
+        keep = np.flatnonzero(revenue.any(axis=0))
+
+        return {
+            "species": [names[code] for code in keep],
+            "months": np.arange(first_month, first_month + month_count).astype("datetime64[M]"),
+            "revenue": revenue[:, keep],
+            "volume": volume[:, keep],
+            "price_per_head": rows,
+            "days": np.arange(first_day, first_day + len(daily)).astype("datetime64[D]"),
+            "daily": daily,
+            "moving_averages": {window: moving_average(daily, window) for window in MOVING_AVERAGE_DAYS},
+        }
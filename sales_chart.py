@@ -0,0 +1,203 @@
+"""
+Sales chart module for the Dashboard App
+Contains the SalesTrendChart canvas widget used on the sales page
+"""
+
+import tkinter as tk
+import numpy as np
+from theme import Theme
+from downsampling import choose_resolution, resample, lttb, thin_labels, format_bucket, DAY, WEEK
+
+
+class SalesTrendChart:
+    """Line chart of daily sales totals drawn on a Tk canvas.
+
+    Every canvas item is created once and then moved with ``canvas.coords``;
+    markers and x-axis labels come from pools that only grow. Resizes are
+    debounced, and an item is only touched when its coordinates or text
+    actually changed, so a new sale moves a handful of items instead of
+    redrawing the chart.
+    """
+
+    MARGIN = 40
+    Y_STEPS = 5
+    PIXELS_PER_POINT = 4
+    MARKER_SPACING = 12
+    LABEL_SPACING = 50
+    RESIZE_DELAY = 60  # ms
+
+    def __init__(self, parent, bg=None, height=300):
+        self.canvas = tk.Canvas(parent, bg=bg or Theme.BG_WHITE, height=height, highlightthickness=0)
+        self.dates, self.totals = [], []
+        self.forecast = None
+        self.sampled = None
+        self.sampled_width = None
+        self.pending = None
+        self.drawn = {}  # item -> last coords or text, to skip no-op updates
+
+        canvas = self.canvas
+        self.message = canvas.create_text(0, 0, text="", fill=Theme.TEXT_GRAY,
+                                          font=Theme.get_font(Theme.FONT_SIZE_MEDIUM))
+        self.x_axis = canvas.create_line(0, 0, 0, 0, fill=Theme.TEXT_GRAY, width=2)
+        self.y_axis = canvas.create_line(0, 0, 0, 0, fill=Theme.TEXT_GRAY, width=2)
+        self.y_labels = [
+            (canvas.create_text(0, 0, text="", fill=Theme.TEXT_GRAY, font=("Arial", 8)),
+             canvas.create_line(0, 0, 0, 0, fill=Theme.TEXT_GRAY))
+            for _ in range(self.Y_STEPS + 1)
+        ]
+        self.line = canvas.create_line(0, 0, 0, 0, fill=Theme.PRIMARY_GREEN, width=3, smooth=True)
+        self.forecast_line = canvas.create_line(0, 0, 0, 0, fill=Theme.PRIMARY_GREEN, width=2, dash=(6, 4))
+        self.markers = []
+        self.x_labels = []
+
+        canvas.bind("<Configure>", self.on_configure)
+
+    def pack(self, **kwargs):
+        self.canvas.pack(**kwargs)
+
+    def set_data(self, dates, totals, forecast=None):
+        """Show a daily series (dates oldest first and their totals).
+
+        ``forecast`` is an optional (month starts, monthly totals) pair drawn
+        as a dashed continuation of the line.
+        """
+        self.dates, self.totals = dates, totals
+        self.forecast = forecast
+        self.sampled = None
+        self.redraw()
+
+    def forecast_points(self, resolution):
+        """Forecast as (day numbers, values) on the same scale as the resampled series"""
+        months, totals = self.forecast
+        starts = months.astype("datetime64[D]").astype(np.int64)
+        lengths = (months + 1).astype("datetime64[D]").astype(np.int64) - starts
+        if resolution == DAY:
+            return starts + lengths // 2, totals / lengths
+        if resolution == WEEK:
+            return starts + lengths // 2, totals * 7 / lengths
+        return starts, totals
+
+    def on_configure(self, event):
+        if self.pending is not None:
+            self.canvas.after_cancel(self.pending)
+        self.pending = self.canvas.after(self.RESIZE_DELAY, self.redraw)
+
+    def sample(self, chart_width):
+        """Return (resolution, bucket dates, bucket days, totals), downsampled for a plot width"""
+        if self.sampled is None or self.sampled_width != chart_width:
+            resolution = choose_resolution(self.dates[0], self.dates[-1], chart_width)
+            buckets, totals = resample(self.dates, self.totals, resolution)
+            days = buckets.astype(np.int64)
+            keep = lttb(days, totals, max(3, chart_width // self.PIXELS_PER_POINT))
+            self.sampled = (resolution, buckets[keep], days[keep], totals[keep])
+            self.sampled_width = chart_width
+        return self.sampled
+
+    def move(self, item, *coords):
+        coords = tuple(coords)
+        if self.drawn.get(item) != coords:
+            self.canvas.coords(item, *coords)
+            self.drawn[item] = coords
+        self.show(item, True)
+
+    def set_text(self, item, text):
+        if self.drawn.get((item, "text")) != text:
+            self.canvas.itemconfig(item, text=text)
+            self.drawn[(item, "text")] = text
+
+    def show(self, item, visible):
+        state = "normal" if visible else "hidden"
+        if self.drawn.get((item, "state")) != state:
+            self.canvas.itemconfig(item, state=state)
+            self.drawn[(item, "state")] = state
+
+    def hide_all(self):
+        for item in self.canvas.find_all():
+            self.show(item, False)
+
+    def show_message(self, width, height, text):
+        self.hide_all()
+        self.set_text(self.message, text)
+        self.move(self.message, width / 2, height / 2)
+
+    def pooled(self, pool, count, create):
+        """Make sure a pool has ``count`` items, hide the rest and return the ones in use"""
+        while len(pool) < count:
+            pool.append(create())
+        for item in pool[count:]:
+            self.show(item, False)
+        return pool[:count]
+
+    def redraw(self):
+        self.pending = None
+        try:
+            width = self.canvas.winfo_width()
+            height = self.canvas.winfo_height()
+        except tk.TclError:
+            return  # Canvas was destroyed while a resize was pending
+        if width <= 1 or height <= 1:
+            return  # Not mapped yet; <Configure> will call back
+
+        margin = self.MARGIN
+        chart_width = width - 2 * margin
+        chart_height = height - 2 * margin
+
+        if len(self.dates) == 0:
+            self.show_message(width, height, "No sales data available")
+            return
+
+        resolution, buckets, days, totals = self.sample(chart_width)
+        data_points = totals / 1000000  # Convert to millions
+        if len(data_points) < 2:
+            self.show_message(width, height, "Need at least 2 data points for chart")
+            return
+        self.show(self.message, False)
+
+        if self.forecast is not None:
+            forecast_days, forecast_values = self.forecast_points(resolution)
+            forecast_points = forecast_values / 1000000
+        else:
+            forecast_days, forecast_points = days[:0], data_points[:0]
+
+        # Axes
+        self.move(self.x_axis, margin, height - margin, width - margin, height - margin)
+        self.move(self.y_axis, margin, margin, margin, height - margin)
+
+        # Y-axis labels
+        peak = max(data_points.max(), forecast_points.max(initial=0))
+        scale_factor = max(peak, 0.001) * 1.1  # Add 10% padding
+        for i, (label, tick) in enumerate(self.y_labels):
+            y = height - margin - (i * chart_height / self.Y_STEPS)
+            self.set_text(label, f"₦{i * scale_factor / self.Y_STEPS:.1f}M")
+            self.move(label, margin - 15, y)
+            self.move(tick, margin - 3, y, margin + 3, y)
+
+        # Points are placed by date, so gaps in the history stay visible
+        last_day = max(days[-1], forecast_days.max(initial=days[-1]))
+        span = max(last_day - days[0], 1)
+        xs = margin + (days - days[0]) * chart_width / span
+        ys = height - margin - (data_points * chart_height / scale_factor)
+        self.move(self.line, *np.column_stack((xs, ys)).ravel().tolist())
+
+        # Forecast continues the line from the last actual point
+        if len(forecast_days):
+            fxs = np.concatenate(([xs[-1]], margin + (forecast_days - days[0]) * chart_width / span))
+            fys = np.concatenate(([ys[-1]], height - margin - (forecast_points * chart_height / scale_factor)))
+            self.move(self.forecast_line, *np.column_stack((fxs, fys)).ravel().tolist())
+        else:
+            self.show(self.forecast_line, False)
+
+        # Markers only while they are far enough apart to tell apart
+        count = len(xs) if chart_width / len(xs) >= self.MARKER_SPACING else 0
+        markers = self.pooled(self.markers, count, lambda: self.canvas.create_oval(
+            0, 0, 0, 0, fill=Theme.PRIMARY_GREEN, outline=Theme.PRIMARY_GREEN, width=2))
+        for item, x, y in zip(markers, xs, ys):
+            self.move(item, x - 4, y - 4, x + 4, y + 4)
+
+        # X-axis labels, skipping any that would overlap
+        shown = thin_labels(xs, self.LABEL_SPACING)
+        labels = self.pooled(self.x_labels, len(shown), lambda: self.canvas.create_text(
+            0, 0, text="", fill=Theme.TEXT_GRAY, font=("Arial", 8)))
+        for item, i in zip(labels, shown):
+            self.set_text(item, format_bucket(buckets[i], resolution))
+            self.move(item, xs[i], height - margin + 15)
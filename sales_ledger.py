@@ -0,0 +1,212 @@
+"""
+Sales ledger module for the Dashboard App
+Contains the SalesLedger that owns the sales records, their rollup and persistence
+"""
+
+import json
+import math
+import os
+from bisect import bisect_left, bisect_right, insort
+import events
+import storage
+from sales_rollup import SalesRollup, sale_day
+
+SALES_FILE = "sales_data.json"
+
+SAMPLE_SALES = [
+    {"id": 1, "animal": "Cattle", "price": 500000, "quantity": 5, "date": "2025-06-15", "total": 2500000},
+    {"id": 2, "animal": "Goat", "price": 200000, "quantity": 10, "date": "2025-06-18", "total": 2000000},
+    {"id": 3, "animal": "Sheep", "price": 250000, "quantity": 8, "date": "2025-06-20", "total": 2000000},
+    {"id": 4, "animal": "Chicken", "price": 25000, "quantity": 11, "date": "2025-06-25", "total": 275000},
+]
+
+
+class SalesLedger:
+    """The sales records plus the indexes and rollup derived from them.
+
+    All changes go through ``add``, ``update`` and ``delete``, which keep the
+    rollup and the date index in step, save the ledger and then notify
+    subscribers with ``callback(event, sale)`` where event is one of "add",
+    "update", "delete" or "reload", or "add_batch" with the list of sales
+    that ``commit_sales`` added. Records are never mutated in place; an
+    update swaps in a new dict, so views can tell changed rows by identity.
+    """
+
+    def __init__(self, path=SALES_FILE, create_sample=True):
+        self.path = path
+        self.create_sample = create_sample
+        self.subscribers = []
+        self.load()
+
+    def load(self):
+        """Read the ledger from disk, creating the sample ledger if there is none (and that is wanted)"""
+        self.data = None
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    self.data = json.load(f)
+            except (OSError, ValueError):
+                pass
+        if self.data is None and self.create_sample:
+            self.data = {"sales": [dict(sale) for sale in SAMPLE_SALES]}
+            self.save()
+        elif self.data is None:
+            self.data = {"sales": []}
+
+        self.sales = self.data.setdefault("sales", [])
+        self.by_id = {sale["id"]: sale for sale in self.sales}
+        self.next_id = max(self.by_id, default=0) + 1
+        self.build_index()
+        self.rollup = SalesRollup.load(self.path, self.sales)
+
+    def build_index(self):
+        """Sort (ISO date, id) keys, overall and per species, so ranges need no re-sorting.
+
+        Sales whose date cannot be parsed are left out of the index, and so
+        out of every date range, the same as they are left out of the rollup.
+        """
+        keys = [(sale_day(sale), sale["id"]) for sale in self.sales]
+        skipped = [sale_id for day, sale_id in keys if day is None]
+        if skipped:
+            print(f"Skipping sales with unreadable dates: {skipped}")
+        self.order = sorted(key for key in keys if key[0] is not None)
+        self.order_by_animal = {}
+        for key in self.order:
+            self.order_by_animal.setdefault(self.by_id[key[1]]["animal"], []).append(key)
+
+    def index_add(self, sale):
+        key = (sale_day(sale), sale["id"])
+        if key[0] is None:
+            return
+        insort(self.order, key)
+        insort(self.order_by_animal.setdefault(sale["animal"], []), key)
+
+    def index_remove(self, sale):
+        key = (sale_day(sale), sale["id"])
+        if key[0] is None:
+            return
+        self.order.pop(bisect_left(self.order, key))
+        animal_order = self.order_by_animal[sale["animal"]]
+        animal_order.pop(bisect_left(animal_order, key))
+        if not animal_order:
+            del self.order_by_animal[sale["animal"]]
+
+    def save(self):
+        storage.write_json(self.path, self.data)
+        # Keep the rollup stamped with the ledger it matches
+        if hasattr(self, "rollup"):
+            self.rollup.save(self.path)
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def notify(self, event, sale=None):
+        for callback in list(self.subscribers):
+            callback(event, sale)
+        events.publish("sales", revenue=self.rollup.totals[0])
+
+    def get(self, sale_id):
+        return self.by_id.get(sale_id)
+
+    def add(self, animal, price, quantity, date):
+        sale = self.new_sale(animal, price, quantity, date)
+        self.insert(sale)
+        self.save()
+        self.notify("add", sale)
+        return sale
+
+    def new_sale(self, animal, price, quantity, date, total=None, **extra):
+        """Build a sale record with the next free id, without adding it"""
+        sale = {
+            "id": self.next_id,
+            "animal": animal,
+            "price": price,
+            "quantity": quantity,
+            "date": date,
+            "total": price * quantity if total is None else total
+        }
+        sale.update(extra)
+        self.next_id += 1
+        return sale
+
+    def insert(self, sale):
+        self.sales.append(sale)
+        self.by_id[sale["id"]] = sale
+        self.index_add(sale)
+        self.rollup.add(sale)
+
+    def commit_sales(self, sales, other_writes):
+        """Add sales and write other JSON files in one all-or-nothing commit.
+
+        ``other_writes`` maps further paths to their new data (see
+        ``storage.commit_json``). If adding or committing fails the ledger is
+        re-read, so memory never shows sales that are not on disk.
+        Subscribers hear of the batch once.
+        """
+        try:
+            for sale in sales:
+                self.insert(sale)
+            storage.commit_json(dict(other_writes, **{self.path: self.data}))
+        except Exception:
+            self.load()
+            # Views hold indexes into the records load() just replaced
+            self.notify("reload")
+            raise
+        self.rollup.save(self.path)
+        self.notify("add_batch", sales)
+
+    def update(self, sale_id, animal, price, quantity, date):
+        old = self.by_id[sale_id]
+        sale = dict(old, animal=animal, price=price, quantity=quantity, date=date, total=price * quantity)
+        self.sales[self.sales.index(old)] = sale
+        self.by_id[sale_id] = sale
+        if date != old["date"] or animal != old["animal"]:
+            self.index_remove(old)
+            self.index_add(sale)
+        self.rollup.remove(old)
+        self.rollup.add(sale)
+        self.save()
+        self.notify("update", sale)
+        return sale
+
+    def delete(self, sale_id):
+        sale = self.by_id.pop(sale_id)
+        self.sales.remove(sale)
+        self.index_remove(sale)
+        self.rollup.remove(sale)
+        self.save()
+        self.notify("delete", sale)
+        return sale
+
+    def reload(self):
+        """Re-read the ledger after it was changed outside this ledger object"""
+        self.load()
+        self.notify("reload")
+
+    def newest_first(self, start=None, end=None, animal=None):
+        """Newest-first view of the sales between two ISO dates (inclusive), optionally of one species"""
+        order = self.order if animal is None else self.order_by_animal.get(animal, [])
+        lo = 0 if start is None else bisect_left(order, (start,))
+        hi = len(order) if end is None else bisect_right(order, (end, math.inf))
+        return NewestFirst(self.by_id, order, lo, max(lo, hi))
+
+    def animals(self):
+        return sorted(self.order_by_animal)
+
+
+class NewestFirst:
+    """Read-only newest-first view over a slice of the ledger's date index"""
+
+    def __init__(self, by_id, order, start, stop):
+        self.by_id = by_id
+        self.order = order
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.by_id[self.order[self.stop - 1 - index][1]]
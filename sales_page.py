@@ -1,97 +1,42 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import json
-import os
-from datetime import datetime, timedelta
-import random
+from datetime import datetime
+import numpy as np
 from theme import Theme
+from virtual_list import VirtualList
+from sales_chart import SalesTrendChart
+from sales_ledger import SalesLedger, SALES_FILE
+from date_ranges import RANGE_PRESETS, preset_range, iso_date
+from sales_analytics import SalesAnalytics, PERCENTILES
+from forecasting import SalesForecaster
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+
+ALL_ANIMALS = "All animals"
 
 
 class SalesPage:
     def __init__(self, parent_frame, data_manager=None):
         self.parent_frame = parent_frame
         self.data_manager = data_manager
-        self.sales_data = self.load_sales_data()
+        self.ledger = SalesLedger(SALES_FILE)
+        self.analytics = SalesAnalytics(self.ledger)
+        self.forecaster = SalesForecaster(self.ledger.rollup)
+        # (start date, end date, animal) window shown by the cards, chart and list
+        self.filter = (None, None, None)
+        self.date_range = (None, None)  # the last checked From/To dates, in ISO form
         self.create_page()
-
-    def load_sales_data(self):
-        """Load sales data from JSON file or create sample data"""
-        sales_file = "sales_data.json"
-        if os.path.exists(sales_file):
-            try:
-                with open(sales_file, 'r') as f:
-                    return json.load(f)
-            except:
-                pass
-
-        # Create sample data if file doesn't exist
-        return self.create_sample_sales_data()
-
-    def create_sample_sales_data(self):
-        """Create sample sales data"""
-        sample_data = {
-            "sales": [
-                {
-                    "id": 1,
-                    "animal": "Cattle",
-                    "price": 500000,
-                    "quantity": 5,
-                    "date": "2025-06-15",
-                    "total": 2500000
-                },
-                {
-                    "id": 2,
-                    "animal": "Goat",
-                    "price": 200000,
-                    "quantity": 10,
-                    "date": "2025-06-18",
-                    "total": 2000000
-                },
-                {
-                    "id": 3,
-                    "animal": "Sheep",
-                    "price": 250000,
-                    "quantity": 8,
-                    "date": "2025-06-20",
-                    "total": 2000000
-                },
-                {
-                    "id": 4,
-                    "animal": "Chicken",
-                    "price": 25000,
-                    "quantity": 11,
-                    "date": "2025-06-25",
-                    "total": 275000
-                }
-            ]
-        }
-        self.save_sales_data(sample_data)
-        return sample_data
-
-    def save_sales_data(self, data):
-        """Save sales data to JSON file"""
-        try:
-            with open("sales_data.json", 'w') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            print(f"Error saving sales data: {e}")
+        self.ledger.subscribe(self.on_ledger_changed)
+        self.refresh_forecast()
 
     def calculate_totals(self):
         """Calculate total sales, transactions, animals sold, and average sale"""
-        sales = self.sales_data.get("sales", [])
-        if not sales:
-            return 0, 0, 0, 0
-
-        total_sales = sum(sale["total"] for sale in sales)
-        total_transactions = len(sales)
-        total_animals = sum(sale["quantity"] for sale in sales)
-        avg_sale = total_sales / total_transactions if total_transactions > 0 else 0
-
-        return total_sales, total_transactions, total_animals, avg_sale
+        return self.ledger.rollup.window_summary(*self.filter)
 
     def create_page(self):
         """Create the main sales page"""
         self.create_header()
+        self.create_filter_bar()
         self.create_summary_cards()
         self.create_content_area()
 
@@ -126,46 +71,123 @@ class SalesPage:
         )
         add_sale_btn.pack(side=tk.RIGHT)
 
+        # Analytics Button
+        analytics_btn = tk.Button(
+            header_frame,
+            text="📊 Analytics",
+            bg=Theme.BG_LIGHT_GRAY,
+            fg=Theme.TEXT_DARK,
+            font=Theme.get_font(Theme.FONT_SIZE_MEDIUM, "bold"),
+            relief="flat",
+            bd=0,
+            padx=Theme.PADDING_LARGE,
+            pady=Theme.PADDING_SMALL,
+            cursor="hand2",
+            command=self.open_analytics_window
+        )
+        analytics_btn.pack(side=tk.RIGHT, padx=Theme.PADDING_SMALL)
+
         # Hover effects
         add_sale_btn.bind("<Enter>", lambda e: add_sale_btn.config(bg=Theme.DARK_GREEN))
         add_sale_btn.bind("<Leave>", lambda e: add_sale_btn.config(bg=Theme.PRIMARY_GREEN))
 
+    def create_filter_bar(self):
+        """Create the date range and animal filters"""
+        filter_frame = tk.Frame(self.parent_frame, bg=Theme.BG_WHITE)
+        filter_frame.pack(fill=tk.X, padx=Theme.PADDING_LARGE)
+
+        label_style = {"bg": Theme.BG_WHITE, "fg": Theme.TEXT_DARK, "font": Theme.get_font(Theme.FONT_SIZE_MEDIUM)}
+
+        tk.Label(filter_frame, text="Range:", **label_style).pack(side=tk.LEFT)
+        self.range_var = tk.StringVar(value=RANGE_PRESETS[0])
+        range_combo = ttk.Combobox(filter_frame, textvariable=self.range_var, width=14,
+                                   values=RANGE_PRESETS, state="readonly")
+        range_combo.pack(side=tk.LEFT, padx=(Theme.PADDING_SMALL, Theme.PADDING_MEDIUM))
+        range_combo.bind("<<ComboboxSelected>>", lambda e: self.apply_range_preset())
+
+        # Custom range; Enter in either box applies it
+        tk.Label(filter_frame, text="From:", **label_style).pack(side=tk.LEFT)
+        self.from_var = tk.StringVar()
+        from_entry = tk.Entry(filter_frame, textvariable=self.from_var, width=11)
+        from_entry.pack(side=tk.LEFT, padx=(Theme.PADDING_SMALL, Theme.PADDING_MEDIUM))
+
+        tk.Label(filter_frame, text="To:", **label_style).pack(side=tk.LEFT)
+        self.to_var = tk.StringVar()
+        to_entry = tk.Entry(filter_frame, textvariable=self.to_var, width=11)
+        to_entry.pack(side=tk.LEFT, padx=(Theme.PADDING_SMALL, Theme.PADDING_MEDIUM))
+
+        for entry in (from_entry, to_entry):
+            entry.bind("<Return>", lambda e: self.apply_custom_range())
+
+        tk.Label(filter_frame, text="Animal:", **label_style).pack(side=tk.LEFT)
+        self.animal_var = tk.StringVar(value=ALL_ANIMALS)
+        self.animal_combo = ttk.Combobox(filter_frame, textvariable=self.animal_var, width=14, state="readonly")
+        self.animal_combo.pack(side=tk.LEFT, padx=(Theme.PADDING_SMALL, 0))
+        self.animal_combo.bind("<<ComboboxSelected>>", lambda e: self.apply_filters())
+        self.update_animal_choices()
+
+    def update_animal_choices(self):
+        self.animal_combo.config(values=[ALL_ANIMALS] + self.ledger.animals())
+
+    def apply_range_preset(self):
+        self.date_range = preset_range(self.range_var.get())
+        self.from_var.set(self.date_range[0] or "")
+        self.to_var.set(self.date_range[1] or "")
+        self.apply_filters()
+
+    def apply_custom_range(self):
+        try:
+            start, end = (iso_date(value) if value.strip() else None
+                          for value in (self.from_var.get(), self.to_var.get()))
+        except ValueError:
+            messagebox.showerror("Error", "Please enter dates in YYYY-MM-DD format.")
+            return
+        self.date_range = (start, end)
+        self.from_var.set(start or "")
+        self.to_var.set(end or "")
+        self.range_var.set("Custom")
+        self.apply_filters()
+
+    def apply_filters(self):
+        """Show the current window in the cards, chart and list"""
+        animal = self.animal_var.get()
+        # Text typed in the From/To boxes counts only once Enter has checked it
+        self.filter = (*self.date_range, None if animal == ALL_ANIMALS else animal)
+        self.update_summary_cards()
+        self.update_sales_chart()
+        self.update_sales_list()
+
     def create_summary_cards(self):
         """Create summary cards showing key metrics"""
         cards_frame = tk.Frame(self.parent_frame, bg=Theme.BG_WHITE)
         cards_frame.pack(fill=tk.X, padx=Theme.PADDING_LARGE, pady=Theme.PADDING_MEDIUM)
 
-        total_sales, transactions, animals_sold, avg_sale = self.calculate_totals()
-
         # Card data
         cards_data = [
             {
                 "title": "Total Sales",
-                "value": f"₦{total_sales:,}",
                 "icon": "💰",
                 "color": Theme.PRIMARY_GREEN
             },
             {
                 "title": "Transactions",
-                "value": str(transactions),
                 "icon": "📋",
                 "color": Theme.LIGHT_GREEN
             },
             {
                 "title": "Animals Sold",
-                "value": str(animals_sold),
                 "icon": "🐄",
                 "color": Theme.DARK_GREEN
             },
             {
                 "title": "Avg Sale",
-                "value": f"₦{avg_sale:,.0f}",
                 "icon": "📈",
                 "color": Theme.PRIMARY_GREEN
             }
         ]
 
-        # Create cards
+        # Create cards; their values are filled in by update_summary_cards
+        self.card_values = []
         for i, card_data in enumerate(cards_data):
             card_frame = tk.Frame(
                 cards_frame,
@@ -186,12 +208,12 @@ class SalesPage:
 
             value_label = tk.Label(
                 card_frame,
-                text=card_data["value"],
                 bg=Theme.BG_LIGHT_GRAY,
                 fg=Theme.TEXT_DARK,
                 font=Theme.get_font(Theme.FONT_SIZE_LARGE, "bold")
             )
             value_label.pack()
+            self.card_values.append(value_label)
 
             title_label = tk.Label(
                 card_frame,
@@ -202,6 +224,14 @@ class SalesPage:
             )
             title_label.pack(pady=(Theme.PADDING_SMALL, Theme.PADDING_LARGE))
 
+        self.update_summary_cards()
+
+    def update_summary_cards(self):
+        total_sales, transactions, animals_sold, avg_sale = self.calculate_totals()
+        values = [f"₦{total_sales:,}", str(transactions), str(animals_sold), f"₦{avg_sale:,.0f}"]
+        for label, value in zip(self.card_values, values):
+            label.config(text=value)
+
     def create_content_area(self):
         """Create the main content area with chart and sales list"""
         content_frame = tk.Frame(self.parent_frame, bg=Theme.BG_WHITE)
@@ -231,95 +261,21 @@ class SalesPage:
         )
         title_label.pack(pady=Theme.PADDING_MEDIUM)
 
-        # Create canvas for chart
-        chart_canvas = tk.Canvas(
-            parent,
-            bg=Theme.BG_WHITE,
-            height=300,
-            highlightthickness=0
-        )
-        chart_canvas.pack(fill=tk.BOTH, expand=True, padx=Theme.PADDING_MEDIUM, pady=Theme.PADDING_MEDIUM)
-
-        # Draw simple line chart
-        self.draw_sales_chart(chart_canvas)
-
-    def draw_sales_chart(self, canvas):
-        """Draw a simple line chart on the canvas"""
-        canvas.update_idletasks()
-        width = canvas.winfo_width()
-        height = canvas.winfo_height()
+        # The chart keeps its canvas items and redraws itself on resize
+        self.sales_chart = SalesTrendChart(parent, bg=Theme.BG_WHITE, height=300)
+        self.sales_chart.pack(fill=tk.BOTH, expand=True, padx=Theme.PADDING_MEDIUM, pady=Theme.PADDING_MEDIUM)
+        self.update_sales_chart()
 
-        if width <= 1 or height <= 1:
-            canvas.after(100, lambda: self.draw_sales_chart(canvas))
-            return
-
-        # Chart margins
-        margin = 40
-        chart_width = width - 2 * margin
-        chart_height = height - 2 * margin
-
-        # Get actual sales data for chart
-        sales = self.sales_data.get("sales", [])
-        if not sales:
-            # No data message
-            canvas.create_text(width / 2, height / 2, text="No sales data available",
-                               fill=Theme.TEXT_GRAY, font=Theme.get_font(Theme.FONT_SIZE_MEDIUM))
-            return
+    def update_sales_chart(self):
+        start, end, animal = self.filter
+        # The forecast only makes sense when the window runs up to the latest sale
+        forecast = self.forecaster.forecast(animal) if end is None else None
+        self.sales_chart.set_data(*self.ledger.rollup.window_series(*self.filter), forecast=forecast)
 
-        # Sort sales by date and aggregate by date
-        sales_by_date = {}
-        for sale in sales:
-            date = sale["date"]
-            if date not in sales_by_date:
-                sales_by_date[date] = 0
-            sales_by_date[date] += sale["total"]
-
-        # Sort dates and get values
-        sorted_dates = sorted(sales_by_date.keys())
-        data_points = [sales_by_date[date] / 1000000 for date in sorted_dates]  # Convert to millions
-        labels = [date.split('-')[1] + '-' + date.split('-')[2] for date in sorted_dates]  # MM-DD format
-
-        if len(data_points) < 2:
-            canvas.create_text(width / 2, height / 2, text="Need at least 2 data points for chart",
-                               fill=Theme.TEXT_GRAY, font=Theme.get_font(Theme.FONT_SIZE_MEDIUM))
-            return
-
-        # Draw axes
-        canvas.create_line(margin, height - margin, width - margin, height - margin, fill=Theme.TEXT_GRAY, width=2)
-        canvas.create_line(margin, margin, margin, height - margin, fill=Theme.TEXT_GRAY, width=2)
-
-        # Get max value for scaling
-        max_value = max(data_points)
-        scale_factor = max_value * 1.1  # Add 10% padding
-
-        # Draw y-axis labels
-        for i in range(6):
-            y = height - margin - (i * chart_height / 5)
-            value = (i * scale_factor / 5)
-            canvas.create_text(margin - 15, y, text=f"₦{value:.1f}M", fill=Theme.TEXT_GRAY, font=("Arial", 8))
-            canvas.create_line(margin - 3, y, margin + 3, y, fill=Theme.TEXT_GRAY)
-
-        # Draw data line
-        if len(data_points) > 1:
-            points = []
-            for i, point in enumerate(data_points):
-                x = margin + (i * chart_width / (len(data_points) - 1))
-                y = height - margin - (point * chart_height / scale_factor)
-                points.extend([x, y])
-
-                # Draw point
-                canvas.create_oval(x - 4, y - 4, x + 4, y + 4, fill=Theme.PRIMARY_GREEN, outline=Theme.PRIMARY_GREEN,
-                                   width=2)
-
-            # Draw line
-            if len(points) >= 4:
-                canvas.create_line(points, fill=Theme.PRIMARY_GREEN, width=3, smooth=True)
-
-        # Draw x-axis labels
-        for i, label in enumerate(labels):
-            if i < len(data_points):
-                x = margin + (i * chart_width / (len(data_points) - 1))
-                canvas.create_text(x, height - margin + 15, text=label, fill=Theme.TEXT_GRAY, font=("Arial", 8))
+    def refresh_forecast(self):
+        """Fit any missing forecast models in the background, then redraw the chart"""
+        self.forecaster.refresh(self.parent_frame, [None] + self.ledger.animals(),
+                                on_done=self.update_sales_chart)
 
     def create_sales_list(self, parent):
         """Create the sales list with recent transactions"""
@@ -333,123 +289,102 @@ class SalesPage:
         )
         title_label.pack(pady=Theme.PADDING_MEDIUM)
 
-        # Create scrollable frame
-        canvas = tk.Canvas(parent, bg=Theme.BG_LIGHT_GRAY, highlightthickness=0)
-        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg=Theme.BG_LIGHT_GRAY)
-
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        # Only the rows in view exist as widgets; they are reused while scrolling
+        self.sales_list = VirtualList(
+            parent,
+            row_height=SaleRow.HEIGHT,
+            create_row=lambda frame: SaleRow(frame, self),
+            bind_row=lambda row, sale: row.show(sale),
+            bg=Theme.BG_LIGHT_GRAY
         )
+        self.sales_list.pack(fill="both", expand=True)
 
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        # Shown instead of the rows while the ledger is empty
+        self.no_sales_label = tk.Label(
+            self.sales_list.viewport,
+            text="No sales records found.\nClick 'Add Sale' to get started!",
+            bg=Theme.BG_LIGHT_GRAY,
+            fg=Theme.TEXT_GRAY,
+            font=Theme.get_font(Theme.FONT_SIZE_MEDIUM),
+            justify=tk.CENTER
+        )
 
         # Sales list content
-        self.create_sales_items(scrollable_frame)
-
-    def create_sales_items(self, parent):
-        """Create individual sales items"""
-        sales = self.sales_data.get("sales", [])
-
-        if not sales:
-            # No sales message
-            no_sales_label = tk.Label(
-                parent,
-                text="No sales records found.\nClick 'Add Sale' to get started!",
-                bg=Theme.BG_LIGHT_GRAY,
-                fg=Theme.TEXT_GRAY,
-                font=Theme.get_font(Theme.FONT_SIZE_MEDIUM),
-                justify=tk.CENTER
-            )
-            no_sales_label.pack(pady=50)
+        self.update_sales_list()
+
+    def update_sales_list(self):
+        """Point the sales list at the filtered ledger, newest first; only visible rows are rebound"""
+        items = self.ledger.newest_first(*self.filter)
+        self.sales_list.set_items(items)
+        if len(items):
+            self.no_sales_label.place_forget()
+        else:
+            self.no_sales_label.place(relx=0.5, y=50, anchor="n")
+
+    def open_analytics_window(self):
+        """Show revenue, volume, price per head and moving averages for the current window"""
+        report = self.analytics.report(*self.filter)
+        if report is None:
+            messagebox.showinfo("Analytics", "No sales in the selected range.")
             return
 
-        # Sort sales by date (newest first)
-        sorted_sales = sorted(sales, key=lambda x: x["date"], reverse=True)
-
-        for sale in sorted_sales:
-            item_frame = tk.Frame(parent, bg=Theme.BG_WHITE, relief="flat", bd=1)
-            item_frame.pack(fill=tk.X, padx=Theme.PADDING_MEDIUM, pady=Theme.PADDING_SMALL)
-
-            # Left side - icon and info
-            left_frame = tk.Frame(item_frame, bg=Theme.BG_WHITE)
-            left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=Theme.PADDING_MEDIUM,
-                            pady=Theme.PADDING_MEDIUM)
-
-            # Icon based on animal type
-            icon = self.get_animal_icon(sale["animal"])
-            icon_label = tk.Label(
-                left_frame,
-                text=icon,
-                bg=Theme.BG_WHITE,
-                font=Theme.get_font(16)
-            )
-            icon_label.pack(side=tk.LEFT, padx=(0, Theme.PADDING_SMALL))
-
-            # Sale info
-            info_frame = tk.Frame(left_frame, bg=Theme.BG_WHITE)
-            info_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-            # Animal and price
-            animal_price = tk.Label(
-                info_frame,
-                text=f"{sale['animal']} - ₦{sale['price']:,}",
-                bg=Theme.BG_WHITE,
-                fg=Theme.TEXT_DARK,
-                font=Theme.get_font(Theme.FONT_SIZE_MEDIUM, "bold")
-            )
-            animal_price.pack(anchor="w")
-
-            # Quantity and date
-            details = tk.Label(
-                info_frame,
-                text=f"Quantity: {sale['quantity']} • Date: {sale['date']} • Total: ₦{sale['total']:,}",
-                bg=Theme.BG_WHITE,
-                fg=Theme.TEXT_GRAY,
-                font=Theme.get_font(Theme.FONT_SIZE_SMALL)
-            )
-            details.pack(anchor="w")
-
-            # Right side - actions
-            actions_frame = tk.Frame(item_frame, bg=Theme.BG_WHITE)
-            actions_frame.pack(side=tk.RIGHT, padx=Theme.PADDING_MEDIUM, pady=Theme.PADDING_MEDIUM)
-
-            # Edit button
-            edit_btn = tk.Button(
-                actions_frame,
-                text="✏️",
-                bg=Theme.BG_WHITE,
-                fg=Theme.TEXT_GRAY,
-                relief="flat",
-                bd=0,
-                cursor="hand2",
-                command=lambda s=sale: self.edit_sale(s)
-            )
-            edit_btn.pack(side=tk.RIGHT, padx=Theme.PADDING_SMALL)
-
-            # Delete button
-            delete_btn = tk.Button(
-                actions_frame,
-                text="🗑️",
-                bg=Theme.BG_WHITE,
-                fg=Theme.TEXT_GRAY,
-                relief="flat",
-                bd=0,
-                cursor="hand2",
-                command=lambda s=sale: self.delete_sale(s)
-            )
-            delete_btn.pack(side=tk.RIGHT)
-
-            # Hover effects for buttons
-            edit_btn.bind("<Enter>", lambda e, btn=edit_btn: btn.config(bg=Theme.BG_LIGHT_GRAY))
-            edit_btn.bind("<Leave>", lambda e, btn=edit_btn: btn.config(bg=Theme.BG_WHITE))
-            delete_btn.bind("<Enter>", lambda e, btn=delete_btn: btn.config(bg=Theme.BG_LIGHT_GRAY))
-            delete_btn.bind("<Leave>", lambda e, btn=delete_btn: btn.config(bg=Theme.BG_WHITE))
+        window = tk.Toplevel(self.parent_frame)
+        window.title("Sales Analytics")
+        window.geometry("900x720")
+        window.configure(bg=Theme.BG_WHITE)
+
+        start, end, animal = self.filter
+        scope = f"{start or 'first sale'} to {end or 'latest sale'}" + (f" • {animal}" if animal else "")
+        tk.Label(window, text="Sales Analytics", bg=Theme.BG_WHITE, fg=Theme.TEXT_DARK,
+                 font=Theme.get_font(Theme.FONT_SIZE_LARGE, "bold")).pack(anchor="w", padx=10, pady=(10, 0))
+        tk.Label(window, text=scope, bg=Theme.BG_WHITE, fg=Theme.TEXT_GRAY,
+                 font=Theme.get_font(Theme.FONT_SIZE_SMALL)).pack(anchor="w", padx=10)
+
+        # Price per head by species, with percentile bands of the unit price
+        low, median, high = PERCENTILES
+        columns = ("Species", "Sales", "Revenue", "Head Sold", "Price/Head",
+                   f"P{low}", f"P{median}", f"P{high}")
+        table = ttk.Treeview(window, columns=columns, show="headings", height=6)
+        for column in columns:
+            table.heading(column, text=column)
+            table.column(column, width=100, anchor="e" if column != "Species" else "w")
+        for row in report["price_per_head"]:
+            bands = row["percentiles"]
+            table.insert("", tk.END, values=(
+                row["species"], f"{row['sales']:,}", f"₦{row['revenue']:,.0f}", f"{row['head']:,}",
+                f"₦{row['price_per_head']:,.0f}", f"₦{bands[low]:,.0f}", f"₦{bands[median]:,.0f}",
+                f"₦{bands[high]:,.0f}"))
+        table.pack(fill=tk.X, padx=10, pady=10)
+
+        fig = Figure(figsize=(8, 6), dpi=100, facecolor=Theme.BG_WHITE)
+        revenue_ax, volume_ax, daily_ax = fig.subplots(3, 1)
+
+        # Monthly revenue and volume, stacked by species
+        months = report["months"].astype("datetime64[D]")
+        for ax, grid, title in ((revenue_ax, report["revenue"], "Revenue by species per month (₦)"),
+                                (volume_ax, report["volume"], "Head sold by species per month")):
+            bottom = np.zeros(len(months))
+            for i, species in enumerate(report["species"]):
+                ax.bar(months, grid[:, i], width=25, bottom=bottom, label=species, align="edge")
+                bottom += grid[:, i]
+            ax.set_title(title, fontsize=10, color=Theme.TEXT_DARK)
+        revenue_ax.legend(fontsize=8, ncol=len(report["species"]))
+
+        # Daily revenue with its moving averages
+        daily_ax.plot(report["days"], report["daily"], color=Theme.BG_GRAY, linewidth=0.8, label="Daily")
+        for days, values in report["moving_averages"].items():
+            daily_ax.plot(report["days"], values, linewidth=1.5, label=f"{days}-day average")
+        daily_ax.set_title("Daily revenue (₦)", fontsize=10, color=Theme.TEXT_DARK)
+        daily_ax.legend(fontsize=8)
+
+        for ax in (revenue_ax, volume_ax, daily_ax):
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+        fig.tight_layout()
+
+        canvas = FigureCanvasTkAgg(fig, window)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
 
     def get_animal_icon(self, animal):
         """Get appropriate icon for animal type"""
@@ -583,30 +518,13 @@ class SalesPage:
                 messagebox.showerror("Error", "Quantity must be greater than 0.")
                 return
 
-            # Validate date format
-            datetime.strptime(date, "%Y-%m-%d")
-
-            total = price * quantity
+            # Validate the date and store it zero padded
+            date = iso_date(date)
 
-            # Generate new ID
-            existing_ids = [sale["id"] for sale in self.sales_data["sales"]]
-            new_id = max(existing_ids) + 1 if existing_ids else 1
-
-            # Create new sale
-            new_sale = {
-                "id": new_id,
-                "animal": animal,
-                "price": price,
-                "quantity": quantity,
-                "date": date,
-                "total": total
-            }
-
-            self.sales_data["sales"].append(new_sale)
-            self.save_sales_data(self.sales_data)
+            # The ledger saves and notifies the page sections
+            self.ledger.add(animal, price, quantity, date)
 
             dialog.destroy()
-            self.refresh_page()
             messagebox.showinfo("Success", "Sale added successfully!")
 
         except ValueError as e:
@@ -735,25 +653,13 @@ class SalesPage:
                 messagebox.showerror("Error", "Quantity must be greater than 0.")
                 return
 
-            # Validate date format
-            datetime.strptime(date, "%Y-%m-%d")
-
-            total = price * quantity
-
-            # Find and update the sale
-            for sale in self.sales_data["sales"]:
-                if sale["id"] == sale_id:
-                    sale["animal"] = animal
-                    sale["price"] = price
-                    sale["quantity"] = quantity
-                    sale["date"] = date
-                    sale["total"] = total
-                    break
+            # Validate the date and store it zero padded
+            date = iso_date(date)
 
-            self.save_sales_data(self.sales_data)
+            # The ledger saves and notifies the page sections
+            self.ledger.update(sale_id, animal, price, quantity, date)
 
             dialog.destroy()
-            self.refresh_page()
             messagebox.showinfo("Success", "Sale updated successfully!")
 
         except ValueError as e:
@@ -762,17 +668,32 @@ class SalesPage:
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
 
-    def refresh_page(self):
-        """Refresh the entire page to show updated data"""
-        # Clear the parent frame
-        for widget in self.parent_frame.winfo_children():
-            widget.destroy()
-
-        # Reload sales data
-        self.sales_data = self.load_sales_data()
+    def on_data_changed(self):
+        """Called by the page manager when the ledger changed while this page was hidden"""
+        self.refresh_page()
 
-        # Recreate the page
-        self.create_page()
+    def refresh_page(self):
+        """Re-read the ledger from disk; the sections update through on_ledger_changed"""
+        self.ledger.reload()
+
+    def on_ledger_changed(self, event, sale):
+        """Update only the parts of the page that depend on the ledger"""
+        if event == "add":
+            self.forecaster.add(sale)
+        elif event == "add_batch":
+            for added in sale:
+                self.forecaster.add(added)
+        elif event == "delete":
+            self.forecaster.invalidate(None, sale["animal"])
+        else:
+            # An edit may have moved the sale to another species or month
+            self.forecaster.reset(self.ledger.rollup)
+
+        self.update_animal_choices()
+        self.update_summary_cards()
+        self.update_sales_chart()
+        self.update_sales_list()
+        self.refresh_forecast()
 
     def delete_sale(self, sale):
         """Delete a sale record"""
@@ -790,14 +711,8 @@ class SalesPage:
 
         if result:
             try:
-                # Remove the sale from the sales list
-                self.sales_data["sales"] = [s for s in self.sales_data["sales"] if s["id"] != sale["id"]]
-
-                # Save the updated data
-                self.save_sales_data(self.sales_data)
-
-                # Refresh the page to show updated data
-                self.refresh_page()
+                # Remove the sale; the ledger saves and notifies the page sections
+                self.ledger.delete(sale["id"])
 
                 # Show success message
                 messagebox.showinfo("Success", "Sale deleted successfully!")
@@ -805,4 +720,89 @@ class SalesPage:
             except Exception as e:
                 messagebox.showerror("Error", f"An error occurred while deleting the sale: {str(e)}")
 
-        # If user clicked 'No', do nothing
\ No newline at end of file
+        # If user clicked 'No', do nothing
+
+
+class SaleRow:
+    """One recycled row of the sales list"""
+
+    HEIGHT = 64
+
+    def __init__(self, parent, page):
+        self.page = page
+        self.sale = None
+
+        self.frame = tk.Frame(parent, bg=Theme.BG_LIGHT_GRAY)
+        item_frame = tk.Frame(self.frame, bg=Theme.BG_WHITE, relief="flat", bd=1)
+        item_frame.pack(fill=tk.BOTH, expand=True, padx=Theme.PADDING_MEDIUM, pady=Theme.PADDING_SMALL)
+
+        # Left side - icon and info
+        left_frame = tk.Frame(item_frame, bg=Theme.BG_WHITE)
+        left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=Theme.PADDING_MEDIUM)
+
+        self.icon_label = tk.Label(left_frame, bg=Theme.BG_WHITE, font=Theme.get_font(16))
+        self.icon_label.pack(side=tk.LEFT, padx=(0, Theme.PADDING_SMALL))
+
+        info_frame = tk.Frame(left_frame, bg=Theme.BG_WHITE)
+        info_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Animal and price
+        self.title_label = tk.Label(
+            info_frame,
+            bg=Theme.BG_WHITE,
+            fg=Theme.TEXT_DARK,
+            font=Theme.get_font(Theme.FONT_SIZE_MEDIUM, "bold")
+        )
+        self.title_label.pack(anchor="w")
+
+        # Quantity and date
+        self.details_label = tk.Label(
+            info_frame,
+            bg=Theme.BG_WHITE,
+            fg=Theme.TEXT_GRAY,
+            font=Theme.get_font(Theme.FONT_SIZE_SMALL)
+        )
+        self.details_label.pack(anchor="w")
+
+        # Right side - actions
+        actions_frame = tk.Frame(item_frame, bg=Theme.BG_WHITE)
+        actions_frame.pack(side=tk.RIGHT, padx=Theme.PADDING_MEDIUM)
+
+        edit_btn = tk.Button(
+            actions_frame,
+            text="✏️",
+            bg=Theme.BG_WHITE,
+            fg=Theme.TEXT_GRAY,
+            relief="flat",
+            bd=0,
+            cursor="hand2",
+            command=lambda: self.page.edit_sale(self.sale)
+        )
+        edit_btn.pack(side=tk.RIGHT, padx=Theme.PADDING_SMALL)
+
+        delete_btn = tk.Button(
+            actions_frame,
+            text="🗑️",
+            bg=Theme.BG_WHITE,
+            fg=Theme.TEXT_GRAY,
+            relief="flat",
+            bd=0,
+            cursor="hand2",
+            command=lambda: self.page.delete_sale(self.sale)
+        )
+        delete_btn.pack(side=tk.RIGHT)
+
+        # Hover effects for buttons (bound once per pooled row, not per sale)
+        for btn in (edit_btn, delete_btn):
+            btn.bind("<Enter>", lambda e, b=btn: b.config(bg=Theme.BG_LIGHT_GRAY))
+            btn.bind("<Leave>", lambda e, b=btn: b.config(bg=Theme.BG_WHITE))
+
+    def show(self, sale):
+        """Point this row at a different sale"""
+        if sale is self.sale:
+            return
+        self.sale = sale
+        self.icon_label.config(text=self.page.get_animal_icon(sale["animal"]))
+        self.title_label.config(text=f"{sale['animal']} - ₦{sale['price']:,}")
+        self.details_label.config(
+            text=f"Quantity: {sale['quantity']} • Date: {sale['date']} • Total: ₦{sale['total']:,}")
\ No newline at end of file
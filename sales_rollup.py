@@ -0,0 +1,225 @@
+"""
+Sales rollup module for the Dashboard App
+Contains the SalesRollup cache of daily, monthly and per-species sales sums
+"""
+
+import json
+import os
+import threading
+import numpy as np
+import storage
+from downsampling import MONTH_NAMES, choose_resolution, bucket_grid, resample
+from date_ranges import iso_date
+
+ROLLUP_FILE = "sales_rollup.json"
+
+# Index of each sum inside a bucket
+TOTAL, QUANTITY, COUNT = 0, 1, 2
+
+
+def sale_day(sale):
+    """The sale's date in ISO form, so older unpadded dates such as "2025-6-1" sort and bucket
+    with the rest; None if it cannot be parsed"""
+    try:
+        return iso_date(sale["date"])
+    except (KeyError, AttributeError, ValueError):
+        return None
+
+
+def copy_buckets(buckets):
+    """Copy a key -> bucket dict; the buckets are lists updated in place"""
+    return {key: list(bucket) for key, bucket in buckets.items()}
+
+
+class SalesRollup:
+    """Running sums of sale total, quantity and count per day, month and species.
+
+    Each bucket is a ``[total, quantity, count]`` list. Adding, editing or
+    deleting a sale touches three buckets, so the summary cards and charts
+    never need to rescan the ledger. Daily sums are also kept per species so
+    that a date window can be answered from prefix sums. The rollup is saved next to the ledger
+    together with the ledger file's signature and rebuilt whenever that
+    signature no longer matches.
+    """
+
+    def __init__(self, path=ROLLUP_FILE):
+        self.path = path
+        self.clear()
+
+    def clear(self):
+        self.daily = {}     # "YYYY-MM-DD" -> bucket
+        self.monthly = {}   # "YYYY-MM" -> bucket
+        self.species = {}   # animal -> bucket
+        self.daily_species = {}  # animal -> {"YYYY-MM-DD" -> bucket}
+        self.totals = [0, 0, 0]
+        self.arrays = {}  # animal (or None) -> cached prefix sum arrays
+
+    @classmethod
+    def load(cls, ledger_path, sales=None, path=ROLLUP_FILE):
+        """Load the saved rollup for a ledger, rebuilding it if the ledger changed.
+
+        ``sales`` is the already loaded ledger, if the caller has it; otherwise
+        the ledger file is only read when a rebuild is needed.
+        """
+        rollup = cls(path)
+        signature = storage.file_signature(ledger_path)
+        if signature is not None and rollup.read(signature):
+            return rollup
+
+        if sales is None:
+            sales = []
+            if os.path.exists(ledger_path):
+                try:
+                    with open(ledger_path, "r") as f:
+                        sales = json.load(f).get("sales", [])
+                except (OSError, ValueError):
+                    pass
+        rollup.rebuild(sales)
+        if signature is not None:
+            rollup.save(ledger_path)
+        return rollup
+
+    def read(self, signature):
+        """Read the saved rollup; returns False if it is missing or was built from another ledger"""
+        try:
+            with open(self.path, "r") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if saved.get("ledger") != signature or "daily_species" not in saved:
+            return False
+        if any(len(key) != 10 for key in saved.get("daily", {})):
+            # Saved before dates were padded when bucketed
+            return False
+
+        self.daily = saved.get("daily", {})
+        self.monthly = saved.get("monthly", {})
+        self.species = saved.get("species", {})
+        self.daily_species = saved["daily_species"]
+        self.arrays = {}
+        self.totals = [sum(bucket[i] for bucket in self.species.values()) for i in range(3)]
+        return True
+
+    def save(self, ledger_path):
+        """Save the rollup, stamped with the ledger it now matches (call after the ledger is written).
+
+        Only the buckets are copied here; serializing and writing the file
+        happen on a background thread, so recording a sale does not wait on
+        it. A write that finishes after a newer one is dropped, and a save
+        lost on exit only means the next load rebuilds the rollup.
+        """
+        saved = {
+            "ledger": storage.file_signature(ledger_path),
+            "daily": copy_buckets(self.daily),
+            "monthly": copy_buckets(self.monthly),
+            "species": copy_buckets(self.species),
+            "daily_species": {animal: copy_buckets(days) for animal, days in self.daily_species.items()},
+        }
+        ticket = storage.writer(self.path).ticket()
+        threading.Thread(target=self.write, args=(ticket, saved), daemon=True).start()
+
+    def write(self, ticket, saved):
+        try:
+            storage.writer(self.path).write(ticket, storage.write_json, self.path, saved, None)
+        except OSError as e:
+            print(f"Error saving sales rollup: {e}")
+
+    def rebuild(self, sales):
+        self.clear()
+        for sale in sales:
+            self.add(sale)
+
+    def add(self, sale):
+        self._apply(sale, 1)
+
+    def remove(self, sale):
+        self._apply(sale, -1)
+
+    def _apply(self, sale, sign):
+        day = sale_day(sale)
+        if day is None:
+            return  # left out, as it is from the ledger's date index
+        delta = (sign * sale["total"], sign * sale["quantity"], sign)
+        animal = sale["animal"]
+        species_daily = self.daily_species.setdefault(animal, {})
+        for buckets, key in ((self.daily, day), (self.monthly, day[:7]), (self.species, animal),
+                             (species_daily, day)):
+            bucket = buckets.setdefault(key, [0, 0, 0])
+            for i in range(3):
+                bucket[i] += delta[i]
+            if bucket[COUNT] <= 0:
+                del buckets[key]
+        if not species_daily:
+            del self.daily_species[animal]
+        for i in range(3):
+            self.totals[i] += delta[i]
+        self.arrays = {}
+
+    def summary(self):
+        """Return (total sales, transactions, animals sold, average sale)"""
+        total, quantity, count = self.totals
+        return total, count, quantity, total / count if count else 0
+
+    def daily_series(self):
+        """Return (dates, totals) for every day with sales, oldest first"""
+        dates = sorted(self.daily)
+        return dates, [self.daily[date][TOTAL] for date in dates]
+
+    def monthly_series(self, months=6):
+        """Return (month names, totals) for the last ``months`` months with sales"""
+        keys = sorted(self.monthly)[-months:]
+        names = [MONTH_NAMES[int(key[5:7]) - 1] for key in keys]
+        return names, [self.monthly[key][TOTAL] for key in keys]
+
+    def daily_arrays(self, animal=None):
+        """Return (days, totals, prefix sums) for one species or all sales.
+
+        ``days`` is a sorted datetime64 array and the prefix sums have one row
+        per day plus a leading zero row, with total, quantity and count columns.
+        Built once per change and shared by every window query.
+        """
+        if animal not in self.arrays:
+            daily = self.daily if animal is None else self.daily_species.get(animal, {})
+            keys = sorted(daily)
+            sums = np.array([daily[key] for key in keys], dtype=float).reshape(-1, 3)
+            prefix = np.zeros((len(keys) + 1, 3))
+            np.cumsum(sums, axis=0, out=prefix[1:])
+            self.arrays[animal] = (np.array(keys, dtype="datetime64[D]"), sums[:, TOTAL], prefix)
+        return self.arrays[animal]
+
+    def window_bounds(self, days, start, end):
+        lo = 0 if start is None else int(np.searchsorted(days, np.datetime64(start, "D"), side="left"))
+        hi = len(days) if end is None else int(np.searchsorted(days, np.datetime64(end, "D"), side="right"))
+        return lo, max(lo, hi)
+
+    def window_summary(self, start=None, end=None, animal=None):
+        """Like summary() but only for sales between two ISO dates (inclusive) and optionally one species"""
+        days, _, prefix = self.daily_arrays(animal)
+        lo, hi = self.window_bounds(days, start, end)
+        total, quantity, count = (prefix[hi] - prefix[lo]).round().astype(np.int64).tolist()
+        return total, count, quantity, total / count if count else 0
+
+    def window_series(self, start=None, end=None, animal=None):
+        """Daily (dates, totals) between two ISO dates (inclusive), optionally for one species"""
+        days, totals, _ = self.daily_arrays(animal)
+        lo, hi = self.window_bounds(days, start, end)
+        return days[lo:hi], totals[lo:hi]
+
+    def window_buckets(self, start=None, end=None, max_buckets=40):
+        """Totals per day, week or month between two ISO dates, empty buckets included.
+
+        The resolution is the finest that needs at most ``max_buckets``; an open
+        end is taken from the first or last day with sales. Returns
+        (resolution, bucket start dates, totals).
+        """
+        days, totals = self.window_series(start, end)
+        if start is None and len(days) == 0:
+            return None, days, totals
+        first = np.datetime64(start, "D") if start else days[0]
+        last = np.datetime64(end, "D") if end else (days[-1] if len(days) else first)
+        resolution = choose_resolution(first, last, max_buckets)
+        grid = bucket_grid(first, last, resolution)
+        keys, sums = resample(days, totals, resolution)
+        values = np.zeros(len(grid))
+        values[np.searchsorted(grid, keys)] = sums
+        return resolution, grid, values
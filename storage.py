@@ -0,0 +1,147 @@
+"""
+Storage module for the Dashboard App
+Contains helpers for writing the JSON data files and tracking their versions
+"""
+
+import itertools
+import json
+import os
+import threading
+
+JOURNAL_FILE = "commit_journal.json"
+
+# In-process write counters, so a write is noticed even when the file
+# system's modification time is too coarse to change between two saves
+_write_counts = {}
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def write_json(path, data, indent=2):
+    """Write JSON to a temporary file and swap it in, so readers never see a half-written file"""
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump(data, f, indent=indent)
+    os.replace(temp_path, path)
+    mark_changed(path)
+
+
+def _write_synced(path, data, indent):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def commit_json(writes, indent=2, journal=JOURNAL_FILE):
+    """Write several JSON files so that either all of them change or none do.
+
+    ``writes`` maps each path to its new data. Every file is first written in
+    full next to its target, then a journal naming them is written; only then
+    are the files swapped in. If the process dies during the swaps,
+    ``recover()`` finishes them on the next start.
+    """
+    paths = list(writes)
+    try:
+        for path in paths:
+            _write_synced(path + ".tmp", writes[path], indent)
+    except Exception:
+        for path in paths:
+            if os.path.exists(path + ".tmp"):
+                os.remove(path + ".tmp")
+        raise
+
+    # The batch is committed once the journal is in place
+    _write_synced(journal + ".tmp", paths, None)
+    os.replace(journal + ".tmp", journal)
+    _finish_commit(paths, journal)
+
+
+def _finish_commit(paths, journal):
+    for path in paths:
+        if os.path.exists(path + ".tmp"):
+            os.replace(path + ".tmp", path)
+        mark_changed(path)
+    os.remove(journal)
+
+
+def recover(journal=JOURNAL_FILE):
+    """Complete a multi-file commit that was interrupted; call once at startup"""
+    if not os.path.exists(journal):
+        return
+    try:
+        with open(journal, "r") as f:
+            paths = json.load(f)
+    except ValueError:
+        # A torn journal means the commit never happened; the targets are untouched
+        os.remove(journal)
+        return
+    _finish_commit(paths, journal)
+
+
+class FileWriter:
+    """The single way in to writing one file, from any thread.
+
+    Writes run one at a time. Each snapshot of the data takes a ticket when
+    it is made, normally on the Tk thread, and a write whose snapshot is
+    older than one already written is dropped, so a slow worker can never
+    put back data that a later save replaced.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tickets = itertools.count(1)
+        self.written = 0
+
+    def ticket(self):
+        return next(self.tickets)
+
+    def write(self, ticket, write, *args):
+        """Call ``write(*args)`` unless a newer snapshot was written; returns whether it ran"""
+        with self.lock:
+            if ticket < self.written:
+                return False
+            write(*args)
+            self.written = ticket
+            return True
+
+
+def writer(path):
+    """The FileWriter shared by everything in this process that writes ``path``"""
+    key = os.path.abspath(path)
+    with _writers_lock:
+        if key not in _writers:
+            _writers[key] = FileWriter()
+        return _writers[key]
+
+
+def mark_changed(path):
+    """Record that a data file was rewritten (for writers that do not use write_json)"""
+    key = os.path.abspath(path)
+    _write_counts[key] = _write_counts.get(key, 0) + 1
+
+
+def data_version(*paths):
+    """Return a value that changes whenever any of the given data files changes"""
+    version = []
+    for path in paths:
+        key = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+            version.append((_write_counts.get(key, 0), stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            version.append((_write_counts.get(key, 0), None, None))
+    return tuple(version)
+
+
+def file_signature(path):
+    """Return the on-disk identity of a file (mtime and size), or None if it is missing.
+
+    Unlike data_version this survives restarts, so it can be stored in a cache file
+    to tell whether the file the cache was built from has changed since.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
@@ -6,17 +6,37 @@ Contains the SummaryCards class for displaying key metrics
 import tkinter as tk
 from tkinter import ttk
 from theme import Theme
-from utils import DataGenerator, Colors
+from utils import Colors, format_number, format_currency, format_percentage
+import events
+
+
+PLACEHOLDER = "—"
 
 
 class SummaryCards:
-    """Summary cards component for displaying key metrics"""
+    """Summary cards component for displaying key metrics.
+
+    Without a KPI engine the cards are drawn as skeletons showing a
+    placeholder value; ``show`` fills them in once the KPIs are ready. Any
+    object with the KPIEngine attributes can be shown, such as a
+    DashboardView for a date range; a value of None shows the placeholder.
+    """
 
-    def __init__(self, parent):
+    def __init__(self, parent, kpis=None, label="All time"):
         self.parent = parent
+        self.kpis = kpis
+        self.label = label  # the period the revenue card covers
         self.cards_data = []
+        self.value_labels = []
+        self.subtitle_labels = []
+        self.progress_fill = None
         self.create_cards()
 
+        # Follow live KPI changes until the cards are destroyed
+        events.subscribe("kpi", self.on_kpi_changed)
+        self.cards_frame.bind("<Destroy>", lambda e: events.unsubscribe("kpi", self.on_kpi_changed)
+                              if e.widget is self.cards_frame else None)
+
     def create_cards(self):
         """Create the summary cards container and individual cards"""
         # Main container frame
@@ -33,40 +53,61 @@ class SummaryCards:
         self.create_individual_cards()
 
     def generate_card_data(self):
-        """Generate random data for cards"""
+        """Build the card data from the running KPIs"""
+        metrics = self.kpis
+        if metrics is None:
+            self.generate_skeleton_data()
+            return
         self.cards_data = [
             {
                 "title": "Total Livestock",
-                "value": DataGenerator.format_number(DataGenerator().generate_livestock_count()),
+                "value": self.format_value(format_number, metrics.livestock_count),
                 "subtitle": "Active Animals",
                 "icon": "🐄",
                 "color": Theme.PRIMARY_GREEN
             },
             {
                 "title": "Total Revenue",
-                "value": DataGenerator.format_currency(DataGenerator().generate_revenue()),
-                "subtitle": "This Month",
+                "value": self.format_value(format_currency, metrics.revenue),
+                "subtitle": self.label,
                 "icon": "💰",
                 "color": Theme.DARK_GREEN
             },
             {
                 "title": "Herd Health",
-                "value": DataGenerator.format_percentage(DataGenerator().generate_health_percentage()),
+                "value": self.format_value(format_percentage, metrics.health_percentage),
                 "subtitle": "Overall Status",
                 "icon": "❤️",
                 "color": Theme.PRIMARY_GREEN,
                 "has_progress": True,
-                "progress_value": DataGenerator().generate_health_percentage()
+                "progress_value": metrics.health_percentage or 0
             },
             {
                 "title": "Standing Stock",
-                "value": DataGenerator.format_number(DataGenerator.generate_standing_stock()),
+                "value": self.format_value(format_number, metrics.standing_stock),
                 "subtitle": "Available Units",
                 "icon": "📦",
                 "color": Theme.LIGHT_GREEN
             }
         ]
 
+    def generate_skeleton_data(self):
+        """Card data shown while the KPIs are still being computed"""
+        self.cards_data = [
+            {"title": "Total Livestock", "value": PLACEHOLDER, "subtitle": "Active Animals",
+             "icon": "🐄", "color": Theme.TEXT_GRAY},
+            {"title": "Total Revenue", "value": PLACEHOLDER, "subtitle": self.label,
+             "icon": "💰", "color": Theme.TEXT_GRAY},
+            {"title": "Herd Health", "value": PLACEHOLDER, "subtitle": "Overall Status",
+             "icon": "❤️", "color": Theme.TEXT_GRAY, "has_progress": True, "progress_value": 0},
+            {"title": "Standing Stock", "value": PLACEHOLDER, "subtitle": "Available Units",
+             "icon": "📦", "color": Theme.TEXT_GRAY}
+        ]
+
+    @staticmethod
+    def format_value(formatter, value):
+        return PLACEHOLDER if value is None else formatter(value)
+
     def create_individual_cards(self):
         """Create individual summary cards"""
         for i, card_data in enumerate(self.cards_data):
@@ -127,6 +168,7 @@ class SummaryCards:
             anchor="w"
         )
         value_label.pack(side=tk.LEFT)
+        self.value_labels.append(value_label)
 
         # Progress bar for health card
         if card_data.get("has_progress", False):
@@ -140,6 +182,7 @@ class SummaryCards:
             anchor="w"
         )
         subtitle_label.pack(side=tk.BOTTOM, anchor="w")
+        self.subtitle_labels.append(subtitle_label)
 
         # Hover effects
         self.add_hover_effects(card_frame)
@@ -166,6 +209,7 @@ class SummaryCards:
             width=progress_width
         )
         progress_fill.pack(side=tk.LEFT)
+        self.progress_fill = progress_fill
 
     def add_hover_effects(self, card_frame):
         """Add hover effects to cards"""
@@ -192,14 +236,26 @@ class SummaryCards:
             self.bind_hover_to_children(child, on_enter, on_leave)
 
     def refresh_data(self):
-        """Refresh card data with new random values"""
-        # Clear existing cards
-        for widget in self.cards_frame.winfo_children():
-            widget.destroy()
-
-        # Regenerate data and create new cards
+        """Show the current KPI values in the existing cards"""
         self.generate_card_data()
-        self.create_individual_cards()
+        for label, subtitle, card_data in zip(self.value_labels, self.subtitle_labels, self.cards_data):
+            label.config(text=card_data["value"], fg=card_data["color"])
+            subtitle.config(text=card_data["subtitle"])
+            if card_data.get("has_progress") and self.progress_fill is not None:
+                value = card_data["progress_value"]
+                self.progress_fill.config(width=int((value / 100) * 200), bg=Colors.get_progress_color(value))
+
+    def show(self, kpis, label=None):
+        """Replace the skeleton values with the KPIs once they are ready"""
+        self.kpis = kpis
+        if label:
+            self.label = label
+        self.refresh_data()
+
+    def on_kpi_changed(self, engine):
+        # A date range view is a fixed snapshot; only the live engine follows events
+        if self.kpis is engine:
+            self.refresh_data()
 
     def get_frame(self):
         """Get the cards frame"""
@@ -128,6 +128,11 @@ class Theme:
         cls._colors = cls.DARK_COLORS
         cls._refresh_colors()
 
+    @classmethod
+    def mode(cls):
+        """Name of the active palette"""
+        return "dark" if cls._colors is cls.DARK_COLORS else "light"
+
     @classmethod
     def get_font(cls, size=None, weight="normal"):
         """Get font tuple for tkinter widgets"""
@@ -0,0 +1,305 @@
+"""
+Vaccination module for the Dashboard App
+Contains the VaccinationTracker used for due and overdue alerts and the
+VaccinationSchedule engine that projects next vaccination dates from protocols
+"""
+
+import re
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+OVERDUE = "overdue"
+DUE_SOON = "due_soon"
+
+# Ordinal of 1970-01-01, for converting numpy datetime64[D] values to date ordinals
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+DEFAULT_PROTOCOLS = [
+    {"species": "Cattle", "min_age": 0, "max_age": None, "interval_days": 180},
+    {"species": "Sheep", "min_age": 0, "max_age": None, "interval_days": 180},
+    {"species": "Goat", "min_age": 0, "max_age": None, "interval_days": 180},
+    {"species": "Pig", "min_age": 0, "max_age": None, "interval_days": 120},
+    {"species": "Horse", "min_age": 0, "max_age": None, "interval_days": 365},
+    {"species": "Chicken", "min_age": 0, "max_age": None, "interval_days": 90},
+    {"species": "Duck", "min_age": 0, "max_age": None, "interval_days": 90},
+    {"species": "Turkey", "min_age": 0, "max_age": None, "interval_days": 90},
+]
+
+PROTOCOL_PATTERN = re.compile(
+    r"^\s*(?P<species>[A-Za-z][\w ]*?)\s*"
+    r"(?:(?P<min_age>\d+(?:\.\d+)?)\s*-\s*(?P<max_age>\d+(?:\.\d+)?)?\s*)?"
+    r":\s*every\s+(?P<days>\d+)\s+days?\s*$",
+    re.IGNORECASE
+)
+
+
+def is_overdue(due, today):
+    """Whether a next-vaccination ordinal (or an array of them) is overdue: due today counts as overdue"""
+    return due <= today
+
+
+def parse_date_ordinals(values):
+    """Parse YYYY-MM-DD strings into an int64 array of date ordinals (-1 where blank or invalid)"""
+    strings = np.asarray(values, dtype=object).astype(str)
+    ordinals = np.full(len(strings), -1, dtype=np.int64)
+    if not len(strings):
+        return ordinals
+
+    lengths = np.char.str_len(strings)
+    valid = lengths == 10
+    # Unpadded dates such as "2025-6-5" are dates too, but numpy will not parse them
+    one_by_one = np.flatnonzero((lengths >= 8) & (lengths < 10))
+    try:
+        days = strings[valid].astype("datetime64[D]").astype(np.int64)
+        ordinals[valid] = days + EPOCH_ORDINAL
+    except ValueError:
+        # A malformed date somewhere in the batch; fall back to parsing one by one
+        one_by_one = np.concatenate([np.flatnonzero(valid), one_by_one])
+    for i in one_by_one:
+        try:
+            ordinals[i] = datetime.strptime(strings[i], "%Y-%m-%d").toordinal()
+        except ValueError:
+            pass
+    return ordinals
+
+
+def format_date_ordinals(ordinals):
+    """Format an array of date ordinals back to YYYY-MM-DD strings"""
+    days = (np.asarray(ordinals, dtype=np.int64) - EPOCH_ORDINAL).astype("datetime64[D]")
+    return np.datetime_as_string(days, unit="D")
+
+
+def group_codes(names):
+    """Return (sorted distinct names, int code per entry) for a list of group names"""
+    groups, codes = np.unique(np.asarray(names, dtype=str), return_inverse=True)
+    return groups.tolist(), codes.astype(np.int64)
+
+
+def weekly_counts(due, codes=None, groups=1, weeks=26, today=None):
+    """Bin next-vaccination ordinals by group and week starting today, in one bincount.
+
+    ``due`` holds date ordinals (-1 where unscheduled) and ``codes`` each
+    entry's group index (all one group when None). Returns (a groups x weeks
+    count matrix, the number already overdue). What is due today is overdue,
+    as in the alerts panel, so the first week holds the six days after today.
+    """
+    today = (today or date.today()).toordinal()
+    due = np.asarray(due, dtype=np.int64)
+    scheduled = due >= 0
+    late = scheduled & is_overdue(due, today)
+    overdue = int(np.count_nonzero(late))
+    offsets = (due - today) // 7
+    upcoming = scheduled & ~late & (offsets < weeks)
+    index = offsets[upcoming]
+    if codes is not None:
+        index = index + np.asarray(codes, dtype=np.int64)[upcoming] * weeks
+    counts = np.bincount(index, minlength=groups * weeks).reshape(groups, weeks)
+    return counts, overdue
+
+
+def week_starts(weeks=26, today=None):
+    today = today or date.today()
+    return [today + timedelta(weeks=w) for w in range(weeks)]
+
+
+class VaccinationTracker:
+    """Keeps next-vaccination dates parsed and due counts up to date per record"""
+
+    DUE_SOON_DAYS = 7
+
+    def __init__(self):
+        self.entries = {}   # key -> (tag id, species, location, next vaccination ordinal or None)
+        self.counts = Counter()   # (status, "species" | "location", name) -> count
+        self.totals = Counter()   # status -> count
+        self.overdue = Counter()  # tag id -> overdue records carrying it
+        self.today = date.today().toordinal()
+        self._parsed = {}
+
+    def parse_date(self, value):
+        """Return the date ordinal for a YYYY-MM-DD string, or None if it is blank or invalid"""
+        if not value:
+            return None
+        if value not in self._parsed:
+            try:
+                self._parsed[value] = datetime.strptime(value, "%Y-%m-%d").toordinal()
+            except (TypeError, ValueError):
+                self._parsed[value] = None
+        return self._parsed[value]
+
+    def status_for(self, ordinal):
+        if ordinal is None:
+            return None
+        if is_overdue(ordinal, self.today):
+            return OVERDUE
+        if ordinal <= self.today + self.DUE_SOON_DAYS:
+            return DUE_SOON
+        return None
+
+    def status(self, key):
+        entry = self.entries.get(key)
+        return self.status_for(entry[3]) if entry else None
+
+    def _count(self, entry, delta):
+        status = self.status_for(entry[3])
+        if status:
+            self.totals[status] += delta
+            self.counts[(status, "species", entry[1])] += delta
+            self.counts[(status, "location", entry[2])] += delta
+        if status == OVERDUE:
+            self.overdue[entry[0]] += delta
+            if self.overdue[entry[0]] <= 0:
+                del self.overdue[entry[0]]
+
+    def update(self, key, animal):
+        """Add or replace the entry for one record"""
+        self.remove(key)
+        entry = (
+            animal.get("id", ""),
+            animal.get("type", "") or "Unknown",
+            animal.get("location", "") or "Unassigned",
+            self.parse_date(animal.get("next_vaccination", "")),
+        )
+        self.entries[key] = entry
+        self._count(entry, 1)
+
+    def remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry:
+            self._count(entry, -1)
+
+    def rebuild(self, keyed_animals):
+        self.entries = {}
+        self.counts = Counter()
+        self.totals = Counter()
+        self.overdue = Counter()
+        for key, animal in keyed_animals:
+            self.update(key, animal)
+
+    def _roll_date(self):
+        """Recount against today's date if the day has changed since the last count"""
+        today = date.today().toordinal()
+        if today != self.today:
+            self.today = today
+            self.counts = Counter()
+            self.totals = Counter()
+            self.overdue = Counter()
+            for entry in self.entries.values():
+                self._count(entry, 1)
+
+    def summary(self):
+        """Return overdue and due-soon totals broken down by species and location"""
+        self._roll_date()
+        result = {}
+        for status in (OVERDUE, DUE_SOON):
+            result[status] = {
+                "total": self.totals[status],
+                "species": {},
+                "location": {},
+            }
+        for (status, field, name), count in self.counts.items():
+            if count > 0:
+                result[status][field][name] = count
+        return result
+
+    def overdue_ids(self):
+        """The tag IDs of overdue records, as a live set-like view kept current by update and remove"""
+        self._roll_date()
+        return self.overdue.keys()
+
+
+class VaccinationSchedule:
+    """Vaccination protocols per species and age band, applied to the whole herd in one pass.
+
+    Age bands use the Age column as entered; ``max_age`` is exclusive and the
+    first matching protocol wins, so list narrow age bands before open ones.
+    """
+
+    def __init__(self, protocols=None):
+        self.protocols = [dict(p) for p in (protocols or DEFAULT_PROTOCOLS)]
+
+    @staticmethod
+    def parse_protocols(text):
+        """Parse lines like "Cattle: every 180 days" or "Cattle 0-1: every 90 days" """
+        protocols = []
+        for line_no, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            match = PROTOCOL_PATTERN.match(line)
+            if not match:
+                raise ValueError(f"Line {line_no}: expected 'Species [min-max]: every N days'")
+            protocols.append({
+                "species": match.group("species").strip(),
+                "min_age": float(match.group("min_age")) if match.group("min_age") else 0,
+                "max_age": float(match.group("max_age")) if match.group("max_age") else None,
+                "interval_days": int(match.group("days")),
+            })
+        return protocols
+
+    def format_protocols(self):
+        lines = []
+        for p in self.protocols:
+            band = ""
+            if p.get("min_age") or p.get("max_age") is not None:
+                max_age = p.get("max_age")
+                band = f" {p.get('min_age', 0):g}-{'' if max_age is None else format(max_age, 'g')}"
+            lines.append(f"{p['species']}{band}: every {p['interval_days']} days")
+        return "\n".join(lines)
+
+    def intervals(self, animals):
+        """Return the protocol interval in days for each animal (0 where no protocol applies)"""
+        n = len(animals)
+        species = np.array([a.get("type", "") for a in animals], dtype=object)
+        ages = np.full(n, np.nan)
+        for i, animal in enumerate(animals):
+            try:
+                ages[i] = float(animal.get("age", ""))
+            except (TypeError, ValueError):
+                pass
+
+        intervals = np.zeros(n, dtype=np.int64)
+        for p in self.protocols:
+            mask = (species == p["species"]) & (intervals == 0)
+            if p.get("min_age"):
+                mask &= ages >= p["min_age"]
+            if p.get("max_age") is not None:
+                mask &= ages < p["max_age"]
+            intervals[mask] = p["interval_days"]
+        return intervals
+
+    def project(self, animals):
+        """Return next vaccination ordinals from each animal's last vaccination (-1 where unknown)"""
+        last = parse_date_ordinals([a.get("last_vaccination", "") for a in animals])
+        intervals = self.intervals(animals)
+        return np.where((last >= 0) & (intervals > 0), last + intervals, -1)
+
+    def apply(self, animals):
+        """Set next_vaccination on every animal the protocols cover; return the records that changed"""
+        projected = self.project(animals)
+        index = np.flatnonzero(projected >= 0)
+        dates = format_date_ordinals(projected[index])
+
+        changed = []
+        for i, next_vac in zip(index, dates):
+            animal = animals[i]
+            if animal.get("next_vaccination") != next_vac:
+                animal["next_vaccination"] = str(next_vac)
+                changed.append(animal)
+        return changed
+
+    def mark_vaccinated(self, animals, on_date=None):
+        """Record a vaccination for a group and project each member's next date"""
+        on_date = (on_date or date.today()).isoformat()
+        for animal in animals:
+            animal["last_vaccination"] = on_date
+        self.apply(animals)
+        return animals
+
+    @staticmethod
+    def weekly_workload(animals, weeks=26, today=None):
+        """Count vaccinations due per week starting this week; returns (week start dates, counts, overdue)"""
+        due = parse_date_ordinals([a.get("next_vaccination", "") for a in animals])
+        counts, overdue = weekly_counts(due, weeks=weeks, today=today)
+        return week_starts(weeks, today), counts[0], overdue
+
@@ -0,0 +1,99 @@
+"""
+Virtual list module for the Dashboard App
+Contains the VirtualList widget that renders only the rows in view
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualList:
+    """Scrollable list of fixed-height rows backed by a small pool of recycled row widgets.
+
+    ``create_row(parent)`` builds one row and returns an object with a ``frame``
+    attribute; ``bind_row(row, item)`` fills an existing row with an item. Only
+    as many rows as fit in the viewport are ever created, so opening or
+    scrolling a list costs the same for ten items or a million.
+    """
+
+    def __init__(self, parent, row_height, create_row, bind_row, bg):
+        self.row_height = row_height
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.items = []
+        self.offset = 0
+        self.pool = []
+
+        self.frame = tk.Frame(parent, bg=bg)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.viewport = tk.Frame(self.frame, bg=bg)
+        self.viewport.pack(side="left", fill="both", expand=True)
+
+        self.viewport.bind("<Configure>", lambda e: self.render())
+        self.bind_scroll(self.viewport)
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def set_items(self, items):
+        self.items = items
+        self.offset = min(self.offset, self.max_offset())
+        self.render()
+
+    def max_offset(self):
+        return max(0, len(self.items) * self.row_height - self.viewport.winfo_height())
+
+    def bind_scroll(self, widget):
+        """Route mouse wheel events from a widget (and its children) to the list"""
+        widget.bind("<MouseWheel>", lambda e: self.scroll_by(-e.delta / 120 * self.row_height))
+        widget.bind("<Button-4>", lambda e: self.scroll_by(-self.row_height))
+        widget.bind("<Button-5>", lambda e: self.scroll_by(self.row_height))
+        for child in widget.winfo_children():
+            self.bind_scroll(child)
+
+    def scroll_by(self, pixels):
+        self.scroll_to(self.offset + pixels)
+
+    def scroll_to(self, offset):
+        offset = int(max(0, min(offset, self.max_offset())))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def yview(self, *args):
+        """Scrollbar command handler"""
+        total = len(self.items) * self.row_height
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * total)
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            step = self.viewport.winfo_height() if args[2] == "pages" else self.row_height
+            self.scroll_by(amount * step)
+
+    def render(self):
+        height = self.viewport.winfo_height()
+        if height <= 1:
+            return
+
+        first = self.offset // self.row_height
+        needed = height // self.row_height + 2
+        while len(self.pool) < needed:
+            row = self.create_row(self.viewport)
+            self.bind_scroll(row.frame)
+            self.pool.append(row)
+
+        for i, row in enumerate(self.pool):
+            index = first + i
+            if i < needed and index < len(self.items):
+                self.bind_row(row, self.items[index])
+                row.frame.place(x=0, y=index * self.row_height - self.offset,
+                                relwidth=1, height=self.row_height)
+            else:
+                row.frame.place_forget()
+
+        total = len(self.items) * self.row_height
+        if total <= height:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + height) / total)
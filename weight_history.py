@@ -0,0 +1,219 @@
+"""
+Weight history module for the Dashboard App
+Contains the WeightHistory store of (animal, date, kg) samples and its growth analytics
+"""
+
+import os
+from datetime import date
+
+import numpy as np
+
+import storage
+
+WEIGHT_FILE = "weight_history.npz"
+
+
+class WeightHistory:
+    """Weight samples kept column-wise and grouped by animal.
+
+    Samples are sorted by (animal, date) so each animal's series is a
+    contiguous slice ``offsets[i]:offsets[i + 1]`` of the column arrays.
+    New samples are buffered and merged in one sort the next time the
+    series are read or saved.
+    """
+
+    def __init__(self, path=WEIGHT_FILE):
+        self.path = path
+        self.animal_ids = []   # animal index -> tag id
+        self.index = {}        # tag id -> animal index
+        self.animals = np.empty(0, dtype=np.int32)
+        self.dates = np.empty(0, dtype=np.int32)
+        self.weights = np.empty(0, dtype=np.float32)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.pending = []
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                self.animal_ids = [str(tag_id) for tag_id in data["animal_ids"]]
+                self.animals = data["animals"].astype(np.int32)
+                self.dates = data["dates"].astype(np.int32)
+                self.weights = data["weights"].astype(np.float32)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Error loading weight history: {e}")
+            return
+        self.index = {tag_id: i for i, tag_id in enumerate(self.animal_ids)}
+        self._rebuild_offsets()
+
+    def save(self):
+        self.write(*self.snapshot())
+
+    def snapshot(self):
+        """Merge the pending samples and return (write ticket, copies of the columns).
+
+        Call on the thread that adds samples; the copies can then be handed
+        to ``write`` on a worker thread while samples keep arriving.
+        """
+        self._merge()
+        columns = (list(self.animal_ids), self.animals.copy(), self.dates.copy(), self.weights.copy())
+        return storage.writer(self.path).ticket(), columns
+
+    def write(self, ticket, columns):
+        storage.writer(self.path).write(ticket, self.write_file, self.path, columns)
+
+    @staticmethod
+    def write_file(path, columns):
+        animal_ids, animals, dates, weights = columns
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            np.savez(
+                f,
+                animal_ids=np.array(animal_ids, dtype=str),
+                animals=animals,
+                dates=dates,
+                weights=weights
+            )
+        os.replace(temp_path, path)
+        storage.mark_changed(path)
+
+    def __len__(self):
+        return len(self.weights) + len(self.pending)
+
+    def _animal_index(self, tag_id):
+        tag_id = str(tag_id)
+        if tag_id not in self.index:
+            self.index[tag_id] = len(self.animal_ids)
+            self.animal_ids.append(tag_id)
+        return self.index[tag_id]
+
+    def add_sample(self, tag_id, kg, on_date=None):
+        on_date = (on_date or date.today()).toordinal()
+        self.pending.append((self._animal_index(tag_id), on_date, float(kg)))
+
+    def add_samples(self, records, on_date=None):
+        """Record the current weight of many animals at once"""
+        for animal in records:
+            try:
+                self.add_sample(animal["id"], float(animal["weight"]), on_date)
+            except (KeyError, TypeError, ValueError):
+                continue
+
+    def rename(self, old_id, new_id):
+        """Carry an animal's history over when its tag ID changes"""
+        old_id, new_id = str(old_id), str(new_id)
+        if old_id == new_id or old_id not in self.index or new_id in self.index:
+            return
+        i = self.index.pop(old_id)
+        self.animal_ids[i] = new_id
+        self.index[new_id] = i
+
+    @staticmethod
+    def _keys(animals, dates):
+        """Combine animal index and date into one sortable int64 key"""
+        return (animals.astype(np.int64) << 32) | dates.astype(np.int64)
+
+    def _merge(self):
+        if not self.pending:
+            return
+        new = np.array(self.pending, dtype=np.float64)
+        self.pending = []
+
+        new_keys = self._keys(new[:, 0], new[:, 1])
+        new_weights = new[:, 2].astype(np.float32)
+
+        # Stable sort keeps arrival order within a day, so the last weighing of a day wins
+        order = np.argsort(new_keys, kind="stable")
+        new_keys, new_weights = new_keys[order], new_weights[order]
+        last_of_day = np.ones(len(new_keys), dtype=bool)
+        last_of_day[:-1] = new_keys[1:] != new_keys[:-1]
+        new_keys, new_weights = new_keys[last_of_day], new_weights[last_of_day]
+
+        # Overwrite same-day samples in place and insert the rest at their sorted positions
+        keys = self._keys(self.animals, self.dates)
+        positions = np.searchsorted(keys, new_keys)
+        existing = positions < len(keys)
+        existing[existing] = keys[positions[existing]] == new_keys[existing]
+        self.weights[positions[existing]] = new_weights[existing]
+
+        insert = ~existing
+        self.animals = np.insert(self.animals, positions[insert], (new_keys[insert] >> 32).astype(np.int32))
+        self.dates = np.insert(self.dates, positions[insert], (new_keys[insert] & 0xFFFFFFFF).astype(np.int32))
+        self.weights = np.insert(self.weights, positions[insert], new_weights[insert])
+        self._rebuild_offsets()
+
+    def _rebuild_offsets(self):
+        counts = np.bincount(self.animals, minlength=len(self.animal_ids))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+    def series(self, tag_id):
+        """Return (date ordinals, kg) for one animal, oldest first"""
+        self._merge()
+        i = self.index.get(str(tag_id))
+        if i is None:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.dates[start:end], self.weights[start:end]
+
+    def _fit(self):
+        """Least-squares line of kg against days for every animal at once"""
+        self._merge()
+        n_animals = len(self.animal_ids)
+        a = self.animals
+        x = self.dates.astype(np.float64)
+        y = self.weights.astype(np.float64)
+
+        n = np.bincount(a, minlength=n_animals).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_x = np.bincount(a, x, n_animals) / n
+            mean_y = np.bincount(a, y, n_animals) / n
+            dx = x - mean_x[a]
+            dy = y - mean_y[a]
+            sxx = np.bincount(a, dx * dx, n_animals)
+            slope = np.bincount(a, dx * dy, n_animals) / sxx
+        return n, mean_x, mean_y, slope, sxx
+
+    def average_daily_gain(self, min_samples=2):
+        """Return {tag id: kg per day} from a linear fit over each animal's samples"""
+        n, _, _, slope, sxx = self._fit()
+        valid = np.flatnonzero((n >= min_samples) & (sxx > 0))
+        return {self.animal_ids[i]: float(slope[i]) for i in valid}
+
+    def growth_curve(self, tag_ids=None, bucket_days=7):
+        """Mean weight per period across the herd (or the given animals); returns (period start ordinals, kg)"""
+        self._merge()
+        mask = np.ones(len(self.weights), dtype=bool)
+        if tag_ids is not None:
+            wanted = np.zeros(len(self.animal_ids), dtype=bool)
+            wanted[[self.index[t] for t in map(str, tag_ids) if t in self.index]] = True
+            mask = wanted[self.animals]
+        if not mask.any():
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        dates = self.dates[mask].astype(np.int64)
+        weights = self.weights[mask].astype(np.float64)
+        first = dates.min()
+        buckets = (dates - first) // bucket_days
+        counts = np.bincount(buckets)
+        totals = np.bincount(buckets, weights)
+        filled = np.flatnonzero(counts)
+        return first + filled * bucket_days, totals[filled] / counts[filled]
+
+    def outliers(self, threshold=3.0, min_samples=5):
+        """Return (tag id, date ordinal, kg) samples that sit far off their animal's growth line"""
+        n, mean_x, mean_y, slope, sxx = self._fit()
+        a = self.animals
+        fitted = mean_y[a] + np.nan_to_num(slope[a]) * (self.dates - mean_x[a])
+        residual = self.weights - fitted
+        squared = residual * residual
+
+        # Scale each residual by the spread of the animal's other samples, so a
+        # single bad weighing cannot hide itself by inflating the deviation
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ssr = np.bincount(a, squared, len(self.animal_ids))
+            spread = np.sqrt((ssr[a] - squared) / (n[a] - 3))
+            flagged = (n[a] >= min_samples) & (np.abs(residual) > threshold * spread)
+
+        return [(self.animal_ids[a[i]], int(self.dates[i]), float(self.weights[i])) for i in np.flatnonzero(flagged)]